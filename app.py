@@ -0,0 +1,53 @@
+"""Aplicación multipágina del simulador de concursos.
+
+Un solo proceso de Streamlit sirve el simulador integrado y las páginas de
+cada lote, que comparten el motor, las cachés y las tareas en segundo plano
+de ``paginas.comun``.
+"""
+
+from functools import partial
+
+import streamlit as st
+import pandas as pd
+
+from motor import perfil
+from motor.lotes import LOTES
+from paginas.comun import cancelar_tareas_sin_dibujar, conservar_controles, estado_perfil, por_defecto
+from paginas.lote import pagina_lote, ruta_lote
+
+st.set_page_config(layout="wide")
+
+# Una página de detalle por cada lote del pliego
+pagina = st.navigation([
+    st.Page("paginas/integrado.py", title="Simulador integrado", icon="📊", default=True),
+] + [
+    st.Page(partial(pagina_lote, nombre_lote), title=nombre_lote, icon="📦", url_path=ruta_lote(nombre_lote))
+    for nombre_lote in LOTES
+])
+
+# Los controles de una página siguen con su valor al volver de otra
+conservar_controles()
+
+# Los fragmentos (lotes y comparador) se re-ejecutan por separado; esta marca
+# indica si la ejecución en curso es la del script completo
+st.session_state["ejecucion_completa"] = True
+# El perfil (casilla y registros) es de la sesión, no del hilo de cada re-ejecución
+perfil.usar_estado(estado_perfil)
+perfil.iniciar_ejecucion(st.session_state.get("perfil"))
+
+pagina.run()
+
+# Los cálculos en segundo plano cuyo control ya no se dibuja no siguen consumiendo
+cancelar_tareas_sin_dibujar()
+
+# =========================
+# PERFIL DE LA EJECUCIÓN (OPCIONAL)
+# =========================
+with st.sidebar:
+    # Las re-ejecuciones de un solo fragmento se suman a la siguiente ejecución completa
+    secciones = perfil.finalizar_ejecucion()
+    if st.checkbox("⏱️ Perfilar ejecuciones", key=por_defecto("perfil", perfil.ACTIVO)) and secciones:
+        tabla_perfil = pd.DataFrame(secciones).set_index("nombre").round({"segundos": 4})
+        st.dataframe(tabla_perfil, width="stretch")
+
+st.session_state["ejecucion_completa"] = False
@@ -0,0 +1,189 @@
+"""Benchmarks del motor: puntuación, bajas temerarias, competidores, pliegos, estrategia y ranking.
+
+Se ejecutan sin servidor de Streamlit::
+
+    python -m benchmarks.run                   # ejecuta y compara con la referencia
+    python -m benchmarks.run --guardar         # guarda la ejecución como nueva referencia
+    python -m benchmarks.run --filtro ranking  # solo los casos cuyo nombre contiene "ranking"
+
+Para cada caso se mide el mejor tiempo de varias repeticiones y el pico de
+memoria (``tracemalloc``, que también registra las reservas de NumPy). Si
+existe una referencia (``benchmarks/baseline.json``) se muestra el cociente
+frente a ella y el programa termina con código 1 si algún caso empeora más
+que la tolerancia indicada.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from motor.aleatorio import Flujos
+from motor.combinaciones import ranking_combinaciones
+from motor.estrategia import valores_opciones
+from motor.lotes import LOTES, Pliego
+from motor.montecarlo import simular_rivales
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio
+from motor.simulacion import simular_competidores
+from motor.temeraria import mascara_temeraria
+
+REFERENCIA = Path(__file__).with_name("baseline.json")
+EMPRESAS = [3, 20, 100]
+ENSAYOS = [1, 1_000, 1_000_000]
+NUM_LOTES = [3, 4, 5, 6]
+PLIEGO_LOTES = [3, 6, 10]
+LOTE = LOTES["Lote 1"]
+
+
+def caso_puntuacion(n_empresas, n_ensayos):
+    rng = np.random.default_rng(0)
+    precios = rng.uniform(LOTE.precio_minimo(20), LOTE.presupuesto_base, (n_ensayos, n_empresas))
+    garantias = rng.uniform(LOTE.u1_garantia, LOTE.u2_garantia + 1, (n_ensayos, n_empresas))
+
+    def ejecutar():
+        calcular_puntuacion_precio(precios, LOTE.u1_precio, LOTE.u2_precio, LOTE.pmax_precio)
+        calcular_puntuacion_garantia(garantias, LOTE.u1_garantia, LOTE.u2_garantia, LOTE.pmax_garantia)
+    return ejecutar
+
+
+def caso_temeraria(n_empresas, n_ensayos):
+    rng = np.random.default_rng(0)
+    precios = rng.uniform(LOTE.precio_minimo(40), LOTE.presupuesto_base, (n_ensayos, n_empresas))
+    return lambda: mascara_temeraria(precios, LOTE.presupuesto_base)
+
+
+def caso_competidores(n_empresas, n_ensayos):
+    if n_ensayos == 1:
+        # Camino de la interfaz: un escenario con simular_competidores
+        return lambda: simular_competidores(LOTE, n_empresas)
+    flujos = Flujos(0, LOTE)
+    return lambda: simular_rivales(flujos, LOTE, 0, n_ensayos, n_empresas, "Normal", 20)
+
+
+def caso_ranking(n_empresas, n_lotes, k=100):
+    rng = np.random.default_rng(0)
+    lotes = [f"L{i + 1}" for i in range(n_lotes)]
+    empresas = [f"Empresa {i}" for i in range(n_empresas)]
+    puntuaciones = rng.uniform(40, 100, (n_empresas, n_lotes))
+    pesos = np.full(n_lotes, 1 / n_lotes)
+    integrables = [set(lotes[:2]), set(lotes)]
+    integradoras = [
+        {"empresa": empresas[i], "incluye": sorted(integrables[i % 2]),
+         **{l: float(rng.uniform(60, 100)) for l in lotes}}
+        for i in range(min(n_empresas, 10))
+    ]
+    return lambda: ranking_combinaciones(empresas, puntuaciones, pesos, integradoras, k,
+                                         lotes, integrables)
+
+
+def pliego_sintetico(n_lotes):
+    # Lotes como los del pliego con presupuestos distintos; integrables por parejas y todos juntos
+    cortos = [f"L{i + 1}" for i in range(n_lotes)]
+    return Pliego.desde_dict({
+        "lotes": [{"nombre": f"Lote {i + 1}", "corto": c, "peso": 1 / n_lotes, "presupuesto_base": 1e5 * (i + 1),
+                   "pmax_precio": 45, "pmax_garantia": 10, "p_tecnico_max": 40, "criterios": {"Memoria técnica": 45}}
+                  for i, c in enumerate(cortos)],
+        "integrables": [cortos[i:i + 2] for i in range(0, n_lotes - 1, 2)] + [cortos],
+    })
+
+
+def caso_pliego(n_lotes, n_ensayos=10_000, n_empresas=20):
+    # Puntuación de ensayos × empresas × lotes en una sola pasada
+    pliego = pliego_sintetico(n_lotes)
+    rng = np.random.default_rng(0)
+    ofertas = pliego.presupuesto_base * rng.uniform(0.7, 1.0, (n_ensayos, n_empresas, n_lotes))
+    garantias = rng.uniform(3, 6, (n_ensayos, n_empresas, n_lotes))
+    tecnicos = rng.integers(20, 41, (n_ensayos, n_empresas, n_lotes))
+    return lambda: pliego.puntuar(ofertas, garantias, tecnicos)
+
+
+def caso_estrategia(n_lotes, n_ensayos=100_000):
+    # Valor de todas las piezas (individuales e integrables del pliego) sobre el mismo campo
+    pliego = pliego_sintetico(n_lotes)
+    rng = np.random.default_rng(0)
+    mejor = rng.uniform(60, 100, (n_ensayos, n_lotes))
+    empates = np.ones((n_ensayos, n_lotes), dtype=np.int64)
+    totales = dict.fromkeys(pliego.cortos, 85.0)
+    return lambda: valores_opciones(totales, mejor, empates, pliego=pliego)
+
+
+def casos(max_elementos):
+    for n in EMPRESAS:
+        for t in ENSAYOS:
+            if n * t <= max_elementos:
+                yield f"puntuacion/empresas={n}/ensayos={t}", caso_puntuacion, (n, t)
+                yield f"temeraria/empresas={n}/ensayos={t}", caso_temeraria, (n, t)
+                yield f"competidores/empresas={n}/ensayos={t}", caso_competidores, (n, t)
+    for n in EMPRESAS:
+        for l in NUM_LOTES:
+            yield f"ranking/empresas={n}/lotes={l}", caso_ranking, (n, l)
+    for l in PLIEGO_LOTES:
+        yield f"pliego/lotes={l}", caso_pliego, (l,)
+        yield f"estrategia/lotes={l}", caso_estrategia, (l,)
+
+
+def medir(fabrica, args, tiempo_min=0.2, repeticiones_min=3):
+    ejecutar = fabrica(*args)
+    # Pico de memoria de una ejecución aislada
+    tracemalloc.start()
+    ejecutar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < repeticiones_min or time.perf_counter() - inicio < tiempo_min:
+        t0 = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - t0)
+    return {"segundos": min(tiempos), "repeticiones": len(tiempos), "memoria_pico_bytes": pico}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--filtro", default="", help="Ejecutar solo los casos que contengan este texto")
+    parser.add_argument("--max-elementos", type=float, default=2e7,
+                        help="Omitir casos con más de empresas × ensayos elementos")
+    parser.add_argument("--referencia", type=Path, default=REFERENCIA)
+    parser.add_argument("--guardar", action="store_true", help="Guardar los resultados como referencia")
+    parser.add_argument("--tolerancia", type=float, default=1.25,
+                        help="Cociente de tiempo frente a la referencia a partir del cual se marca regresión")
+    args = parser.parse_args(argv)
+
+    referencia = {}
+    if args.referencia.exists() and not args.guardar:
+        referencia = json.loads(args.referencia.read_text(encoding="utf-8"))
+
+    resultados, regresiones = {}, []
+    print(f"{'caso':<42} {'tiempo':>12} {'memoria':>10} {'vs ref':>8}")
+    for nombre, fabrica, parametros in casos(args.max_elementos):
+        if args.filtro not in nombre:
+            continue
+        r = medir(fabrica, parametros)
+        resultados[nombre] = r
+        cociente = ""
+        if nombre in referencia:
+            c = r["segundos"] / referencia[nombre]["segundos"]
+            cociente = f"{c:.2f}x"
+            if c > args.tolerancia:
+                regresiones.append(nombre)
+                cociente += " !"
+        print(f"{nombre:<42} {r['segundos'] * 1e3:>9.3f} ms {r['memoria_pico_bytes'] / 2**20:>7.1f} MB "
+              f"{cociente:>8}")
+
+    if args.guardar:
+        args.referencia.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+        print(f"Referencia guardada en {args.referencia}")
+    if regresiones:
+        print(f"{len(regresiones)} casos más lentos que la referencia (> {args.tolerancia}x):")
+        for nombre in regresiones:
+            print(f"  {nombre}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Motor de cálculo del simulador de concursos (puntuación y simulación).
+
+No depende de Streamlit ni de matplotlib, de modo que puede usarse desde
+scripts, tareas programadas o la línea de órdenes (``python -m motor``).
+"""
+
+from motor.aleatorio import Flujos
+from motor.analitico import CampoAnalitico, prob_victoria_analitica, resultado_analitico
+from motor.combinaciones import ranking_combinaciones
+from motor.estrategia import estrategia_optima, optimizar_estrategia
+from motor.lotes import CRITERIOS, LOTES, PESOS, PLIEGO, ParametrosLote, Pliego, cargar_pliego
+from motor.montecarlo import CampoRivales, simular_montecarlo, simular_progresivo
+from motor.optimizacion import optimizar_precio
+from motor.puntuacion import (
+    calcular_puntuacion_garantia,
+    calcular_puntuacion_precio,
+    calcular_puntuacion_total,
+)
+from motor.sensibilidad import rejilla_sensibilidad, superficie_sensibilidad
+from motor.simulacion import simular_competidores, simular_escenario
+from motor.tecnicos import ModeloTecnico
+from motor.temeraria import mascara_temeraria, umbral_temeraria
@@ -0,0 +1,3 @@
+from motor.cli import main
+
+main()
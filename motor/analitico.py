@@ -0,0 +1,177 @@
+"""Probabilidad de victoria exacta (sin muestreo) frente a un campo de rivales.
+
+La puntuación de un rival es T = P + G + K, con P los puntos económicos
+(lineales a trozos en el precio), G los de garantía y K los técnicos, todos
+independientes. Su distribución se obtiene combinando:
+
+- P: la función de distribución del precio (``cdf_precios``) transformada por
+  la fórmula del pliego, con átomos en pmax (precio <= U2) y en 0 (precio >= U1);
+- G: uniforme en (0, pmax_garantia) más un átomo en pmax_garantia
+  (garantía uniforme en [U1, U2 + 1] años, como en la simulación);
+- K: enteros equiprobables entre p_tecnico_min y p_tecnico_max (o una pmf dada).
+
+La parte continua de P + G se integra con la regla del punto medio y los
+átomos se tratan de forma exacta. Con F(s) = P(T < s) y q(s) = P(T = s), el
+crédito de victoria (empates repartidos) contra rivales independientes es
+∫₀¹ ∏ⱼ (Fⱼ + t·qⱼ) dt y el puesto sigue una Poisson-binomial de P(Tⱼ > s).
+Las definiciones coinciden con las del Monte Carlo de ``motor.montecarlo``.
+"""
+
+import numpy as np
+
+from motor.distribuciones import atomos_precios, cdf_precios
+from motor.perfil import cronometrado
+
+NODOS = 200
+TOLERANCIA_EMPATE = 1e-9
+
+
+def pmf_tecnicos_uniforme(lote):
+    valores = np.arange(lote.p_tecnico_min, lote.p_tecnico_max + 1, dtype=float)
+    return valores, np.full(valores.size, 1 / valores.size)
+
+
+def _por_rival(valor, forma):
+    # Añade la dimensión final de rivales (de tamaño 1 si todos son iguales)
+    valor = np.asarray(valor, dtype=float)
+    return valor if valor.ndim > len(forma) else valor[..., None]
+
+
+def _atomos_puntos_precio(lote, precio_min, distribucion, alpha, beta):
+    # Átomos de P: pmax (precio <= U2), 0 (precio >= U1) y átomos interiores del precio
+    u1, u2, pmax = lote.u1_precio, lote.u2_precio, lote.pmax_precio
+    atomos = atomos_precios(precio_min, lote.presupuesto_base, distribucion)
+    en_u1 = sum(m for x, m in atomos if x >= u1)
+    resultado = [
+        (pmax, cdf_precios(u2, precio_min, lote.presupuesto_base, distribucion, alpha, beta)),
+        (0.0, 1 - cdf_precios(u1, precio_min, lote.presupuesto_base, distribucion, alpha, beta) + en_u1),
+    ]
+    resultado += [(pmax * (u1 - x) / (u1 - u2), m) for x, m in atomos if u2 < x < u1]
+    return [(a, _por_rival(m, ())) for a, m in resultado]
+
+
+def _cdf_puntos_precio(y, lote, precio_min, distribucion, alpha, beta):
+    # P(P < y), con P < y  <=>  precio > U1 - y · (U1 - U2) / pmax. Forma: y.shape + (rivales,)
+    u1, u2, pmax = lote.u1_precio, lote.u2_precio, lote.pmax_precio
+    corte = u1 - y * (u1 - u2) / pmax
+    resultado = _por_rival(
+        1 - cdf_precios(corte, precio_min, lote.presupuesto_base, distribucion, alpha, beta), y.shape)
+    y = y[..., None]
+    return np.where(y <= 0, 0.0, np.where(y > pmax, 1.0, resultado))
+
+
+def distribucion_rival(lote, totales, distribucion="Uniforme", bajada_max=20, alpha=2.0, beta=2.0,
+                       pmf_tecnicos=None, nodos=NODOS):
+    """(F, q) con F = P(T < s) y q = P(T = s) para cada total ``s`` de ``totales``.
+
+    El resultado tiene la forma ``totales.shape + (rivales,)``; la última
+    dimensión es 1 salvo con un modelo empírico con una fila por rival.
+    """
+    totales = np.asarray(totales, dtype=float)
+    precio_min = lote.precio_minimo(bajada_max)
+    valores_k, probs_k = pmf_tecnicos if pmf_tecnicos is not None else pmf_tecnicos_uniforme(lote)
+
+    pmax_g = lote.pmax_garantia
+    amplitud = lote.u2_garantia + 1 - lote.u1_garantia
+    masa_continua_g = (lote.u2_garantia - lote.u1_garantia) / amplitud
+    masa_atomo_g = 1 / amplitud
+    atomos_p = _atomos_puntos_precio(lote, precio_min, distribucion, alpha, beta)
+
+    # x = s - k para cada total y cada valor técnico: (..., K)
+    x = totales[..., None] - np.asarray(valores_k, dtype=float)
+    # Parte continua de P frente a la parte uniforme de G (punto medio): (..., K, nodos)
+    y = x[..., None] - pmax_g * (np.arange(nodos) + 0.5) / nodos
+    continua = _cdf_puntos_precio(y, lote, precio_min, distribucion, alpha, beta)
+    for a, m in atomos_p:
+        continua = continua - (y > a)[..., None] * m
+    integral = continua.mean(axis=-2)
+    # Átomos de P frente a la parte uniforme de G, de forma exacta
+    for a, m in atomos_p:
+        integral = integral + np.clip((x - a) / pmax_g, 0.0, 1.0)[..., None] * m
+
+    menor = masa_continua_g * integral + masa_atomo_g * _cdf_puntos_precio(
+        x - pmax_g, lote, precio_min, distribucion, alpha, beta)
+    F = np.einsum("...kr,k->...r", menor, probs_k)
+
+    # Empates: solo cuando P y G están a la vez en un átomo
+    q = np.zeros_like(F)
+    for a, m in atomos_p:
+        coincide = np.abs(x - (a + pmax_g)) < TOLERANCIA_EMPATE
+        q = q + masa_atomo_g * np.einsum("...kr,k->...r", coincide[..., None] * m, probs_k)
+    return np.clip(F, 0.0, 1.0), np.clip(q, 0.0, 1.0)
+
+
+def credito_victoria(F, q, n_rivales):
+    """E[1 / (1 + empates)] si nadie supera a EMCO, con rivales independientes.
+
+    ``F`` y ``q`` tienen forma (..., 1) para rivales idénticos o (..., n_rivales).
+    """
+    if F.shape[-1] == 1:
+        F, q = F[..., 0], q[..., 0]
+        con_empate = ((F + q) ** (n_rivales + 1) - F ** (n_rivales + 1)) / (
+            (n_rivales + 1) * np.where(q > 0, q, 1.0))
+        return np.where(q > 0, con_empate, F ** n_rivales)
+    # ∫₀¹ ∏ⱼ (Fⱼ + t·qⱼ) dt con Gauss-Legendre exacto para el grado n_rivales
+    t, w = np.polynomial.legendre.leggauss(n_rivales // 2 + 1)
+    t, w = (t + 1) / 2, w / 2
+    producto = np.prod(F[..., None, :] + t[:, None] * q[..., None, :], axis=-1)
+    return producto @ w
+
+
+def distribucion_puestos(F, q, n_rivales):
+    """P(puesto = 1 + j) para j = 0..n_rivales: rivales con puntuación estrictamente mayor."""
+    G = 1 - F - q
+    if G.shape[-1] == 1:
+        G = np.repeat(G, n_rivales, axis=-1)
+    # Poisson-binomial por convolución sucesiva
+    puestos = np.zeros(G.shape[:-1] + (n_rivales + 1,))
+    puestos[..., 0] = 1.0
+    for j in range(n_rivales):
+        p = G[..., j, None]
+        puestos[..., 1:] = puestos[..., 1:] * (1 - p) + puestos[..., :-1] * p
+        puestos[..., 0] *= 1 - p[..., 0]
+    return puestos
+
+
+def prob_victoria_analitica(lote, totales_emco, n_rivales, distribucion="Uniforme", bajada_max=20,
+                            alpha=2.0, beta=2.0, pmf_tecnicos=None, nodos=NODOS):
+    """Probabilidad de victoria de EMCO para cada total de ``totales_emco`` (cualquier forma)."""
+    F, q = distribucion_rival(lote, totales_emco, distribucion, bajada_max, alpha, beta,
+                              pmf_tecnicos, nodos)
+    return credito_victoria(F, q, n_rivales)
+
+
+@cronometrado("analitico.resultado_analitico")
+def resultado_analitico(lote, total_emco, n_rivales, distribucion="Uniforme", bajada_max=20,
+                        alpha=2.0, beta=2.0, pmf_tecnicos=None, nodos=NODOS):
+    """Mismo resumen que ``simular_montecarlo`` (sin percentiles), calculado sin muestreo."""
+    F, q = distribucion_rival(lote, total_emco, distribucion, bajada_max, alpha, beta,
+                              pmf_tecnicos, nodos)
+    puestos = distribucion_puestos(F, q, n_rivales)
+    return {
+        "total_emco": float(total_emco),
+        "prob_victoria": float(credito_victoria(F, q, n_rivales)),
+        "puesto_medio": float(np.dot(np.arange(1, n_rivales + 2), puestos)),
+        "distribucion_puestos": puestos,
+    }
+
+
+class CampoAnalitico:
+    """Equivalente analítico de ``CampoRivales``: sirve al optimizador de precio sin muestreo."""
+
+    def __init__(self, lote, n_rivales, distribucion="Uniforme", bajada_max=20, **opciones):
+        self.lote = lote
+        self.n_rivales = n_rivales
+        self.distribucion = distribucion
+        self.bajada_max = bajada_max
+        self.opciones = opciones
+
+    @property
+    def huella(self):
+        # Identificador estable de los parámetros, útil como clave de caché
+        return repr((self.lote, self.n_rivales, getattr(self.distribucion, "huella", self.distribucion),
+                     self.bajada_max, sorted(self.opciones.items())))
+
+    def prob_victoria(self, totales_emco):
+        return prob_victoria_analitica(self.lote, totales_emco, self.n_rivales, self.distribucion,
+                                       self.bajada_max, **self.opciones)
@@ -0,0 +1,180 @@
+"""Barrido de parámetros en paralelo sobre varios procesos.
+
+La rejilla (lote × distribución × bajada × competidores × oferta × garantía ×
+puntos técnicos) se reparte en fragmentos entre un ``ProcessPoolExecutor``.
+Cada trabajo usa su propio flujo aleatorio derivado de la semilla del barrido
+y de su posición en la rejilla, así que el resultado no depende del número de
+procesos ni del reparto. Los procesos escriben directamente su fila en un
+array de memoria compartida (o en un ``.npy`` mapeado en memoria), sin
+devolver DataFrames serializados al proceso principal.
+
+Uso::
+
+    python -m motor.barrido --bajadas 5:50:5 --competidores 2:20:2 \\
+        --ofertas 0.80:1.00:0.02 --garantias 3:6:1 -o barrido.parquet
+"""
+
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from motor.distribuciones import DISTRIBUCIONES
+from motor.lotes import CRITERIOS, LOTES
+from motor.montecarlo import PERCENTILES, simular_montecarlo
+from motor.puntuacion import calcular_puntuacion_total
+
+PARAMETROS = ["lote", "distribucion", "bajada_max", "num_competidores",
+              "factor_oferta", "garantia", "puntos_tecnicos"]
+METRICAS = ["total_emco", "prob_victoria", "puesto_medio"] + [f"margen_p{q}" for q in PERCENTILES]
+
+
+def construir_rejilla(lotes, distribuciones, bajadas, competidores, factores_oferta, garantias,
+                      puntos_tecnicos):
+    """Matriz (trabajos × PARAMETROS); lote y distribución van como índices."""
+    return np.array(list(itertools.product(
+        range(len(lotes)), range(len(distribuciones)), bajadas, competidores,
+        factores_oferta, garantias, puntos_tecnicos
+    )), dtype=float).reshape(-1, len(PARAMETROS))
+
+
+def _ejecutar_fragmento(destino, forma, indices, rejilla, lotes, distribuciones, ensayos, semilla):
+    # Abre el array de resultados (memoria compartida o .npy) y escribe sus filas
+    if destino.endswith(".npy"):
+        resultados = np.load(destino, mmap_mode="r+")
+        shm = None
+    else:
+        shm = shared_memory.SharedMemory(name=destino)
+        resultados = np.ndarray(forma, dtype=np.float64, buffer=shm.buf)
+
+    for i, fila in zip(indices, rejilla):
+        i_lote, i_dist, bajada, n_comp, factor, garantia, tecnicos = fila
+        lote = lotes[int(i_lote)]
+        oferta = factor * lote.presupuesto_base
+        total = calcular_puntuacion_total(
+            oferta, garantia, tecnicos, lote.u1_precio, lote.u2_precio, lote.pmax_precio,
+            lote.u1_garantia, lote.u2_garantia, lote.pmax_garantia
+        )
+        rng = np.random.SeedSequence(semilla, spawn_key=(int(i),))
+        mc = simular_montecarlo(lote, total, int(n_comp), ensayos, distribuciones[int(i_dist)],
+                                bajada, semilla=rng)
+        resultados[i] = [total, mc["prob_victoria"], mc["puesto_medio"],
+                         *mc["percentiles_margen"].values()]
+
+    if shm is None:
+        resultados.flush()
+    else:
+        del resultados
+        shm.close()
+    return len(indices)
+
+
+def ejecutar_barrido(rejilla, lotes, distribuciones, ensayos=10_000, semilla=0, procesos=None,
+                     ruta_npy=None, trabajos_por_fragmento=None, avance=None):
+    """Ejecuta la rejilla y devuelve la matriz (trabajos × METRICAS).
+
+    Con ``ruta_npy`` los resultados quedan además en un ``.npy`` mapeado en memoria.
+    ``avance(fraccion)`` se llama al terminar cada fragmento (ver ``motor.tareas``).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    forma = (len(rejilla), len(METRICAS))
+    if trabajos_por_fragmento is None:
+        # Varios fragmentos por proceso para equilibrar la carga
+        trabajos_por_fragmento = max(1, len(rejilla) // (procesos * 8))
+
+    if ruta_npy is not None:
+        resultados = np.lib.format.open_memmap(ruta_npy, mode="w+", dtype=np.float64, shape=forma)
+        resultados.flush()
+        destino, shm = str(ruta_npy), None
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(forma)) * 8))
+        resultados = np.ndarray(forma, dtype=np.float64, buffer=shm.buf)
+        destino = shm.name
+
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [
+                pool.submit(_ejecutar_fragmento, destino, forma,
+                            np.arange(inicio, min(inicio + trabajos_por_fragmento, len(rejilla))),
+                            rejilla[inicio:inicio + trabajos_por_fragmento],
+                            lotes, distribuciones, ensayos, semilla)
+                for inicio in range(0, len(rejilla), trabajos_por_fragmento)
+            ]
+            hechos = 0
+            try:
+                for futuro in as_completed(futuros):
+                    hechos += futuro.result()
+                    if avance is not None:
+                        avance(hechos / len(rejilla))
+            except BaseException:
+                # Cancelación (o error): los fragmentos pendientes ya no se ejecutan
+                for futuro in futuros:
+                    futuro.cancel()
+                raise
+        return np.array(resultados)
+    finally:
+        if shm is not None:
+            del resultados
+            shm.close()
+            shm.unlink()
+
+
+def _rango(texto, tipo=float):
+    # "inicio:fin:paso" (fin incluido) o lista separada por comas
+    if ":" in texto:
+        inicio, fin, paso = (float(v) for v in texto.split(":"))
+        valores = np.arange(inicio, fin + paso / 2, paso)
+    else:
+        valores = np.array([float(v) for v in texto.split(",")])
+    return [tipo(v) for v in valores]
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from motor.cli import escribir_resultados
+
+    parser = argparse.ArgumentParser(prog="python -m motor.barrido",
+                                     description="Barrido de parámetros en paralelo.")
+    parser.add_argument("--lotes", nargs="+", default=list(LOTES), choices=list(LOTES))
+    parser.add_argument("--distribuciones", nargs="+", default=DISTRIBUCIONES, choices=DISTRIBUCIONES)
+    parser.add_argument("--bajadas", default="1:50:1", help="Bajada máxima (%%), inicio:fin:paso")
+    parser.add_argument("--competidores", default="2:20:1", help="Número de rivales")
+    parser.add_argument("--ofertas", default="0.80:1.00:0.05",
+                        help="Oferta de EMCO como fracción del presupuesto base")
+    parser.add_argument("--garantias", default="3:6:1", help="Años de garantía de EMCO")
+    parser.add_argument("--puntos-tecnicos", default=None,
+                        help="Puntos técnicos de EMCO (por defecto, el máximo de cada lote)")
+    parser.add_argument("--ensayos", type=int, default=10_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--npy", default=None, help="Guardar también la matriz de resultados en .npy")
+    parser.add_argument("-o", "--salida", required=True, help="Fichero de resultados (.parquet o .csv)")
+    args = parser.parse_args(argv)
+
+    lotes = [LOTES[n] for n in args.lotes]
+    if args.puntos_tecnicos is None:
+        tecnicos = sorted({sum(CRITERIOS[n].values()) for n in args.lotes})
+    else:
+        tecnicos = _rango(args.puntos_tecnicos)
+    rejilla = construir_rejilla(lotes, args.distribuciones, _rango(args.bajadas),
+                                _rango(args.competidores, int), _rango(args.ofertas),
+                                _rango(args.garantias), tecnicos)
+    print(f"{len(rejilla)} trabajos de {args.ensayos} ensayos", file=sys.stderr)
+
+    resultados = ejecutar_barrido(rejilla, lotes, args.distribuciones, args.ensayos, args.semilla,
+                                  args.procesos, args.npy)
+    df = pd.DataFrame(rejilla, columns=PARAMETROS)
+    df["lote"] = np.array(args.lotes)[df["lote"].astype(int)]
+    df["distribucion"] = np.array(args.distribuciones)[df["distribucion"].astype(int)]
+    df[METRICAS] = resultados
+    escribir_resultados(df, args.salida)
+    print(f"Resultados -> {args.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Ejecución por lotes de escenarios sin interfaz.
+
+Uso::
+
+    python -m motor escenarios.csv -o resultados.parquet
+
+Cada fila (CSV) u objeto (JSON) es un escenario con las columnas:
+
+- ``lote``: nombre de un lote del pliego en uso (``motor.lotes.PLIEGO``), cuyos
+  parámetros se toman por defecto
+- ``oferta``, ``garantia``, ``puntos_tecnicos``: oferta de EMCO
+- ``num_competidores``, ``distribucion``, ``bajada_max``: campo de rivales
+- ``ensayos`` y ``semilla`` (opcionales): tamaño y semilla del Monte Carlo
+- ``tolerancia`` (opcional): si aparece, el Monte Carlo es progresivo y se
+  detiene cuando el IC 95 % de la probabilidad de victoria es más estrecho;
+  ``ensayos`` pasa a ser entonces el máximo
+- ``temeraria`` (opcional): si es verdadera se excluyen en cada ensayo las
+  bajas temerarias (``motor.temeraria``), también la de EMCO
+
+Con ``--historico`` se ajusta un modelo empírico de descuentos (ver
+``motor.empirico``) y los escenarios con ``distribucion`` "Empírica" lo usan;
+la columna opcional ``grupo`` elige el sector o la empresa del modelo.
+
+Las columnas ``presupuesto_base``, ``pmax_precio``, ``pmax_garantia`` y
+``p_tecnico_max`` sustituyen, si aparecen, a los valores del lote.
+"""
+
+import argparse
+import dataclasses
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from motor.empirico import METODOS, TODOS, ajustar_desde_fichero
+from motor.lotes import LOTES, ParametrosLote
+from motor.montecarlo import PERCENTILES, simular_montecarlo, simular_progresivo
+from motor.puntuacion import calcular_puntuacion_total
+
+ENSAYOS_POR_DEFECTO = 10_000
+CAMPOS_LOTE = ["presupuesto_base", "pmax_precio", "pmax_garantia", "p_tecnico_max"]
+
+
+def leer_escenarios(ruta):
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == ".json":
+        return pd.read_json(ruta, orient="records")
+    return pd.read_csv(ruta)
+
+
+def escribir_resultados(df, ruta):
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == ".parquet":
+        df.to_parquet(ruta, index=False)  # requiere pyarrow o fastparquet
+    else:
+        df.to_csv(ruta, index=False)
+
+
+def parametros_escenario(escenario):
+    # Lote del pliego con las sustituciones indicadas en el propio escenario
+    base = LOTES.get(escenario.get("lote"))
+    cambios = {c: escenario[c] for c in CAMPOS_LOTE if c in escenario}
+    if base is None:
+        faltan = [c for c in CAMPOS_LOTE if c not in cambios]
+        if faltan:
+            raise ValueError(f"Lote desconocido {escenario.get('lote')!r} y faltan columnas: {faltan}")
+        return ParametrosLote(**cambios, nombre=str(escenario.get("lote") or ""))
+    return dataclasses.replace(base, **cambios)
+
+
+def evaluar_escenario(escenario, modelo=None):
+    lote = parametros_escenario(escenario)
+    total_emco = calcular_puntuacion_total(
+        escenario["oferta"], escenario["garantia"], escenario["puntos_tecnicos"],
+        lote.u1_precio, lote.u2_precio, lote.pmax_precio,
+        lote.u1_garantia, lote.u2_garantia, lote.pmax_garantia
+    )
+    semilla = escenario.get("semilla")
+    semilla = None if semilla is None else int(semilla)
+    n_rivales = int(escenario["num_competidores"])
+    ensayos = int(escenario.get("ensayos", ENSAYOS_POR_DEFECTO))
+    distribucion = escenario.get("distribucion", "Uniforme")
+    if distribucion == "Empírica":
+        if modelo is None:
+            raise ValueError("La distribución 'Empírica' necesita un histórico (--historico).")
+        distribucion = modelo.seleccionar([str(escenario.get("grupo", TODOS))])
+    bajada_max = float(escenario.get("bajada_max", 20))
+    oferta_emco = float(escenario["oferta"]) if escenario.get("temeraria") else None
+    if "tolerancia" in escenario:
+        for mc in simular_progresivo(lote, total_emco, n_rivales, distribucion, bajada_max,
+                                     float(escenario["tolerancia"]), max_ensayos=ensayos,
+                                     semilla=semilla, oferta_emco=oferta_emco):
+            pass
+    else:
+        mc = simular_montecarlo(lote, total_emco, n_rivales, ensayos, distribucion, bajada_max,
+                                semilla=semilla, oferta_emco=oferta_emco)
+    resultado = {
+        "total_emco": mc["total_emco"],
+        "ensayos_realizados": mc["ensayos"],
+        "prob_victoria": mc["prob_victoria"],
+        "puesto_medio": mc["puesto_medio"],
+    }
+    if oferta_emco is not None:
+        resultado["prob_temeraria"] = mc["prob_temeraria"]
+    resultado.update({f"mejor_rival_p{q}": mc["percentiles_mejor_rival"][q] for q in PERCENTILES})
+    resultado.update({f"margen_p{q}": mc["percentiles_margen"][q] for q in PERCENTILES})
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m motor", description=__doc__.splitlines()[0])
+    parser.add_argument("escenarios", help="Fichero CSV o JSON con un escenario por fila")
+    parser.add_argument("-o", "--salida", required=True, help="Fichero de resultados (.parquet o .csv)")
+    parser.add_argument("--historico", help="Pujas pasadas (CSV o Parquet) para la distribución 'Empírica'")
+    parser.add_argument("--por", choices=["sector", "empresa"], help="Agrupar los descuentos del histórico")
+    parser.add_argument("--metodo", choices=METODOS, default="ecdf", help="Ajuste del histórico")
+    args = parser.parse_args(argv)
+
+    modelo = ajustar_desde_fichero(args.historico, args.por, args.metodo) if args.historico else None
+    escenarios = leer_escenarios(args.escenarios)
+    # Las celdas vacías cuentan como columnas ausentes (valor por defecto)
+    filas = [{k: v for k, v in e.items() if pd.notna(v)} for e in escenarios.to_dict("records")]
+    resultados = pd.DataFrame([evaluar_escenario(e, modelo) for e in filas])
+    escribir_resultados(pd.concat([escenarios, resultados], axis=1), args.salida)
+    print(f"{len(resultados)} escenarios evaluados -> {args.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Ranking de combinaciones de ofertas (individuales e integradoras).
+
+El total ponderado de una combinación es separable por lote, así que las k
+mejores se obtienen con sumas exteriores acotadas a k filas por lote, sin
+construir nunca el producto cartesiano completo (empresas ** lotes).
+"""
+
+import numpy as np
+
+from motor.lotes import PLIEGO
+from motor.perfil import cronometrado
+
+# Nombres cortos de los lotes y grupos que admiten oferta integradora, según el pliego
+NOMBRES_CORTOS = PLIEGO.cortos
+INTEGRABLES = PLIEGO.integrables
+
+
+def _indices_mayores(valores, k):
+    # Índices de los k mayores valores (sin ordenar)
+    if k >= valores.size:
+        return np.arange(valores.size)
+    return np.argpartition(-valores, k - 1)[:k]
+
+
+def mejores_sumas(columnas, k):
+    """Las k mayores sumas eligiendo un elemento de cada columna.
+
+    Devuelve los totales en orden descendente y la matriz (k × columnas) de
+    índices elegidos. Coste O(columnas · k · empresas) en lugar de empresas ** columnas.
+    """
+    totales = np.zeros(1)
+    indices = np.zeros((1, 0), dtype=np.int64)
+    for columna in columnas:
+        candidatos = _indices_mayores(columna, k)
+        sumas = (totales[:, None] + columna[candidatos][None, :]).ravel()
+        elegidos = _indices_mayores(sumas, k)
+        fila, posicion = np.divmod(elegidos, candidatos.size)
+        totales = sumas[elegidos]
+        indices = np.column_stack([indices[fila], candidatos[posicion]])
+    orden = np.argsort(-totales, kind="stable")
+    return totales[orden], indices[orden]
+
+
+def numero_combinaciones(n_empresas, integradoras, lotes=NOMBRES_CORTOS, integrables=INTEGRABLES):
+    # Total de combinaciones posibles, sin enumerarlas
+    total = n_empresas ** len(lotes)
+    for oferta in integradoras:
+        incluye = set(oferta["incluye"])
+        if incluye in integrables:
+            total += n_empresas ** (len(lotes) - len(incluye))
+    return total
+
+
+@cronometrado("combinaciones.ranking_combinaciones")
+def ranking_combinaciones(empresas, puntuaciones, pesos, integradoras, k=100,
+                          lotes=NOMBRES_CORTOS, integrables=INTEGRABLES, avance=None):
+    """Las k mejores combinaciones por total ponderado.
+
+    ``puntuaciones`` es la matriz (empresas × lotes) de puntos individuales e
+    ``integradoras`` la lista de ofertas ``{"empresa", "incluye", <lote>: puntos}``.
+    Solo se consideran las integradoras cuyos lotes están en ``integrables``.
+    ``avance(fraccion)`` se llama tras cada integradora (ver ``motor.tareas``).
+    """
+    ponderadas = np.asarray(puntuaciones, dtype=float) * np.asarray(pesos, dtype=float)
+    filas = []
+
+    # Combinaciones individuales: una empresa por lote
+    totales, indices = mejores_sumas([ponderadas[:, j] for j in range(len(lotes))], k)
+    for total, elegidas in zip(totales, indices):
+        fila = {"Combinación": " + ".join(f"{empresas[i]} {l}" for i, l in zip(elegidas, lotes))}
+        fila.update({l: float(puntuaciones[i][j]) for j, (i, l) in enumerate(zip(elegidas, lotes))})
+        fila["Total ponderado"] = total
+        filas.append(fila)
+
+    # Combinaciones integradoras: lotes fijos de la integradora + el resto individual
+    for i, oferta in enumerate(integradoras):
+        if avance is not None:
+            avance(i / (len(integradoras) + 1))
+        incluye = set(oferta["incluye"])
+        if incluye not in integrables:
+            continue
+        fijos = [j for j, l in enumerate(lotes) if l in incluye]
+        libres = [j for j, l in enumerate(lotes) if l not in incluye]
+        base = sum(pesos[j] * oferta[lotes[j]] for j in fijos)
+        nombre = f"{oferta['empresa']} integradora {'+'.join(lotes[j] for j in fijos)}"
+
+        totales, indices = mejores_sumas([ponderadas[:, j] for j in libres], k)
+        for total, elegidas in zip(totales, indices):
+            fila = {"Combinación": " + ".join(
+                [nombre] + [f"{empresas[i]} {lotes[j]}" for i, j in zip(elegidas, libres)])}
+            fila.update({lotes[j]: oferta[lotes[j]] for j in fijos})
+            fila.update({lotes[j]: float(puntuaciones[i][j]) for i, j in zip(elegidas, libres)})
+            fila["Total ponderado"] = base + total
+            filas.append(fila)
+
+    filas.sort(key=lambda f: f["Total ponderado"], reverse=True)
+    filas = filas[:k]
+    for fila in filas:
+        fila["Total ponderado"] = round(float(fila["Total ponderado"]), 2)
+    return filas
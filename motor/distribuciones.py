@@ -0,0 +1,162 @@
+"""Distribuciones de precios de los competidores sobre [precio_min, precio_max].
+
+Además del muestreo, cada distribución expone su función de distribución
+(``cdf_precios``) y sus átomos (``atomos_precios``), que usa el motor analítico,
+y su inversa (``ppf_precios``), que usan los muestreos de ``motor.muestreo``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+DISTRIBUCIONES = ["Uniforme", "Normal", "Triangular", "Beta"]
+
+
+@dataclass(frozen=True)
+class Beta:
+    """Beta con sus parámetros de forma, para pasarla como ``distribucion``
+    por todo el motor (la cadena ``"Beta"`` es alpha = beta = 2)."""
+
+    alpha: float = 2.0
+    beta: float = 2.0
+
+
+@dataclass(frozen=True)
+class Triangular:
+    """Triangular con su valor más probable como fracción de [precio_min, precio_max]
+    (la cadena ``"Triangular"`` es la simétrica, moda = 0.5)."""
+
+    moda: float = 0.5
+
+    def __post_init__(self):
+        if not 0 <= self.moda <= 1:
+            raise ValueError(f"La moda de la Triangular debe estar entre 0 y 1 ({self.moda})")
+
+
+def _forma(distribucion, alpha, beta):
+    # Una ``Beta`` se trata como la cadena "Beta" con sus propios alpha y beta
+    if isinstance(distribucion, Beta):
+        return "Beta", distribucion.alpha, distribucion.beta
+    if isinstance(distribucion, Triangular):
+        return "Triangular", alpha, beta
+    return distribucion, alpha, beta
+
+
+def _moda(distribucion):
+    # Valor más probable de la Triangular, como fracción del rango
+    return distribucion.moda if isinstance(distribucion, Triangular) else 0.5
+
+
+def muestrear_precios(rng, precio_min, precio_max, distribucion="Uniforme", size=None,
+                      alpha=2.0, beta=2.0):
+    # Siempre con un Generator explícito (ver motor.aleatorio para los flujos por empresa).
+    # La Beta(alpha, beta) se reescala a [precio_min, precio_max] como en el Lote 2.
+    # Un modelo empírico (ver motor.empirico) muestrea descuentos sobre precio_max.
+    moda = _moda(distribucion)
+    distribucion, alpha, beta = _forma(distribucion, alpha, beta)
+    if hasattr(distribucion, "muestrear"):
+        return distribucion.muestrear(rng, precio_max, size)
+    elif distribucion == "Normal":
+        media = (precio_min + precio_max) / 2
+        std = (precio_max - precio_min) / 6
+        precios = rng.normal(media, std, size)
+        return np.clip(precios, precio_min, precio_max)
+    elif distribucion == "Beta":
+        return precio_min + rng.beta(alpha, beta, size) * (precio_max - precio_min)
+    elif distribucion == "Triangular":
+        return rng.triangular(precio_min, precio_min + moda * (precio_max - precio_min), precio_max, size)
+    return rng.uniform(precio_min, precio_max, size)
+
+
+def _erfc(x):
+    # Aproximación de Chebyshev (Numerical Recipes, error relativo < 1.2e-7), vectorizada
+    z = np.abs(x)
+    t = 1 / (1 + 0.5 * z)
+    r = t * np.exp(-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277)))))))))
+    return np.where(x >= 0, r, 2 - r)
+
+
+def _cdf_normal(x):
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / np.sqrt(2))
+
+
+def _ppf_normal(p):
+    # Inversa de la normal estándar (algoritmo de Acklam, error relativo < 1.2e-9), vectorizada
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    p = np.asarray(p, dtype=float)
+    q = np.sqrt(-2 * np.log(np.minimum(p, 1 - p)))
+    cola = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / (
+        (((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    r = (p - 0.5) ** 2
+    centro = (p - 0.5) * (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) / (
+        ((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    return np.where(np.abs(p - 0.5) <= 0.47575, centro, np.where(p < 0.5, cola, -cola))
+
+
+def _cdf_beta(u, alpha, beta, puntos=4097):
+    # Integración numérica de la densidad (regla del punto medio acumulada)
+    bordes = np.linspace(0.0, 1.0, puntos)
+    medios = (bordes[:-1] + bordes[1:]) / 2
+    densidad = medios ** (alpha - 1) * (1 - medios) ** (beta - 1)
+    acumulada = np.concatenate(([0.0], np.cumsum(densidad)))
+    return np.interp(u, bordes, acumulada / acumulada[-1])
+
+
+def cdf_precios(x, precio_min, precio_max, distribucion="Uniforme", alpha=2.0, beta=2.0):
+    """P(precio <= x) para la distribución de ``muestrear_precios``."""
+    x = np.asarray(x, dtype=float)
+    moda = _moda(distribucion)
+    distribucion, alpha, beta = _forma(distribucion, alpha, beta)
+    if hasattr(distribucion, "cdf"):
+        return distribucion.cdf(x, precio_max)
+    rango = precio_max - precio_min
+    u = np.clip((x - precio_min) / rango, 0.0, 1.0)
+    if distribucion == "Normal":
+        media = (precio_min + precio_max) / 2
+        cdf = _cdf_normal((x - media) / (rango / 6))
+        # Recorte a [precio_min, precio_max]: la cola inferior se acumula en precio_min
+        return np.where(x < precio_min, 0.0, np.where(x >= precio_max, 1.0, cdf))
+    elif distribucion == "Beta":
+        return _cdf_beta(u, alpha, beta)
+    elif distribucion == "Triangular":
+        # Cada rama solo se evalúa si su lado del triángulo existe (moda en un extremo)
+        izquierda = u * u / moda if moda > 0 else np.zeros_like(u)
+        derecha = 1 - (1 - u) ** 2 / (1 - moda) if moda < 1 else np.ones_like(u)
+        return np.where(u <= moda, izquierda, derecha)
+    return u
+
+
+def ppf_precios(u, precio_min, precio_max, distribucion="Uniforme", alpha=2.0, beta=2.0):
+    """Precio con ``cdf_precios`` = ``u``: transforma uniformes en (0, 1) en precios."""
+    u = np.asarray(u, dtype=float)
+    moda = _moda(distribucion)
+    distribucion, alpha, beta = _forma(distribucion, alpha, beta)
+    if hasattr(distribucion, "ppf"):
+        # Modelo empírico: cuantiles del descuento sobre el presupuesto (precio decreciente en u)
+        return precio_max * (1 - distribucion.ppf(u))
+    rango = precio_max - precio_min
+    if distribucion == "Normal":
+        media = (precio_min + precio_max) / 2
+        return np.clip(media + rango / 6 * _ppf_normal(u), precio_min, precio_max)
+    elif distribucion == "Beta":
+        bordes = np.linspace(0.0, 1.0, 4097)
+        return precio_min + np.interp(u, _cdf_beta(bordes, alpha, beta), bordes) * rango
+    elif distribucion == "Triangular":
+        return precio_min + rango * np.where(u <= moda, np.sqrt(u * moda), 1 - np.sqrt((1 - u) * (1 - moda)))
+    return precio_min + u * rango
+
+
+def atomos_precios(precio_min, precio_max, distribucion="Uniforme"):
+    """Lista de (precio, probabilidad) con masa puntual; solo la Normal recortada tiene."""
+    if distribucion == "Normal" and not hasattr(distribucion, "cdf"):
+        cola = float(_cdf_normal(-3.0))
+        return [(precio_min, cola), (precio_max, cola)]
+    return []
@@ -0,0 +1,197 @@
+"""Modelo empírico de descuentos de los competidores a partir de licitaciones pasadas.
+
+El histórico (CSV o Parquet, posiblemente de cientos de miles de filas) se lee
+por trozos y se resume en tablas de cuantiles del descuento sobre el
+presupuesto base (ECDF o KDE), una fila por grupo (sector o empresa) más la
+fila global ``TODOS``. Muestrear precios es entonces una búsqueda vectorizada
+en esa tabla (CDF inversa) y las tablas se guardan en ``.npz`` para no
+reajustarlas mientras el fichero no cambie.
+
+Columnas del histórico: ``precio_ofertado`` y ``presupuesto_base`` (o
+directamente ``descuento`` en tanto por uno) y, para agrupar, ``empresa`` o
+``sector``.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+TODOS = "*"
+METODOS = ["ecdf", "kde"]
+PUNTOS_TABLA = 1025
+DIRECTORIO_CACHE = Path(os.environ.get("SIMULADOR_CACHE", Path.home() / ".cache" / "simulador_concursos"))
+
+
+@dataclass(frozen=True, eq=False)
+class ModeloDescuentos:
+    """Tabla de cuantiles del descuento: fila ``g`` = cuantiles del grupo ``etiquetas[g]``
+    en probabilidades equiespaciadas entre 0 y 1."""
+
+    etiquetas: tuple
+    cuantiles: np.ndarray
+    observaciones: np.ndarray
+    metodo: str = "ecdf"
+
+    @property
+    def huella(self):
+        # Identificador estable del contenido, útil como clave de caché
+        datos = repr((self.etiquetas, self.metodo)).encode() + self.cuantiles.tobytes()
+        return hashlib.sha1(datos).hexdigest()[:16]
+
+    def seleccionar(self, etiquetas):
+        # Una fila por rival; los grupos sin datos usan la fila global
+        indice = {e: i for i, e in enumerate(self.etiquetas)}
+        filas = [indice.get(e, indice[TODOS]) for e in etiquetas]
+        return ModeloDescuentos(tuple(etiquetas), self.cuantiles[filas],
+                                self.observaciones[filas], self.metodo)
+
+    def fila(self, j):
+        # Modelo de un solo rival: su fila, o la única si todos la comparten
+        if self.cuantiles.shape[0] == 1:
+            return self
+        return ModeloDescuentos((self.etiquetas[j],), self.cuantiles[j:j + 1],
+                                self.observaciones[j:j + 1], self.metodo)
+
+    def ppf(self, u):
+        # CDF inversa por interpolación lineal en la tabla. Con varias filas, la
+        # última dimensión de ``u`` recorre las filas (una columna por rival).
+        puntos = self.cuantiles.shape[1]
+        posicion = np.asarray(u) * (puntos - 1)
+        i = np.minimum(posicion.astype(np.int64), puntos - 2)
+        fraccion = posicion - i
+        if self.cuantiles.shape[0] > 1:
+            i += np.arange(self.cuantiles.shape[0]) * puntos
+        tabla = self.cuantiles.ravel()
+        inferior = np.take(tabla, i)
+        return inferior + (np.take(tabla, i + 1) - inferior) * fraccion
+
+    def cdf(self, precio, presupuesto_base):
+        # P(precio <= x) = P(descuento >= 1 - x / presupuesto). Con varias filas
+        # se añade una última dimensión con el valor de cada fila.
+        descuento = 1 - np.asarray(precio, dtype=float) / presupuesto_base
+        probabilidades = np.linspace(0.0, 1.0, self.cuantiles.shape[1])
+        if self.cuantiles.shape[0] == 1:
+            return 1 - np.interp(descuento, self.cuantiles[0], probabilidades)
+        return 1 - np.stack([np.interp(descuento, fila, probabilidades) for fila in self.cuantiles],
+                            axis=-1)
+
+    def muestrear(self, rng, presupuesto_base, size=None):
+        return presupuesto_base * (1 - self.ppf(rng.random(size)))
+
+
+def _trozos(fuente, columnas, tamano_trozo):
+    # Itera DataFrames con las columnas pedidas sin cargar el fichero completo
+    import pandas as pd
+
+    nombre = str(getattr(fuente, "name", fuente))
+    if nombre.lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Leer históricos en Parquet requiere pyarrow.") from e
+        fichero = pq.ParquetFile(fuente)
+        presentes = [c for c in columnas if c in fichero.schema_arrow.names]
+        for lote in fichero.iter_batches(batch_size=tamano_trozo, columns=presentes):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(fuente, usecols=lambda c: c in columnas, chunksize=tamano_trozo)
+
+
+def leer_descuentos(fuente, por=None, tamano_trozo=200_000):
+    """Descuentos (en tanto por uno) agrupados por ``por`` y en el grupo global ``TODOS``."""
+    columnas = ["descuento", "precio_ofertado", "presupuesto_base"] + ([por] if por else [])
+    grupos = {}
+    for trozo in _trozos(fuente, columnas, tamano_trozo):
+        if "descuento" in trozo:
+            descuento = trozo["descuento"].to_numpy(dtype=np.float64)
+        else:
+            descuento = 1 - (trozo["precio_ofertado"].to_numpy(dtype=np.float64)
+                             / trozo["presupuesto_base"].to_numpy(dtype=np.float64))
+        # Solo ofertas válidas: por debajo del presupuesto base y con precio positivo
+        validas = np.isfinite(descuento) & (descuento >= 0) & (descuento < 1)
+        descuento = descuento[validas]
+        grupos.setdefault(TODOS, []).append(descuento)
+        if por:
+            # Una sola ordenación por trozo: cada grupo es un tramo contiguo
+            etiquetas, grupo = np.unique(trozo[por].astype(str).to_numpy()[validas], return_inverse=True)
+            orden = np.argsort(grupo, kind="stable")
+            cortes = np.cumsum(np.bincount(grupo, minlength=etiquetas.size))[:-1]
+            for etiqueta, parte in zip(etiquetas, np.split(descuento[orden], cortes)):
+                grupos.setdefault(etiqueta, []).append(parte)
+    return {g: np.concatenate(partes) for g, partes in grupos.items()}
+
+
+def _cuantiles_kde(descuentos, probabilidades, bins=2048):
+    # KDE gaussiana (ancho de Silverman) sobre un histograma fino, integrada a una CDF
+    n = descuentos.size
+    iqr = np.subtract(*np.percentile(descuentos, [75, 25]))
+    ancho = 0.9 * min(descuentos.std(), iqr / 1.34 or descuentos.std()) * n ** -0.2
+    ancho = max(ancho, 1e-6)
+    inferior, superior = descuentos.min() - 4 * ancho, descuentos.max() + 4 * ancho
+    densidad, bordes = np.histogram(descuentos, bins, (inferior, superior))
+    paso = bordes[1] - bordes[0]
+    x = np.arange(-int(np.ceil(4 * ancho / paso)), int(np.ceil(4 * ancho / paso)) + 1) * paso
+    nucleo = np.exp(-0.5 * (x / ancho) ** 2)
+    densidad = np.convolve(densidad, nucleo / nucleo.sum(), mode="same")
+    cdf = np.concatenate(([0.0], np.cumsum(densidad)))
+    cdf /= cdf[-1]
+    cuantiles = np.interp(probabilidades, cdf, bordes)
+    # Los descuentos siguen acotados a [0, 1)
+    return np.clip(cuantiles, 0.0, np.nextafter(1.0, 0))
+
+
+def ajustar_modelo(grupos, metodo="ecdf", puntos=PUNTOS_TABLA, min_observaciones=30):
+    """Compila los descuentos de cada grupo en una tabla de CDF inversa."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido {metodo!r}; usa uno de {METODOS}")
+    if grupos.get(TODOS, np.empty(0)).size == 0:
+        raise ValueError("El histórico no contiene ofertas válidas.")
+    probabilidades = np.linspace(0.0, 1.0, puntos)
+    etiquetas = [TODOS] + sorted(g for g, d in grupos.items()
+                                 if g != TODOS and d.size >= min_observaciones)
+    cuantiles = np.empty((len(etiquetas), puntos))
+    for fila, etiqueta in enumerate(etiquetas):
+        descuentos = grupos[etiqueta]
+        if metodo == "kde" and descuentos.size > 1:
+            cuantiles[fila] = _cuantiles_kde(descuentos, probabilidades)
+        else:
+            cuantiles[fila] = np.quantile(descuentos, probabilidades)
+    observaciones = np.array([grupos[e].size for e in etiquetas])
+    return ModeloDescuentos(tuple(etiquetas), cuantiles, observaciones, metodo)
+
+
+def guardar_modelo(modelo, ruta):
+    np.savez(ruta, etiquetas=np.array(modelo.etiquetas), cuantiles=modelo.cuantiles,
+             observaciones=modelo.observaciones, metodo=modelo.metodo)
+
+
+def cargar_modelo(ruta):
+    with np.load(ruta) as datos:
+        return ModeloDescuentos(tuple(datos["etiquetas"].tolist()), datos["cuantiles"],
+                                datos["observaciones"], str(datos["metodo"]))
+
+
+def ajustar_desde_fichero(ruta, por=None, metodo="ecdf", puntos=PUNTOS_TABLA,
+                          directorio_cache=DIRECTORIO_CACHE):
+    """Ajusta (o recupera de la caché en disco) el modelo de un fichero histórico.
+
+    La clave de caché incluye la ruta, el tamaño y la fecha de modificación del
+    fichero, así que cualquier cambio en el histórico provoca un reajuste.
+    """
+    ruta = Path(ruta).resolve()
+    estado = ruta.stat()
+    clave = hashlib.sha1(
+        f"{ruta}|{estado.st_size}|{estado.st_mtime_ns}|{por}|{metodo}|{puntos}".encode()
+    ).hexdigest()[:16]
+    cache = Path(directorio_cache) / f"descuentos-{clave}.npz" if directorio_cache else None
+    if cache is not None and cache.exists():
+        return cargar_modelo(cache)
+
+    modelo = ajustar_modelo(leer_descuentos(ruta, por), metodo, puntos)
+    if cache is not None:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        guardar_modelo(modelo, cache)
+    return modelo
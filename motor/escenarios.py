@@ -0,0 +1,167 @@
+"""Guardado y carga de escenarios completos en un ``.npz`` compacto.
+
+Un escenario es el estado de la interfaz (valores de los controles) más los
+resultados ya calculados (tablas, Monte Carlo...). Los arrays se guardan
+comprimidos en el ``.npz`` y todo lo demás va en una cabecera JSON dentro del
+mismo fichero, así que cargar un escenario no repite ninguna simulación y dos
+escenarios pueden compararse con ``python -m motor.escenarios a.npz b.npz``.
+"""
+
+import argparse
+import io
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from motor.montecarlo import CampoRivales
+
+VERSION = 1
+CABECERA = "__cabecera__"
+
+
+def _aplanar(valor, ruta, arrays):
+    # Objeto -> estructura JSON; los arrays se apartan con una referencia a su ruta
+    if isinstance(valor, np.ndarray):
+        # Sin pickle: las columnas de texto (dtype object) se guardan como unicode
+        arrays[ruta] = valor.astype(str) if valor.dtype == object else valor
+        return {"__array__": ruta}
+    if isinstance(valor, pd.DataFrame):
+        return {"__tabla__": [_aplanar(valor[c].to_numpy(), f"{ruta}/{i}", arrays)
+                              for i, c in enumerate(valor.columns)],
+                "columnas": list(valor.columns), "indice": valor.index.tolist()}
+    if isinstance(valor, CampoRivales):
+        return {"__campo__": [_aplanar(valor.mejor_rival, f"{ruta}/mejor_rival", arrays),
+                              _aplanar(valor.credito_empate, f"{ruta}/credito_empate", arrays)]}
+    if isinstance(valor, dict):
+        if all(isinstance(k, str) for k in valor):
+            return {k: _aplanar(v, f"{ruta}/{k}", arrays) for k, v in valor.items()}
+        # Claves no textuales (p. ej. percentiles 5, 25...): pares para no perder el tipo
+        return {"__pares__": [[k, _aplanar(v, f"{ruta}/{i}", arrays)]
+                              for i, (k, v) in enumerate(valor.items())]}
+    if isinstance(valor, (list, tuple)):
+        return [_aplanar(v, f"{ruta}/{i}", arrays) for i, v in enumerate(valor)]
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def _reconstruir(valor, arrays):
+    if isinstance(valor, list):
+        return [_reconstruir(v, arrays) for v in valor]
+    if not isinstance(valor, dict):
+        return valor
+    if "__array__" in valor:
+        return arrays[valor["__array__"]]
+    if "__tabla__" in valor:
+        columnas = [_reconstruir(c, arrays) for c in valor["__tabla__"]]
+        return pd.DataFrame(dict(zip(valor["columnas"], columnas)), index=valor["indice"])
+    if "__campo__" in valor:
+        return CampoRivales.desde_tablas(*(_reconstruir(c, arrays) for c in valor["__campo__"]))
+    if "__pares__" in valor:
+        return {k: _reconstruir(v, arrays) for k, v in valor["__pares__"]}
+    return {k: _reconstruir(v, arrays) for k, v in valor.items()}
+
+
+def guardar_escenario(destino, estado, resultados=None):
+    """Escribe ``estado`` (valores JSON) y ``resultados`` en ``destino`` (ruta o fichero).
+
+    Devuelve los bytes escritos si ``destino`` es ``None``.
+    """
+    arrays = {}
+    cabecera = {
+        "version": VERSION,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "estado": _aplanar(estado, "estado", arrays),
+        "resultados": _aplanar(resultados or {}, "resultados", arrays),
+    }
+    arrays[CABECERA] = np.array(json.dumps(cabecera, ensure_ascii=False))
+    salida = io.BytesIO() if destino is None else destino
+    np.savez_compressed(salida, **arrays)
+    return salida.getvalue() if destino is None else None
+
+
+def cargar_escenario(fuente):
+    """(estado, resultados, cabecera) de un escenario guardado con ``guardar_escenario``."""
+    with np.load(fuente, allow_pickle=False) as datos:
+        cabecera = json.loads(datos[CABECERA].item())
+        if cabecera.get("version") != VERSION:
+            raise ValueError(f"Versión de escenario no soportada: {cabecera.get('version')!r}")
+        arrays = {k: datos[k] for k in datos.files if k != CABECERA}
+    estado = _reconstruir(cabecera.pop("estado"), arrays)
+    resultados = _reconstruir(cabecera.pop("resultados"), arrays)
+    return estado, resultados, cabecera
+
+
+def _describir(valor):
+    if isinstance(valor, pd.DataFrame):
+        return f"tabla {valor.shape}"
+    if isinstance(valor, CampoRivales):
+        return f"campo de {valor.ensayos} ensayos"
+    if isinstance(valor, np.ndarray):
+        return f"array {valor.shape}"
+    return valor
+
+
+def _normalizar(valor):
+    # Como queda al guardarlo: escalares de NumPy a Python y tuplas a listas
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, tuple):
+        return list(valor)
+    return valor
+
+
+def comparar_escenarios(a, b, tolerancia=1e-9):
+    """Diferencias entre dos escenarios (cargados o en memoria): [(clave, valor_a, valor_b)]."""
+    (estado_a, resultados_a, _), (estado_b, resultados_b, _) = a, b
+    diferencias = []
+
+    def comparar(x, y, ruta):
+        x, y = _normalizar(x), _normalizar(y)
+        if isinstance(x, dict) and isinstance(y, dict):
+            for k in sorted(set(x) | set(y), key=str):
+                comparar(x.get(k), y.get(k), f"{ruta}/{k}")
+        elif isinstance(x, list) and isinstance(y, list) and len(x) == len(y):
+            for i, (xi, yi) in enumerate(zip(x, y)):
+                comparar(xi, yi, f"{ruta}/{i}")
+        elif isinstance(x, pd.DataFrame) and isinstance(y, pd.DataFrame):
+            if not x.equals(y):
+                diferencias.append((ruta, _describir(x), _describir(y)))
+        elif isinstance(x, CampoRivales) and isinstance(y, CampoRivales):
+            if x.huella != y.huella:
+                diferencias.append((ruta, _describir(x), _describir(y)))
+        elif isinstance(x, np.ndarray) and isinstance(y, np.ndarray):
+            if x.shape != y.shape or x.dtype.kind != y.dtype.kind:
+                diferencias.append((ruta, _describir(x), _describir(y)))
+            elif x.dtype.kind in "fiu":
+                maxima = float(np.max(np.abs(x.astype(float) - y), initial=0.0))
+                if maxima > tolerancia:
+                    diferencias.append((ruta, f"máx. |Δ| = {maxima:.6g}", ""))
+            elif not np.array_equal(x, y):
+                diferencias.append((ruta, x.tolist(), y.tolist()))
+        elif type(x) is not type(y) or (x != y and not (x != x and y != y)):
+            # Los nan guardados siguen siendo nan: no cuentan como diferencia
+            diferencias.append((ruta, _describir(x), _describir(y)))
+
+    comparar(estado_a, estado_b, "estado")
+    comparar(resultados_a, resultados_b, "resultados")
+    return diferencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m motor.escenarios",
+                                     description="Compara dos escenarios guardados (.npz).")
+    parser.add_argument("a")
+    parser.add_argument("b")
+    args = parser.parse_args(argv)
+    diferencias = comparar_escenarios(cargar_escenario(args.a), cargar_escenario(args.b))
+    for clave, valor_a, valor_b in diferencias:
+        print(f"{clave}: {valor_a!r} -> {valor_b!r}" if valor_b != "" else f"{clave}: {valor_a}")
+    print(f"{len(diferencias)} diferencias")
+    return 1 if diferencias else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
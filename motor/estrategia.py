@@ -0,0 +1,139 @@
+"""Estrategia óptima de EMCO entre ofertas individuales e integradoras.
+
+Los rivales ofertan por lotes sueltos, así que en cada ensayo del campo
+simulado basta con la puntuación del mejor rival en cada lote: una
+integradora de EMCO sobre los lotes B gana si su total ponderado en B supera
+al de los mejores rivales en B. Los rivales de todos los lotes se puntúan
+juntos con ``Pliego.puntuar`` y cada integradora es una fila de
+``Pliego.incidencia``. Con integradoras disjuntas el valor de una estrategia
+(probabilidad de victoria ponderada por los pesos del pliego) es la suma de
+los valores de sus piezas, de modo que cada pieza se evalúa una sola vez
+sobre los arrays del Monte Carlo y la búsqueda entre integradoras es un
+empaquetado de conjuntos que se recorre con ramificación y poda.
+"""
+
+import numpy as np
+
+from motor.lotes import PLIEGO
+from motor.montecarlo import mejor_rival_por_lote
+from motor.perfil import cronometrado
+
+# Diferencia relativa de totales ponderados que se considera empate
+TOLERANCIA_EMPATE = 1e-12
+
+
+def credito_individual(total_emco, mejor, empates):
+    # Crédito de victoria por ensayo de una oferta individual (empates repartidos)
+    return np.where(total_emco > mejor, 1.0, np.where(total_emco == mejor, 1.0 / (1 + empates), 0.0))
+
+
+def valores_opciones(totales_emco, mejor, empates, mejora=0.0, exclusiva=True, pliego=PLIEGO):
+    """Valor y probabilidad por lote de cada pieza: ofertas individuales e integradoras.
+
+    ``totales_emco`` va indexado por lote (nombre corto) y ``mejor`` y ``empates``
+    son matrices ensayos × lotes (ver ``mejor_rival_por_lote``). ``mejora`` son los
+    puntos extra por lote de la integradora sobre la oferta individual (un número
+    o un dict por lote). Con ``exclusiva`` los lotes de una integradora no llevan
+    además oferta individual.
+    Devuelve ``{pieza: (valor, {lote: probabilidad})}`` con piezas ``frozenset``.
+    """
+    lotes, peso = pliego.cortos, pliego.pesos
+    mejora = mejora if isinstance(mejora, dict) else dict.fromkeys(lotes, mejora)
+    # Ensayos × lotes: todas las piezas se evalúan con unas pocas operaciones matriciales
+    propio = np.array([totales_emco[l] + mejora[l] for l in lotes]) * peso
+    creditos = credito_individual(np.array([totales_emco[l] for l in lotes]), mejor, empates)
+    prob_individual = creditos.mean(axis=0)
+
+    opciones = {}
+    for j, l in enumerate(lotes):
+        opciones[frozenset([l])] = (float(peso[j] * prob_individual[j]), {l: float(prob_individual[j])})
+
+    piezas = [frozenset(integrable) for integrable in pliego.integrables]
+    if not piezas:
+        return opciones
+    incidencia = pliego.incidencia.astype(float)
+    rivales = (mejor * peso) @ incidencia.T
+    # Empate con la mejor combinación rival: como en ``credito_individual``, el crédito se
+    # reparte con cada combinación que la iguala (el producto de los empates de sus lotes).
+    # Con tolerancia, para que el orden de las sumas ponderadas no decida los empates exactos
+    propios = incidencia @ propio
+    diferencia = propios - rivales
+    empate = np.abs(diferencia) <= TOLERANCIA_EMPATE * np.abs(propios)
+    combinaciones = np.rint(np.exp(np.log(empates) @ incidencia.T))
+    gana = np.where(empate, 1.0 / (1 + combinaciones), (diferencia > 0).astype(float))
+    prob_gana = gana.mean(axis=0)
+    if not exclusiva:
+        # Si la integradora pierde, cada lote aún puede ganarse con la oferta individual
+        ambas = gana.T @ creditos / len(gana)
+        rescate = prob_gana[:, None] + prob_individual - ambas
+    for k, pieza in enumerate(piezas):
+        if exclusiva:
+            probs = dict.fromkeys(pieza, float(prob_gana[k]))
+        else:
+            probs = {l: float(rescate[k, j]) for j, l in enumerate(lotes) if l in pieza}
+        opciones[pieza] = (float(sum(peso[lotes.index(l)] * probs[l] for l in pieza)), probs)
+    return opciones
+
+
+def optimizar_estrategia(opciones, pliego=PLIEGO):
+    """Integradoras disjuntas + individuales en el resto que maximizan el valor total.
+
+    Ramificación y poda sobre el primer lote libre: o va en una oferta
+    individual o en una integradora cuyos lotes estén todos libres. La cota de
+    cada lote libre es lo máximo que puede aportar, repartiendo el valor de
+    cada integradora entre sus lotes según su peso.
+    """
+    lotes = pliego.cortos
+    peso = dict(zip(lotes, pliego.pesos))
+    cota = {l: max(valor * peso[l] / sum(peso[m] for m in pieza)
+                   for pieza, (valor, _) in opciones.items() if l in pieza)
+            for l in lotes}
+    # Piezas de cada lote, de mayor a menor valor: las buenas soluciones aparecen antes y podan más
+    piezas_lote = {l: sorted((p for p in opciones if l in p), key=lambda p: -opciones[p][0]) for l in lotes}
+
+    mejor = {"valor": -1.0, "piezas": []}
+    contadores = {"nodos": 0, "podados": 0}
+
+    def ramificar(libres, piezas, acumulado):
+        contadores["nodos"] += 1
+        if not libres:
+            if acumulado > mejor["valor"]:
+                mejor.update(valor=acumulado, piezas=list(piezas))
+            return
+        if acumulado + sum(cota[l] for l in libres) <= mejor["valor"]:
+            contadores["podados"] += 1
+            return
+        primero = next(l for l in lotes if l in libres)
+        for pieza in piezas_lote[primero]:
+            if pieza <= libres:
+                piezas.append(pieza)
+                ramificar(libres - pieza, piezas, acumulado + opciones[pieza][0])
+                piezas.pop()
+
+    ramificar(frozenset(lotes), [], 0.0)
+    probs = {}
+    for pieza in mejor["piezas"]:
+        probs.update(opciones[pieza][1])
+    return {
+        "integradoras": [sorted(p, key=lotes.index) for p in mejor["piezas"] if len(p) > 1],
+        "individuales": sorted((l for p in mejor["piezas"] if len(p) == 1 for l in p), key=lotes.index),
+        "valor": mejor["valor"],
+        "valor_individual": sum(opciones[frozenset([l])][0] for l in lotes),
+        "prob_por_lote": {l: probs[l] for l in lotes},
+        **contadores,
+    }
+
+
+@cronometrado("estrategia.estrategia_optima")
+def estrategia_optima(campos, totales_emco, n_ensayos=100_000, semilla=None, mejora=0.0, exclusiva=True,
+                      avance=None, pliego=PLIEGO):
+    """Simula el campo de todos los lotes una vez y busca la mejor estrategia de EMCO.
+
+    ``campos`` es ``{corto: (n_rivales, distribucion, bajada_max, tecnico)}`` y
+    ``totales_emco`` la puntuación individual de EMCO en cada lote del pliego.
+    """
+    mejor, empates = mejor_rival_por_lote(pliego, campos, n_ensayos, semilla, avance=avance)
+    opciones = valores_opciones(totales_emco, mejor, empates, mejora, exclusiva, pliego)
+    resultado = optimizar_estrategia(opciones, pliego)
+    resultado["opciones"] = opciones
+    return resultado
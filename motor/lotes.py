@@ -0,0 +1,158 @@
+"""Parámetros de puntuación de cada lote del pliego.
+
+El pliego se describe en un JSON (``pliegos/pa5_2025.json`` por defecto, o la
+ruta de ``SIMULADOR_PLIEGO``): lotes con su presupuesto, umbrales, puntos
+máximos, peso y criterios técnicos, y los grupos de lotes que admiten oferta
+integradora. Se valida al leerlo (``ValueError`` si un lote no es coherente) y
+se compila una sola vez en arrays de coeficientes (uno por lote) para puntuar
+todos los lotes en una sola pasada, así que un pliego con más lotes no
+necesita cambios en el código.
+"""
+
+import dataclasses
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from motor.puntuacion import calcular_puntuacion_total
+
+RUTA_PLIEGO = Path(os.environ.get("SIMULADOR_PLIEGO", Path(__file__).with_name("pliegos") / "pa5_2025.json"))
+# Puntos de precio, garantía y criterios técnicos de cada lote (``puntuacion_maxima`` en el JSON)
+PUNTUACION_MAXIMA = 100
+
+
+@dataclass(frozen=True)
+class ParametrosLote:
+    presupuesto_base: float
+    pmax_precio: float
+    pmax_garantia: float
+    p_tecnico_max: int
+    u1_garantia: float = 3
+    u2_garantia: float = 5
+    factor_u2_precio: float = 0.8
+    p_tecnico_min: int = 20
+    # Nombre del lote en el pliego: identifica sus flujos aleatorios (no cuenta al comparar)
+    nombre: str = field(default="", compare=False)
+
+    @property
+    def u1_precio(self):
+        return self.presupuesto_base
+
+    @property
+    def u2_precio(self):
+        return self.presupuesto_base * self.factor_u2_precio
+
+    def precio_minimo(self, bajada_max):
+        # Límite inferior de los precios simulados para una bajada máxima (%)
+        return self.presupuesto_base * (1 - bajada_max / 100)
+
+
+def _validar_lote(nombre, lote, criterios, peso, puntuacion_maxima):
+    # Rechaza los lotes con los que la puntuación o el sorteo de rivales no tendrían sentido
+    errores = []
+    if not criterios:
+        errores.append("no tiene criterios técnicos")
+    elif any(not isinstance(v, int) or v <= 0 for v in criterios.values()):
+        errores.append(f"los puntos de cada criterio deben ser enteros positivos: {criterios}")
+    else:
+        tecnicos = sum(criterios.values())
+        total = lote.pmax_precio + lote.pmax_garantia + tecnicos
+        if total != puntuacion_maxima:
+            errores.append(f"precio ({lote.pmax_precio}) + garantía ({lote.pmax_garantia}) + criterios "
+                           f"({tecnicos}) suman {total}, no {puntuacion_maxima}")
+        if not 0 <= lote.p_tecnico_min <= lote.p_tecnico_max <= tecnicos:
+            errores.append(f"se necesita 0 <= p_tecnico_min ({lote.p_tecnico_min}) <= p_tecnico_max "
+                           f"({lote.p_tecnico_max}) <= puntos de los criterios ({tecnicos})")
+    if not lote.presupuesto_base > 0:
+        errores.append(f"presupuesto_base debe ser positivo ({lote.presupuesto_base})")
+    if not (lote.pmax_precio > 0 and lote.pmax_garantia >= 0):
+        errores.append(f"puntos máximos no válidos: precio {lote.pmax_precio}, garantía {lote.pmax_garantia}")
+    if not 0 < lote.factor_u2_precio < 1:
+        errores.append(f"factor_u2_precio debe estar entre 0 y 1 ({lote.factor_u2_precio})")
+    if not 0 <= lote.u1_garantia < lote.u2_garantia:
+        errores.append(f"se necesita 0 <= u1_garantia ({lote.u1_garantia}) < u2_garantia ({lote.u2_garantia})")
+    if not peso > 0:
+        errores.append(f"el peso debe ser positivo ({peso})")
+    if errores:
+        raise ValueError(f"Pliego no válido en {nombre!r}: " + "; ".join(errores))
+
+
+class Pliego:
+    """Lotes de un concurso compilados en arrays de coeficientes.
+
+    ``lotes`` va por nombre («Lote 1») y ``cortos`` son los nombres breves
+    («L1») de las ofertas integradoras. Cada atributo de coeficientes
+    (``presupuesto_base``, ``u1_precio``, ``pmax_garantia``...) es un array
+    con un valor por lote, en el orden del pliego; ``incidencia`` es la
+    matriz booleana integrables × lotes.
+    """
+
+    def __init__(self, nombre, lotes, cortos, pesos, criterios, integrables, titulo=""):
+        self.nombre = nombre
+        self.titulo = titulo
+        self.lotes = dict(lotes)
+        self.cortos = list(cortos)
+        self.pesos = np.asarray(pesos, dtype=float)
+        self.criterios = dict(criterios)
+        self.integrables = [set(grupo) for grupo in integrables]
+        parametros = list(self.lotes.values())
+        for campo in [f.name for f in dataclasses.fields(ParametrosLote) if f.compare] + ["u1_precio", "u2_precio"]:
+            setattr(self, campo, np.array([getattr(p, campo) for p in parametros], dtype=float))
+        self.incidencia = np.array([[c in grupo for c in self.cortos] for grupo in self.integrables],
+                                   dtype=bool).reshape(len(self.integrables), len(self.cortos))
+
+    @classmethod
+    def desde_dict(cls, datos):
+        # Valida el pliego tal y como se lee del JSON
+        campos = {f.name for f in dataclasses.fields(ParametrosLote)}
+        puntuacion_maxima = datos.get("puntuacion_maxima", PUNTUACION_MAXIMA)
+        lotes, cortos, pesos, criterios = {}, [], [], {}
+        for i, lote in enumerate(datos.get("lotes", [])):
+            nombre = lote.get("nombre", f"Lote {i + 1}")
+            faltan = sorted({"presupuesto_base", "pmax_precio", "pmax_garantia", "peso"} - set(lote))
+            if faltan:
+                raise ValueError(f"Faltan campos en {nombre!r}: {faltan}")
+            if nombre in lotes:
+                raise ValueError(f"Lote repetido en el pliego: {nombre!r}")
+            criterios[nombre] = dict(lote.get("criterios", {}))
+            maximo = lote.get("p_tecnico_max", sum(criterios[nombre].values()))
+            valores = {c: v for c, v in lote.items() if c in campos}
+            lotes[nombre] = ParametrosLote(**valores | {"p_tecnico_max": maximo, "nombre": nombre})
+            _validar_lote(nombre, lotes[nombre], criterios[nombre], lote["peso"], puntuacion_maxima)
+            cortos.append(lote.get("corto", f"L{i + 1}"))
+            pesos.append(float(lote["peso"]))
+        if not lotes:
+            raise ValueError("El pliego no define ningún lote")
+        if len(set(cortos)) != len(cortos):
+            raise ValueError(f"Nombres cortos repetidos en el pliego: {cortos}")
+        integrables = datos.get("integrables", [])
+        desconocidos = sorted({c for grupo in integrables for c in grupo} - set(cortos))
+        if desconocidos:
+            raise ValueError(f"Integrables con lotes desconocidos: {desconocidos}")
+        pequenos = [grupo for grupo in integrables if len(set(grupo)) < 2]
+        if pequenos:
+            raise ValueError(f"Una oferta integradora necesita al menos dos lotes: {pequenos}")
+        return cls(datos.get("nombre", ""), lotes, cortos, pesos, criterios, integrables, datos.get("titulo", ""))
+
+    def puntuar(self, ofertas, garantias, puntos_tecnicos):
+        """Puntuación total con el último eje recorriendo los lotes (p. ej. ensayos × empresas × lotes)."""
+        return calcular_puntuacion_total(
+            ofertas, garantias, puntos_tecnicos, self.u1_precio, self.u2_precio, self.pmax_precio,
+            self.u1_garantia, self.u2_garantia, self.pmax_garantia
+        )
+
+
+def cargar_pliego(ruta=RUTA_PLIEGO):
+    """Lee y compila un pliego en JSON (ver ``Pliego``)."""
+    with open(ruta, encoding="utf-8") as f:
+        return Pliego.desde_dict(json.load(f))
+
+
+# === Pliego en uso (por defecto, el concurso PA5/2025) ===
+PLIEGO = cargar_pliego()
+LOTES = PLIEGO.lotes
+PESOS = PLIEGO.pesos.tolist()
+CRITERIOS = PLIEGO.criterios
@@ -0,0 +1,398 @@
+"""Simulación Monte Carlo del campo de competidores de un lote.
+
+Cada ensayo es un escenario completo de rivales (precio, garantía y puntos
+técnicos). Los ensayos se generan por bloques como matrices ensayos × rivales,
+de modo que 10⁶ ensayos con 20 empresas no necesitan ningún bucle por empresa
+ni materializar la matriz completa en memoria.
+"""
+
+import hashlib
+from statistics import NormalDist
+
+import numpy as np
+
+from motor.aleatorio import BLOQUE_FLUJO, Flujos
+from motor.distribuciones import _ppf_normal, muestrear_precios, ppf_precios
+from motor.muestreo import BLOQUE_COMPLETO, uniformes, varianza_bloques
+from motor.perfil import cronometrado
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio
+from motor.tecnicos import percentil_precio
+from motor.temeraria import mascara_temeraria
+
+TAMANO_BLOQUE = 50_000
+# Bloques de flujo (réplicas independientes) necesarios para fiarse del error estándar medido
+MIN_REPLICAS = 8
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def sortear_rival(rng, lote, n, distribucion="Uniforme", bajada_max=20, tecnico=None, muestreo=None, rival=0):
+    # Cada magnitud sale de su propio flujo hijo (garantías, técnicos, precios), así los
+    # primeros sorteos no dependen de ``n`` ni de la distribución de las demás magnitudes.
+    # Con un modelo por criterios los técnicos son sus latentes (calidad, ruido por criterio)
+    if muestreo not in (None, "Aleatorio"):
+        return _sortear_rival_uniformes(rng, lote, n, distribucion, bajada_max, tecnico, muestreo, rival)
+    rng_garantias, rng_tecnicos, rng_precios = rng.spawn(3)
+    garantias = rng_garantias.uniform(lote.u1_garantia, lote.u2_garantia + 1, n)
+    if tecnico is None:
+        tecnicos = rng_tecnicos.integers(lote.p_tecnico_min, lote.p_tecnico_max + 1, n)
+    else:
+        tecnicos = tecnico.latentes(rng_tecnicos, n)
+    precios = muestrear_precios(rng_precios, lote.precio_minimo(bajada_max), lote.presupuesto_base,
+                                distribucion, n)
+    return precios, garantias, tecnicos
+
+
+def _sortear_rival_uniformes(rng, lote, n, distribucion, bajada_max, tecnico, muestreo, rival):
+    # Lo mismo a partir de una matriz de uniformes (ver motor.muestreo). Columnas:
+    # precio, técnicos (un entero, o calidad y un ruido por criterio) y garantía
+    dimensiones = 3 if tecnico is None else 3 + len(tecnico.maximos)
+    u = uniformes(rng, n, dimensiones, muestreo, rival)
+    precios = ppf_precios(u[:, 0], lote.precio_minimo(bajada_max), lote.presupuesto_base, distribucion)
+    if tecnico is None:
+        amplitud = lote.p_tecnico_max - lote.p_tecnico_min + 1
+        tecnicos = lote.p_tecnico_min + np.minimum((u[:, 1] * amplitud).astype(np.int64), amplitud - 1)
+    else:
+        normales = _ppf_normal(u[:, 1:-1])
+        tecnicos = normales[:, 0], normales[:, 1:]
+    garantias = lote.u1_garantia + u[:, -1] * (lote.u2_garantia + 1 - lote.u1_garantia)
+    return precios, garantias, tecnicos
+
+
+def sortear_rivales(flujos, lote, inicio, n_ensayos, n_rivales, distribucion="Uniforme", bajada_max=20,
+                    tecnico=None, muestreo=None):
+    # Matrices (ensayos × rivales) de precios, garantías y puntos técnicos para los
+    # ensayos [inicio, inicio + n_ensayos). Cada rival sortea el principio de cada bloque
+    # de flujo hasta el último ensayo pedido (el bloque completo con los muestreos de
+    # ``BLOQUE_COMPLETO``); como los sorteos de un bloque son un prefijo común, el
+    # resultado no depende de cómo se reparta la simulación. Orden Fortran: cada rival
+    # rellena columnas contiguas.
+    forma = (n_ensayos, n_rivales)
+    precios, garantias = np.empty(forma, order="F"), np.empty(forma, order="F")
+    tecnicos = np.empty(forma, dtype=np.int64, order="F")
+    destino = 0
+    for bloque, desde, hasta in flujos.bloques(inicio, n_ensayos):
+        filas = slice(destino, destino + hasta - desde)
+        sorteos = BLOQUE_FLUJO if muestreo in BLOQUE_COMPLETO else hasta
+        if tecnico is not None:
+            # Tensor rivales × ensayos × criterios del bloque (cada rival rellena una capa contigua)
+            calidad = np.empty((n_rivales, hasta - desde))
+            ruido = np.empty((n_rivales, hasta - desde, len(tecnico.maximos)))
+            percentil = np.empty((n_rivales, hasta - desde)) if tecnico.correlacion else None
+        for j in range(n_rivales):
+            # Con un modelo de una fila por rival, cada columna muestrea de la suya
+            dist_j = distribucion.fila(j) if hasattr(distribucion, "fila") else distribucion
+            p, g, t = sortear_rival(flujos.generador(j, bloque), lote, sorteos, dist_j, bajada_max, tecnico,
+                                    muestreo, j)
+            precios[filas, j] = p[desde:hasta]
+            garantias[filas, j] = g[desde:hasta]
+            if tecnico is None:
+                tecnicos[filas, j] = t[desde:hasta]
+            else:
+                calidad[j], ruido[j] = t[0][desde:hasta], t[1][desde:hasta]
+                if percentil is not None:
+                    percentil[j] = percentil_precio(p[desde:hasta], lote, dist_j, bajada_max)
+        if tecnico is not None:
+            tecnicos[filas] = tecnico.puntos(calidad, ruido, percentil).T
+        destino = filas.stop
+    return precios, garantias, tecnicos
+
+
+def puntuar_rivales(lote, precios, garantias, tecnicos):
+    # Puntuación total de cada competidor (mismas formas que las entradas)
+    totales = calcular_puntuacion_precio(precios, lote.u1_precio, lote.u2_precio, lote.pmax_precio)
+    totales += calcular_puntuacion_garantia(garantias, lote.u1_garantia, lote.u2_garantia,
+                                            lote.pmax_garantia)
+    totales += tecnicos
+    return totales
+
+
+def simular_rivales(flujos, lote, inicio, n_ensayos, n_rivales, distribucion="Uniforme", bajada_max=20,
+                    tecnico=None, muestreo=None):
+    # Matriz (ensayos × rivales) con la puntuación total de cada competidor
+    return puntuar_rivales(lote, *sortear_rivales(flujos, lote, inicio, n_ensayos, n_rivales, distribucion,
+                                                  bajada_max, tecnico, muestreo))
+
+
+def simular_bloque(flujos, lote, inicio, n_ensayos, n_rivales, distribucion, bajada_max, tecnico, muestreo,
+                   total_emco, oferta_emco=None):
+    # (rivales, total de EMCO, rivales sin excluir) de un bloque de ensayos. Con
+    # ``oferta_emco`` se excluyen las bajas temerarias de cada ensayo (ver motor.temeraria),
+    # EMCO incluida: un rival excluido puntúa 0 y EMCO, si lo está, -inf, así que pierde y
+    # queda la última. La exclusión vale solo para ese precio de EMCO, así que el campo que
+    # se reutiliza con otros precios sale de los rivales sin excluir
+    precios, garantias, tecnicos = sortear_rivales(flujos, lote, inicio, n_ensayos, n_rivales, distribucion,
+                                                   bajada_max, tecnico, muestreo)
+    rivales = puntuar_rivales(lote, precios, garantias, tecnicos)
+    if oferta_emco is None:
+        return rivales, total_emco, rivales
+    sin_excluir = rivales.copy()
+    ofertas = np.empty((n_ensayos, n_rivales + 1))
+    ofertas[:, :-1], ofertas[:, -1] = precios, oferta_emco
+    temerarias = mascara_temeraria(ofertas, lote.presupuesto_base)
+    rivales[temerarias[:, :-1]] = 0.0
+    return rivales, np.where(temerarias[:, -1], -np.inf, total_emco)[:, None], sin_excluir
+
+
+def evaluar_ensayos(total_emco, rivales):
+    # Crédito de victoria (empates repartidos a partes iguales) y puesto de EMCO por ensayo.
+    # El puesto cuenta solo los rivales con puntuación estrictamente mayor. ``total_emco``
+    # es un escalar o una columna (un total por ensayo).
+    n_mayor = np.count_nonzero(rivales > total_emco, axis=1)
+    n_igual = np.count_nonzero(rivales == total_emco, axis=1)
+    credito = np.where(n_mayor == 0, 1.0 / (1 + n_igual), 0.0)
+    return credito, n_mayor + 1
+
+
+class CampoRivales:
+    """Mejor rival de cada ensayo, ordenado para puntuar muchas ofertas de EMCO
+    contra los mismos sorteos (números aleatorios comunes)."""
+
+    def __init__(self, mejor_rival, empates_mejor):
+        orden = np.argsort(mejor_rival, kind="stable")
+        self.mejor_rival = mejor_rival[orden]
+        # Crédito acumulado de empatar con el mejor rival en cada ensayo
+        self.credito_empate = np.concatenate(([0.0], np.cumsum(1.0 / (1 + empates_mejor[orden]))))
+
+    @classmethod
+    def desde_tablas(cls, mejor_rival, credito_empate):
+        # Reconstruye un campo ya ordenado (por ejemplo, leído de un escenario guardado)
+        campo = cls.__new__(cls)
+        campo.mejor_rival = mejor_rival
+        campo.credito_empate = credito_empate
+        return campo
+
+    @property
+    def ensayos(self):
+        return self.mejor_rival.size
+
+    @property
+    def huella(self):
+        # Identificador estable de los sorteos, útil como clave de caché
+        return hashlib.sha1(self.mejor_rival.tobytes() + self.credito_empate.tobytes()).hexdigest()[:16]
+
+    def prob_victoria(self, totales_emco):
+        # Válido para arrays de cualquier forma: O(log N) por cada total evaluado
+        izquierda = np.searchsorted(self.mejor_rival, totales_emco, side="left")
+        derecha = np.searchsorted(self.mejor_rival, totales_emco, side="right")
+        empates = self.credito_empate[derecha] - self.credito_empate[izquierda]
+        return (izquierda + empates) / self.ensayos
+
+
+class Precision:
+    """Créditos de victoria acumulados por bloque de flujo para medir la varianza.
+
+    Cada bloque de flujo es una réplica independiente incluso con los
+    muestreos de ``motor.muestreo``, así que la dispersión entre bloques da la
+    varianza real del estimador; la de los créditos sueltos, la que tendría un
+    muestreo aleatorio con los mismos ensayos.
+    """
+
+    def __init__(self, n_ensayos):
+        self.sumas = np.zeros(-(-n_ensayos // BLOQUE_FLUJO))
+        self.ensayos = np.zeros(self.sumas.size)
+        self.suma_cuadrados = 0.0
+
+    def anadir(self, inicio, credito):
+        bloques = (inicio + np.arange(credito.size)) // BLOQUE_FLUJO
+        self.sumas += np.bincount(bloques, weights=credito, minlength=self.sumas.size)
+        self.ensayos += np.bincount(bloques, minlength=self.sumas.size)
+        self.suma_cuadrados += float(np.dot(credito, credito))
+
+    @property
+    def replicas(self):
+        return int(np.count_nonzero(self.ensayos))
+
+    def resumen(self):
+        # Error estándar de la probabilidad y factor de reducción de varianza;
+        # None con menos de MIN_REPLICAS bloques, pues la medida sería solo ruido
+        varianza = varianza_bloques(self.sumas, self.ensayos)
+        if self.replicas < MIN_REPLICAS or not varianza >= 0:
+            return {"error_estandar": None, "reduccion_varianza": None}
+        n = self.ensayos.sum()
+        media = self.sumas.sum() / n
+        varianza_aleatoria = max(self.suma_cuadrados / n - media * media, 0.0) / n
+        return {
+            "error_estandar": float(np.sqrt(varianza)),
+            "reduccion_varianza": float(varianza_aleatoria / varianza) if varianza > 0 else None,
+        }
+
+
+def mejor_rival_por_lote(pliego, campos, n_ensayos=100_000, semilla=None, tamano_bloque=TAMANO_BLOQUE,
+                         avance=None, muestreo=None):
+    """(mejor, empates): matrices ensayos × lotes con la puntuación del mejor rival y
+    el nº de rivales que la igualan, en orden de ensayo.
+
+    ``campos`` es ``{corto: (n_rivales, distribucion, bajada_max, tecnico)}`` para
+    cada lote de ``pliego``. Mismos sorteos que ``simular_montecarlo`` con la misma
+    semilla, pero sin ordenar, y todos los lotes se puntúan juntos con
+    ``pliego.puntuar`` sobre un tensor ensayos × rivales × lotes.
+    """
+    lotes = list(pliego.lotes.values())
+    parametros = [campos[c] for c in pliego.cortos]
+    flujos = [Flujos(semilla, lote) for lote in lotes]
+    n_rivales = np.array([p[0] for p in parametros])
+    # Los lotes con menos rivales se rellenan con huecos que nunca son el mejor
+    huecos = np.arange(n_rivales.max())[:, None] >= n_rivales
+    mejor = np.empty((n_ensayos, len(lotes)))
+    empates = np.empty((n_ensayos, len(lotes)), dtype=np.int64)
+    for inicio in range(0, n_ensayos, tamano_bloque):
+        n = min(tamano_bloque, n_ensayos - inicio)
+        forma = (n, n_rivales.max(), len(lotes))
+        precios, garantias, tecnicos = np.zeros(forma), np.zeros(forma), np.zeros(forma)
+        for k, (lote, (n_k, distribucion, bajada_max, tecnico)) in enumerate(zip(lotes, parametros)):
+            precios[:, :n_k, k], garantias[:, :n_k, k], tecnicos[:, :n_k, k] = sortear_rivales(
+                flujos[k], lote, inicio, n, n_k, distribucion, bajada_max, tecnico, muestreo)
+        rivales = pliego.puntuar(precios, garantias, tecnicos)
+        rivales[:, huecos] = -np.inf
+        filas = slice(inicio, inicio + n)
+        mejor[filas] = rivales.max(axis=1)
+        empates[filas] = np.count_nonzero(rivales == mejor[filas, None], axis=1)
+        if avance is not None:
+            avance((inicio + n) / n_ensayos)
+    return mejor, empates
+
+
+@cronometrado("montecarlo.simular_montecarlo")
+def simular_montecarlo(lote, total_emco, n_rivales, n_ensayos=100_000, distribucion="Uniforme",
+                       bajada_max=20, semilla=None, tamano_bloque=TAMANO_BLOQUE, tecnico=None, avance=None,
+                       muestreo=None, oferta_emco=None):
+    """Probabilidad de victoria, puesto esperado y percentiles de EMCO en un lote.
+
+    Con ``tecnico`` (``motor.tecnicos.ModeloTecnico``) los puntos técnicos de
+    los rivales se sortean criterio a criterio en lugar de uniformemente.
+    ``muestreo`` elige uno de ``motor.muestreo.MUESTREOS``; el error estándar
+    y la reducción de varianza frente al muestreo aleatorio se miden entre
+    bloques de flujo. Con ``oferta_emco`` (precio de EMCO) se aplica en cada
+    ensayo la regla de bajas temerarias a todas las ofertas y el resultado
+    incluye ``prob_temeraria``, la fracción de ensayos en que la de EMCO queda
+    excluida; ``campo`` es entonces el de los rivales sin excluir, pues la
+    exclusión depende del precio de EMCO. ``avance(fraccion)`` se llama tras
+    cada bloque (ver ``motor.tareas``).
+    """
+    flujos = Flujos(semilla, lote)
+    suma_credito = 0.0
+    temerarias = 0
+    precision = Precision(n_ensayos)
+    puestos = np.zeros(n_rivales + 2, dtype=np.int64)
+    mejor_rival = np.empty(n_ensayos)
+    mejor_campo = mejor_rival if oferta_emco is None else np.empty(n_ensayos)
+    empates_mejor = np.empty(n_ensayos, dtype=np.int64)
+
+    for inicio in range(0, n_ensayos, tamano_bloque):
+        n = min(tamano_bloque, n_ensayos - inicio)
+        filas = slice(inicio, inicio + n)
+        rivales, total, sin_excluir = simular_bloque(flujos, lote, inicio, n, n_rivales, distribucion,
+                                                     bajada_max, tecnico, muestreo, total_emco, oferta_emco)
+        credito, puesto = evaluar_ensayos(total, rivales)
+        temerarias += np.count_nonzero(np.isneginf(total))
+        suma_credito += credito.sum()
+        precision.anadir(inicio, credito)
+        puestos += np.bincount(puesto, minlength=n_rivales + 2)
+        mejor_rival[filas] = rivales.max(axis=1)
+        if sin_excluir is not rivales:
+            mejor_campo[filas] = sin_excluir.max(axis=1)
+        empates_mejor[filas] = np.count_nonzero(sin_excluir == mejor_campo[filas, None], axis=1)
+        if avance is not None:
+            avance((inicio + n) / n_ensayos)
+
+    frecuencia_puestos = puestos[1:] / n_ensayos
+    return {
+        "ensayos": n_ensayos,
+        "total_emco": float(total_emco),
+        "prob_victoria": float(suma_credito / n_ensayos),
+        "puesto_medio": float(np.dot(np.arange(1, n_rivales + 2), frecuencia_puestos)),
+        "distribucion_puestos": frecuencia_puestos,
+        "percentiles_mejor_rival": dict(zip(PERCENTILES, np.percentile(mejor_rival, PERCENTILES).tolist())),
+        "percentiles_margen": dict(zip(PERCENTILES,
+                                       np.percentile(total_emco - mejor_rival, PERCENTILES).tolist())),
+        "campo": CampoRivales(mejor_campo, empates_mejor),
+        **precision.resumen(),
+        **({} if oferta_emco is None else {"prob_temeraria": temerarias / n_ensayos}),
+    }
+
+
+def intervalo_wilson(p, n, confianza=0.95):
+    # Intervalo de Wilson para una proporción (conservador con créditos fraccionarios de empate)
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    semiancho = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominador
+    return centro - semiancho, centro + semiancho
+
+
+def simular_progresivo(lote, total_emco, n_rivales, distribucion="Uniforme", bajada_max=20,
+                       tolerancia=0.005, confianza=0.95, max_ensayos=1_000_000,
+                       semilla=None, tamano_bloque=10_000, resolucion=0.01, tecnico=None, muestreo=None,
+                       oferta_emco=None):
+    """Monte Carlo por bloques que publica resultados parciales tras cada bloque.
+
+    Es un generador: cada resultado incluye el intervalo de confianza de la
+    probabilidad de victoria y se detiene cuando su semiancho es menor que
+    ``tolerancia`` (o al llegar a ``max_ensayos``). Los percentiles del mejor
+    rival se actualizan con un histograma de paso ``resolucion`` puntos.
+
+    Con un ``muestreo`` de reducción de varianza, en cuanto hay
+    ``MIN_REPLICAS`` bloques de flujo el intervalo sale de su error estándar
+    medido, así que se para antes que con el muestreo aleatorio. ``oferta_emco``
+    aplica las bajas temerarias como en ``simular_montecarlo`` (con el mismo
+    ``campo`` sin excluir).
+    """
+    flujos = Flujos(semilla, lote)
+    maximo = lote.pmax_precio + lote.pmax_garantia + (lote.p_tecnico_max if tecnico is None else tecnico.maximo)
+    bordes = np.arange(0.0, maximo + 2 * resolucion, resolucion)
+    histograma = np.zeros(bordes.size - 1, dtype=np.int64)
+    puestos = np.zeros(n_rivales + 2, dtype=np.int64)
+    suma_credito = 0.0
+    temerarias = 0
+    precision = Precision(max_ensayos)
+    reducido = muestreo not in (None, "Aleatorio")
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    mejores, empates = [], []
+    ensayos = 0
+
+    while ensayos < max_ensayos:
+        n = min(tamano_bloque, max_ensayos - ensayos)
+        rivales, total, sin_excluir = simular_bloque(flujos, lote, ensayos, n, n_rivales, distribucion,
+                                                     bajada_max, tecnico, muestreo, total_emco, oferta_emco)
+        credito, puesto = evaluar_ensayos(total, rivales)
+        temerarias += np.count_nonzero(np.isneginf(total))
+        mejor = rivales.max(axis=1)
+        mejor_campo = mejor if sin_excluir is rivales else sin_excluir.max(axis=1)
+        precision.anadir(ensayos, credito)
+        ensayos += n
+        suma_credito += credito.sum()
+        puestos += np.bincount(puesto, minlength=n_rivales + 2)
+        histograma += np.histogram(mejor, bordes)[0]
+        mejores.append(mejor_campo)
+        empates.append(np.count_nonzero(sin_excluir == mejor_campo[:, None], axis=1))
+
+        prob = suma_credito / ensayos
+        medida = precision.resumen()
+        if reducido and medida["error_estandar"] is not None:
+            inferior, superior = prob - z * medida["error_estandar"], prob + z * medida["error_estandar"]
+        else:
+            inferior, superior = intervalo_wilson(prob, ensayos, confianza)
+        convergido = (superior - inferior) / 2 <= tolerancia
+        acumulado = np.cumsum(histograma) / ensayos
+        percentiles = bordes[1:][np.searchsorted(acumulado, np.array(PERCENTILES) / 100)]
+        frecuencia_puestos = puestos[1:] / ensayos
+        resultado = {
+            "ensayos": ensayos,
+            "total_emco": float(total_emco),
+            "prob_victoria": float(prob),
+            "intervalo": (float(inferior), float(superior)),
+            "semiancho": float((superior - inferior) / 2),
+            "puesto_medio": float(np.dot(np.arange(1, n_rivales + 2), frecuencia_puestos)),
+            "distribucion_puestos": frecuencia_puestos,
+            "percentiles_mejor_rival": dict(zip(PERCENTILES, percentiles.tolist())),
+            "percentiles_margen": dict(zip(PERCENTILES, (total_emco - percentiles[::-1]).tolist())),
+            "terminado": convergido or ensayos >= max_ensayos,
+            "convergido": convergido,
+            **medida,
+            **({} if oferta_emco is None else {"prob_temeraria": temerarias / ensayos}),
+        }
+        if resultado["terminado"]:
+            resultado["campo"] = CampoRivales(np.concatenate(mejores), np.concatenate(empates))
+        yield resultado
+        if convergido:
+            return
@@ -0,0 +1,101 @@
+"""Muestreos con reducción de varianza para los sorteos de los competidores.
+
+En lugar de sortear cada magnitud con su generador, cada rival obtiene en cada
+bloque de flujo (``motor.aleatorio``) una matriz de uniformes ensayos ×
+dimensiones que se transforma con las inversas de las distribuciones:
+
+- ``Halton``: sucesión de Halton aleatorizada con permutaciones de dígitos.
+  La dimensión ``k`` del rival ``j`` usa el primo ``j · dimensiones + k``, así
+  que un rival no cambia al añadir o quitar otros.
+- ``Hipercubo latino``: cada dimensión queda estratificada en el bloque.
+- ``Antitético``: ensayos por parejas ``u`` y ``1 - u``; como la puntuación de
+  un rival es monótona en cada uniforme, la pareja está correlada negativamente.
+
+Las permutaciones salen del flujo del rival y del bloque, de modo que cada
+bloque es una réplica independiente: la varianza real del estimador se mide
+con la dispersión entre bloques (``varianza_bloques``).
+"""
+
+import functools
+
+import numpy as np
+
+from motor.aleatorio import BLOQUE_FLUJO
+
+MUESTREOS = ["Aleatorio", "Halton", "Hipercubo latino", "Antitético"]
+# Muestreos que estratifican el bloque entero: se sortea completo aunque se pidan menos ensayos
+BLOQUE_COMPLETO = {"Hipercubo latino"}
+# Las inversas de las distribuciones no admiten 0 ni 1 exactos
+EPSILON = 2.0 ** -53
+
+
+def primos(n):
+    """Los ``n`` primeros números primos."""
+    limite = max(16, int(n * (np.log(n + 1) + np.log(np.log(n + 2))) + 10))
+    criba = np.ones(limite + 1, dtype=bool)
+    criba[:2] = False
+    for i in range(2, int(limite ** 0.5) + 1):
+        if criba[i]:
+            criba[i * i::i] = False
+    return np.flatnonzero(criba)[:n]
+
+
+@functools.lru_cache(maxsize=512)
+def _digitos(n, base):
+    # Dígitos en base ``base`` de 0..n-1, por posición; tantas posiciones como pida un
+    # bloque de flujo completo (y una más), para que el consumo del flujo no dependa de n
+    digitos = int(np.ceil(np.log(max(n, BLOQUE_FLUJO)) / np.log(base))) + 1
+    indices = np.arange(n)
+    return np.stack([(indices // base ** k) % base for k in range(digitos)]).astype(np.int16)
+
+
+def _halton(rng, n, base):
+    # Inversa radical de 0..n-1 con una permutación aleatoria por posición de dígito;
+    # falta sumarle el desplazamiento uniforme dentro de la última celda (``escala``)
+    tabla = _digitos(n, base)
+    escalas = float(base) ** -np.arange(1, tabla.shape[0] + 1)
+    valores = np.zeros(n)
+    for digito, escala in zip(tabla, escalas):
+        valores += (rng.permutation(base) * escala)[digito]
+    return valores, escalas[-1]
+
+
+def uniformes(rng, n, dimensiones, muestreo="Aleatorio", rival=0):
+    """Matriz ``n`` × ``dimensiones`` de uniformes en (0, 1) de un rival en un bloque.
+
+    Salvo con los muestreos de ``BLOQUE_COMPLETO``, las ``n`` primeras filas
+    son las mismas para cualquier ``n`` (hasta un bloque de flujo).
+    """
+    if muestreo == "Halton":
+        bases = primos((rival + 1) * dimensiones)[rival * dimensiones:]
+        valores, escalas = zip(*[_halton(rng, n, int(base)) for base in bases])
+        # Desplazamiento que la hace exactamente uniforme, sorteado después de las permutaciones
+        u = np.column_stack(valores) + rng.random((n, dimensiones)) * np.array(escalas)
+    elif muestreo == "Hipercubo latino":
+        estratos = np.stack([rng.permutation(n) for _ in range(dimensiones)], axis=1)
+        u = (estratos + rng.random((n, dimensiones))) / n
+    elif muestreo == "Antitético":
+        mitad = rng.random((-(-n // 2), dimensiones))
+        u = np.empty((n, dimensiones))
+        u[0::2] = mitad[:len(u[0::2])]
+        u[1::2] = 1 - mitad[:len(u[1::2])]
+    else:
+        u = rng.random((n, dimensiones))
+    return np.clip(u, EPSILON, 1 - EPSILON)
+
+
+def varianza_bloques(sumas, ensayos):
+    """Varianza de la media global a partir de las sumas y ensayos de cada bloque.
+
+    Estimador de conglomerados (los bloques son réplicas independientes);
+    ``nan`` con menos de dos bloques.
+    """
+    sumas, ensayos = np.asarray(sumas, dtype=float), np.asarray(ensayos, dtype=float)
+    validos = ensayos > 0
+    sumas, ensayos = sumas[validos], ensayos[validos]
+    bloques = ensayos.size
+    if bloques < 2:
+        return float("nan")
+    total = ensayos.sum()
+    media = sumas.sum() / total
+    return float(bloques / (bloques - 1) * np.sum((sumas - ensayos * media) ** 2) / total ** 2)
@@ -0,0 +1,69 @@
+"""Optimización del precio ofertado por EMCO dentro de la ventana [U2, U1].
+
+El campo de rivales se simula una sola vez (``CampoRivales``) y todas las
+ofertas candidatas se puntúan contra esos mismos sorteos, así que cada
+evaluación es una búsqueda binaria y no una nueva simulación.
+"""
+
+import numpy as np
+
+from motor.perfil import cronometrado
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio
+
+OBJETIVOS = {
+    "victoria": "Maximizar la probabilidad de ganar",
+    "margen": "Maximizar el margen esperado sobre el coste",
+}
+
+
+def evaluar_precios(lote, campo, precios, garantia, puntos_tecnicos, objetivo="victoria", coste=0.0):
+    # Probabilidad de victoria y valor del objetivo para cada precio candidato
+    totales = (calcular_puntuacion_precio(precios, lote.u1_precio, lote.u2_precio, lote.pmax_precio)
+               + calcular_puntuacion_garantia(garantia, lote.u1_garantia, lote.u2_garantia,
+                                              lote.pmax_garantia)
+               + puntos_tecnicos)
+    prob = campo.prob_victoria(totales)
+    valor = prob if objetivo == "victoria" else (precios - coste) * prob
+    return prob, valor
+
+
+@cronometrado("optimizacion.optimizar_precio")
+def optimizar_precio(lote, campo, garantia, puntos_tecnicos, objetivo="victoria", coste=0.0,
+                     puntos_por_ronda=41, tolerancia=1.0):
+    """Rejilla que se estrecha alrededor del mejor precio hasta un paso de ``tolerancia`` euros.
+
+    Entre precios con el mismo valor del objetivo se prefiere el más alto.
+    """
+    bajo = max(lote.u2_precio, coste) if objetivo == "margen" else lote.u2_precio
+    alto = lote.u1_precio
+    if bajo >= alto:
+        raise ValueError("El coste mínimo no deja margen por debajo del presupuesto base (U1).")
+
+    precios_evaluados, probs, valores = [], [], []
+    while True:
+        precios = np.linspace(bajo, alto, puntos_por_ronda)
+        prob, valor = evaluar_precios(lote, campo, precios, garantia, puntos_tecnicos, objetivo, coste)
+        precios_evaluados.append(precios)
+        probs.append(prob)
+        valores.append(valor)
+
+        i = len(valor) - 1 - np.argmax(valor[::-1])
+        paso = (alto - bajo) / (puntos_por_ronda - 1)
+        if paso <= tolerancia:
+            break
+        bajo, alto = max(bajo, precios[i] - paso), min(alto, precios[i] + paso)
+
+    precios = np.concatenate(precios_evaluados)
+    probs = np.concatenate(probs)
+    valores = np.concatenate(valores)
+    orden = np.argsort(precios, kind="stable")
+    mejor = len(valores) - 1 - np.argmax(valores[orden][::-1])
+    precio_optimo = precios[orden][mejor]
+    return {
+        "precio": float(precio_optimo),
+        "prob_victoria": float(probs[orden][mejor]),
+        "margen_esperado": float((precio_optimo - coste) * probs[orden][mejor]),
+        "curva_precios": precios[orden],
+        "curva_prob_victoria": probs[orden],
+        "curva_objetivo": valores[orden],
+    }
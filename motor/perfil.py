@@ -0,0 +1,191 @@
+"""Instrumentación ligera: tiempos, llamadas, fallos de caché y tamaños de array.
+
+Se activa con la variable de entorno ``SIMULADOR_PERFIL=1`` (o por ejecución
+con ``iniciar_ejecucion(True)``). Desactivada, ``medir`` devuelve un contexto
+vacío compartido y los decoradores solo comprueban un indicador, así que puede
+dejarse en producción.
+
+El indicador y los registros se guardan por hilo o, con ``usar_estado``, en
+el estado que indique la aplicación (Streamlit lanza un hilo nuevo en cada
+re-ejecución, también en las de un fragmento, así que la interfaz los guarda en
+la sesión). ``finalizar_ejecucion`` los vacía y, si ``SIMULADOR_PERFIL_SALIDA``
+apunta a un fichero, los añade como JSON lines o, si termina en ``.prom``,
+reescribe los totales en formato textfile de Prometheus.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+
+ACTIVO = os.environ.get("SIMULADOR_PERFIL", "") not in ("", "0")
+SALIDA = os.environ.get("SIMULADOR_PERFIL_SALIDA")
+
+_NULO = nullcontext()
+_hilo = threading.local()
+# Función que devuelve el estado de la ejecución en curso (un dict) o None para usar el del hilo
+_proveedor = None
+_cerrojo = threading.Lock()
+# Totales acumulados del proceso: nombre -> [llamadas, segundos, fallos de caché]
+_totales = defaultdict(lambda: [0, 0.0, 0])
+# Secciones con caché (decoradas con ``fallo_cache``): el resumen calcula sus aciertos
+_cacheadas = set()
+
+
+def usar_estado(proveedor):
+    """Guarda el indicador y los registros en el dict que devuelva ``proveedor()``
+    (p. ej. uno en la sesión de Streamlit); si devuelve ``None``, en el hilo."""
+    global _proveedor
+    _proveedor = proveedor
+
+
+def _estado():
+    estado = _proveedor() if _proveedor is not None else None
+    return _hilo.__dict__ if estado is None else estado
+
+
+def activo():
+    return _estado().get("activo", ACTIVO)
+
+
+def _registros():
+    return _estado().setdefault("registros", [])
+
+
+class _Medida:
+    __slots__ = ("nombre", "elementos", "inicio")
+
+    def __init__(self, nombre, elementos):
+        self.nombre = nombre
+        self.elementos = elementos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        segundos = time.perf_counter() - self.inicio
+        _registros().append({"nombre": self.nombre, "segundos": segundos, "elementos": self.elementos})
+        with _cerrojo:
+            total = _totales[self.nombre]
+            total[0] += 1
+            total[1] += segundos
+        return False
+
+
+def medir(nombre, elementos=None):
+    """Contexto que cronometra un tramo; ``elementos`` anota el tamaño procesado."""
+    return _Medida(nombre, elementos) if activo() else _NULO
+
+
+def cronometrado(nombre):
+    """Decorador equivalente a envolver cada llamada con ``medir(nombre)``."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not activo():
+                return funcion(*args, **kwargs)
+            with _Medida(nombre, None):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def fallo_cache(nombre):
+    """Decorador para el cuerpo de una función cacheada: solo se ejecuta en los fallos."""
+    _cacheadas.add(nombre)
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if activo():
+                _registros().append({"nombre": nombre, "fallo_cache": True})
+                with _cerrojo:
+                    _totales[nombre][2] += 1
+            return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def iniciar_ejecucion(activar=None):
+    """Marca el comienzo de una ejecución del script; ``activar`` anula la variable de entorno."""
+    estado = _estado()
+    estado["activo"] = ACTIVO if activar is None else activar
+    estado["inicio"] = time.time()
+
+
+def tomar_registros():
+    """Vacía y devuelve los registros en curso (p. ej. al terminar una tarea en segundo plano)."""
+    estado = _estado()
+    registros, estado["registros"] = estado.get("registros", []), []
+    return registros
+
+
+def incorporar_registros(registros):
+    # Registros de otro hilo que se suman a la ejecución en curso
+    _registros().extend(registros)
+
+
+def resumen(registros):
+    """Agrega los registros por nombre: llamadas, tiempo, aciertos/fallos de caché y elementos.
+
+    Los aciertos de caché son las llamadas medidas que no ejecutaron el cuerpo cacheado.
+    """
+    filas = {}
+    for r in registros:
+        fila = filas.setdefault(r["nombre"], {"nombre": r["nombre"], "llamadas": 0, "segundos": 0.0,
+                                              "fallos_cache": 0, "elementos": 0})
+        if r.get("fallo_cache"):
+            fila["fallos_cache"] += 1
+            continue
+        fila["llamadas"] += 1
+        fila["segundos"] += r["segundos"]
+        fila["elementos"] += r["elementos"] or 0
+    for fila in filas.values():
+        fila["aciertos_cache"] = (max(fila["llamadas"] - fila["fallos_cache"], 0)
+                                  if fila["nombre"] in _cacheadas else None)
+    return sorted(filas.values(), key=lambda f: -f["segundos"])
+
+
+def finalizar_ejecucion(salida=SALIDA):
+    """Vacía los registros en curso, los exporta si hay ``salida`` y devuelve su resumen."""
+    registros = tomar_registros()
+    if not registros:
+        return []
+    if salida:
+        ruta = Path(salida)
+        if ruta.suffix == ".prom":
+            exportar_prometheus(ruta)
+        else:
+            exportar_jsonl(ruta, registros)
+    return resumen(registros)
+
+
+def exportar_jsonl(ruta, registros):
+    linea = {"inicio": _estado().get("inicio", time.time()), "secciones": resumen(registros)}
+    with _cerrojo, open(ruta, "a", encoding="utf-8") as f:
+        f.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+
+def exportar_prometheus(ruta):
+    # Formato textfile del node_exporter; se escribe aparte y se renombra (atómico)
+    with _cerrojo:
+        totales = {nombre: list(valores) for nombre, valores in _totales.items()}
+    lineas = [
+        "# HELP simulador_llamadas_total Llamadas por sección.",
+        "# TYPE simulador_llamadas_total counter",
+        *(f'simulador_llamadas_total{{seccion="{n}"}} {v[0]}' for n, v in totales.items()),
+        "# HELP simulador_segundos_total Tiempo acumulado por sección.",
+        "# TYPE simulador_segundos_total counter",
+        *(f'simulador_segundos_total{{seccion="{n}"}} {v[1]:.6f}' for n, v in totales.items()),
+        "# HELP simulador_fallos_cache_total Fallos de caché por función cacheada.",
+        "# TYPE simulador_fallos_cache_total counter",
+        *(f'simulador_fallos_cache_total{{seccion="{n}"}} {v[2]}' for n, v in totales.items()),
+    ]
+    temporal = Path(str(ruta) + ".tmp")
+    temporal.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+    os.replace(temporal, ruta)
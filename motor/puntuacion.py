@@ -0,0 +1,36 @@
+"""Fórmulas de puntuación del pliego, vectorizadas sobre arrays de NumPy.
+
+Todas las funciones aceptan escalares o arrays de cualquier forma (por ejemplo
+ensayos × empresas × lotes) y aplican los umbrales U1/U2/pmax en una sola
+pasada con broadcasting. Con entradas escalares devuelven un ``float``.
+"""
+
+import numpy as np
+
+
+def _salida(valor):
+    return float(valor) if np.ndim(valor) == 0 else valor
+
+
+def calcular_puntuacion_precio(oferta, u1, u2, pmax):
+    # 0 puntos a partir de U1, pmax por debajo de U2 y lineal entre ambos
+    oferta = np.asarray(oferta, dtype=float)
+    fraccion = np.clip((u1 - oferta) / np.subtract(u1, u2, dtype=float), 0.0, 1.0)
+    return _salida(pmax * fraccion)
+
+
+def calcular_puntuacion_garantia(garantia, u1, u2, pmax):
+    # 0 puntos hasta U1, pmax a partir de U2 y lineal entre ambos
+    garantia = np.asarray(garantia, dtype=float)
+    fraccion = np.clip((garantia - u1) / np.subtract(u2, u1, dtype=float), 0.0, 1.0)
+    return _salida(pmax * fraccion)
+
+
+def calcular_puntuacion_total(oferta, garantia, puntos_tecnicos,
+                              u1_precio, u2_precio, pmax_precio,
+                              u1_garantia, u2_garantia, pmax_garantia):
+    # Económico + garantía + técnicos, con broadcasting entre las tres entradas
+    total = (calcular_puntuacion_precio(oferta, u1_precio, u2_precio, pmax_precio)
+             + calcular_puntuacion_garantia(garantia, u1_garantia, u2_garantia, pmax_garantia)
+             + np.asarray(puntos_tecnicos, dtype=float))
+    return _salida(total)
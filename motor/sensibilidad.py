@@ -0,0 +1,56 @@
+"""Superficie de sensibilidad de EMCO sobre una rejilla precio × años de garantía.
+
+Toda la rejilla se calcula con una sola difusión (broadcast) de NumPy: los
+puntos económicos van por filas, los de garantía por columnas, y el puesto y
+la probabilidad de ganar se obtienen con búsquedas binarias sobre el campo
+de rivales ya simulado.
+"""
+
+import numpy as np
+
+from motor.perfil import cronometrado
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio
+
+GARANTIA_MAX = 6
+
+
+def rejilla_sensibilidad(lote, n_precios=500, n_garantias=49, bajada_max=20, garantia_max=GARANTIA_MAX):
+    """Precios desde el mínimo esperado (o U2 si es menor) hasta U1 y garantías de 0 a ``garantia_max``."""
+    precio_min = min(lote.u2_precio, lote.precio_minimo(bajada_max))
+    return (np.linspace(precio_min, lote.u1_precio, n_precios),
+            np.linspace(0.0, garantia_max, n_garantias))
+
+
+@cronometrado("sensibilidad.superficie_sensibilidad")
+def superficie_sensibilidad(lote, campo, precios, garantias, puntos_tecnicos, rivales, resolucion=None):
+    """Total, puesto y probabilidad de ganar para cada par (precio, garantía).
+
+    ``rivales`` son los totales de los competidores del escenario mostrado (para
+    el puesto) y ``campo`` cualquier objeto con ``prob_victoria`` (Monte Carlo o
+    analítico). Con ``resolucion`` la probabilidad se evalúa sobre una rejilla
+    de totales con ese paso y se interpola, útil cuando el campo es caro.
+    """
+    totales = (calcular_puntuacion_precio(np.asarray(precios, dtype=float), lote.u1_precio,
+                                          lote.u2_precio, lote.pmax_precio)[:, None]
+               + calcular_puntuacion_garantia(np.asarray(garantias, dtype=float), lote.u1_garantia,
+                                              lote.u2_garantia, lote.pmax_garantia)[None, :]
+               + puntos_tecnicos)
+
+    # Puesto = 1 + rivales con total estrictamente mayor
+    ordenados = np.sort(np.asarray(rivales, dtype=float))
+    puesto = 1 + ordenados.size - np.searchsorted(ordenados, totales, side="right")
+
+    if resolucion is None:
+        prob = campo.prob_victoria(totales)
+    else:
+        bajo, alto = totales.min(), totales.max()
+        nodos = np.linspace(bajo, alto, max(2, int(np.ceil((alto - bajo) / resolucion)) + 1))
+        prob = np.interp(totales, nodos, campo.prob_victoria(nodos))
+
+    return {
+        "precios": np.asarray(precios, dtype=float),
+        "garantias": np.asarray(garantias, dtype=float),
+        "total": totales,
+        "puesto": puesto,
+        "prob_victoria": prob,
+    }
@@ -0,0 +1,65 @@
+"""Escenario único de competidores y ranking de un lote (sin Streamlit)."""
+
+import numpy as np
+
+from motor.aleatorio import SEMILLA, Flujos
+from motor.montecarlo import sortear_rival
+from motor.perfil import cronometrado
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio
+from motor.tecnicos import percentil_precio
+from motor.temeraria import mascara_temeraria
+
+
+def simular_competidores(lote, n, distribucion="Uniforme", bajada_max=20, flujos=None, empresas=None,
+                         tecnico=None):
+    """(precios, garantías, técnicos) de un escenario: una empresa por flujo (``empresas`` o 0..n-1)."""
+    flujos = Flujos(lote=lote) if flujos is None else flujos
+    empresas = range(n) if empresas is None else empresas
+    distribuciones = [distribucion.fila(j) if hasattr(distribucion, "fila") else distribucion
+                      for j in range(len(empresas))]
+    sorteos = [sortear_rival(flujos.generador(empresa), lote, 1, dist_j, bajada_max, tecnico)
+               for empresa, dist_j in zip(empresas, distribuciones)]
+    if not sorteos:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+    precios, garantias, tecnicos = zip(*sorteos)
+    precios, garantias = np.concatenate(precios), np.concatenate(garantias)
+    if tecnico is None:
+        return precios, garantias, np.concatenate(tecnicos)
+    # Tensor empresas × criterios reducido de una vez
+    calidad, ruido = (np.concatenate(latente) for latente in zip(*tecnicos))
+    percentil = (np.array([percentil_precio(p, lote, d, bajada_max) for p, d in zip(precios, distribuciones)])
+                 if tecnico.correlacion else None)
+    return precios, garantias, tecnico.puntos(calidad, ruido, percentil)
+
+
+@cronometrado("simulacion.simular_escenario")
+def simular_escenario(lote, n_rivales, oferta, garantia, puntos_tecnicos,
+                      distribucion="Uniforme", bajada_max=20, semilla=SEMILLA, empresas=None, tecnico=None,
+                      temeraria=False):
+    """Un escenario de competidores con la oferta de EMCO en la última posición.
+
+    Cada empresa (por nombre si se dan ``empresas``) tiene sus propios flujos
+    aleatorios, así que cambiar el número de empresas no altera a las demás.
+    Con ``temeraria`` las bajas temerarias (``motor.temeraria``) quedan
+    excluidas con un total de 0; ``temerarias`` marca cuáles son.
+    """
+    # Generamos los competidores y añadimos tu oferta
+    precios, garantias, tecnicos = simular_competidores(lote, n_rivales, distribucion, bajada_max,
+                                                        Flujos(semilla, lote), empresas, tecnico)
+    precios = np.append(precios, oferta)
+    garantias = np.append(garantias, garantia)
+    tecnicos = np.append(tecnicos, puntos_tecnicos)
+    p_precios = calcular_puntuacion_precio(precios, lote.u1_precio, lote.u2_precio, lote.pmax_precio)
+    p_garantias = calcular_puntuacion_garantia(garantias, lote.u1_garantia, lote.u2_garantia,
+                                               lote.pmax_garantia)
+    temerarias = (mascara_temeraria(precios, lote.presupuesto_base) if temeraria
+                  else np.zeros(precios.size, dtype=bool))
+    return {
+        "precios": precios,
+        "garantias": garantias,
+        "tecnicos": tecnicos,
+        "p_precios": p_precios,
+        "p_garantias": p_garantias,
+        "temerarias": temerarias,
+        "totales": np.where(temerarias, 0.0, p_precios + p_garantias + tecnicos),
+    }
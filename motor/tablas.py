@@ -0,0 +1,207 @@
+"""Tablas precalculadas de victoria, compartidas entre sesiones en memoria mapeada.
+
+Con rivales idénticos e independientes, la probabilidad de victoria y el
+puesto de EMCO dependen solo de su total y de la distribución de un rival,
+F(s) = P(T < s) y q(s) = P(T = s) (ver ``motor.analitico``). Las tablas
+guardan (F, q) sobre una rejilla fina de totales para cada lote ×
+distribución × bajada máxima. La oferta, la garantía y los puntos técnicos de
+EMCO quedan resumidos en su total y el número de competidores se aplica al
+consultar con la fórmula cerrada, así que cada consulta es O(1) por total:
+índice directo en la rejilla e interpolación lineal.
+
+La interpolación no es exacta: F tiene quiebros donde empiezan o acaban los
+puntos económicos, la garantía y cada punto técnico, y en los átomos (empates)
+salta. Si todos esos puntos caen en nodos de la rejilla, la probabilidad de
+victoria difiere de la del motor analítico en menos de ``TOLERANCIA_TABLAS``
+por rival. Si no (p. ej. bajadas impares por debajo del 20 % con el paso por
+defecto en los lotes actuales), ``campo`` devuelve ``None`` y se usa el motor
+analítico.
+
+El ``.npy`` se abre con ``mmap_mode="r"``: todas las sesiones (y procesos) de
+Streamlit comparten las mismas páginas de solo lectura del sistema operativo.
+Los ejes de la tabla van en un ``.json`` al lado.
+
+Uso::
+
+    python -m motor.tablas --bajadas 1:50:1 --procesos 4
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from motor.analitico import credito_victoria, distribucion_puestos, distribucion_rival
+from motor.barrido import _rango
+from motor.empirico import DIRECTORIO_CACHE
+from motor.lotes import LOTES, ParametrosLote
+from motor.puntuacion import calcular_puntuacion_precio
+
+RUTA_TABLAS = Path(os.environ.get("SIMULADOR_TABLAS", DIRECTORIO_CACHE / "tablas_victoria.npy"))
+DISTRIBUCIONES_TABLA = ["Uniforme", "Normal", "Triangular"]
+PASO_TOTAL = 0.02
+# Distancia a un nodo por debajo de la cual el total se considera el propio nodo (con empates)
+TOLERANCIA_NODO = 1e-6
+# Diferencia máxima por rival en la probabilidad de victoria frente a ``motor.analitico``: con
+# n rivales, la consulta difiere en menos de n × TOLERANCIA_TABLAS (ver tests/test_tablas.py)
+TOLERANCIA_TABLAS = 1e-6
+
+
+def en_rejilla(lote, bajada_max, inicio=0.0, paso=PASO_TOTAL):
+    """Si los quiebros y átomos de la distribución del total de un rival caen en nodos.
+
+    Son sumas de los extremos de los puntos económicos (precio mínimo y máximo,
+    y pmax), de 0 o pmax de garantía y de puntos técnicos enteros.
+    """
+    economicos = [calcular_puntuacion_precio(p, lote.u1_precio, lote.u2_precio, lote.pmax_precio)
+                  for p in (lote.precio_minimo(bajada_max), lote.presupuesto_base)]
+    posiciones = np.array(economicos + [lote.pmax_precio]) - inicio
+    pasos = np.concatenate((posiciones, [lote.pmax_garantia, 1.0])) / paso
+    return bool(np.all(np.abs(pasos - np.rint(pasos)) < TOLERANCIA_NODO))
+
+
+def _calcular(ruta, i_lote, i_dist, lote, distribucion, bajadas, totales):
+    # Cada trabajo rellena su (lote, distribución) en el .npy mapeado, sin devolver arrays
+    tablas = np.load(ruta, mmap_mode="r+")
+    for i_bajada, bajada in enumerate(bajadas):
+        F, q = distribucion_rival(lote, totales, distribucion, bajada)
+        tablas[i_lote, i_dist, i_bajada, 0] = F[:, 0]
+        tablas[i_lote, i_dist, i_bajada, 1] = q[:, 0]
+    tablas.flush()
+
+
+def construir_tablas(ruta=RUTA_TABLAS, lotes=LOTES, distribuciones=DISTRIBUCIONES_TABLA,
+                     bajadas=range(1, 51), paso=PASO_TOTAL, procesos=None):
+    """Calcula las tablas (lotes × distribuciones × bajadas × (F, q) × totales) en ``ruta``.
+
+    El array y sus ejes se escriben en ficheros temporales y se renombran, así
+    que las sesiones que ya tienen abiertas las anteriores siguen leyéndolas
+    sin errores y nunca se ve un ``.json`` a medio escribir.
+    """
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    bajadas = [float(b) for b in bajadas]
+    maximo = max(l.pmax_precio + l.pmax_garantia + l.p_tecnico_max for l in lotes.values())
+    totales = np.round(np.arange(0.0, maximo + 1.5 * paso, paso), 6)
+    forma = (len(lotes), len(distribuciones), len(bajadas), 2, totales.size)
+
+    temporal = ruta.with_name(ruta.stem + ".tmp.npy")
+    np.lib.format.open_memmap(temporal, mode="w+", dtype=np.float64, shape=forma).flush()
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as pool:
+        futuros = [pool.submit(_calcular, str(temporal), i_lote, i_dist, lote, distribucion, bajadas, totales)
+                   for i_lote, lote in enumerate(lotes.values())
+                   for i_dist, distribucion in enumerate(distribuciones)]
+        for futuro in futuros:
+            futuro.result()
+
+    ejes = {
+        "lotes": {nombre: dataclasses.asdict(lote) for nombre, lote in lotes.items()},
+        "distribuciones": list(distribuciones),
+        "bajadas": bajadas,
+        "inicio": 0.0,
+        "paso": paso,
+        "puntos": int(totales.size),
+    }
+    # Los ejes también van a un temporal y se renombran después del array
+    temporal_ejes = ruta.with_name(ruta.stem + ".tmp.json")
+    temporal_ejes.write_text(json.dumps(ejes, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(temporal, ruta)
+    os.replace(temporal_ejes, ruta.with_suffix(".json"))
+    return ruta
+
+
+class TablasVictoria:
+    """Tablas abiertas en solo lectura; ``campo`` da ``None`` si no cubren el caso pedido."""
+
+    def __init__(self, ruta=RUTA_TABLAS):
+        ruta = Path(ruta)
+        self.ejes = json.loads(ruta.with_suffix(".json").read_text(encoding="utf-8"))
+        self.datos = np.load(ruta, mmap_mode="r")
+        self.lotes = {ParametrosLote(**p): i for i, p in enumerate(self.ejes["lotes"].values())}
+        self.distribuciones = {d: i for i, d in enumerate(self.ejes["distribuciones"])}
+        self.bajadas = {b: i for i, b in enumerate(self.ejes["bajadas"])}
+
+    def campo(self, lote, n_rivales, distribucion="Uniforme", bajada_max=20):
+        # Los modelos empíricos dependen del histórico de cada usuario: no se tabulan
+        if not isinstance(distribucion, str):
+            return None
+        try:
+            indice = (self.lotes[lote], self.distribuciones[distribucion], self.bajadas[float(bajada_max)])
+        except KeyError:
+            return None
+        # Con quiebros entre nodos la interpolación se alejaría del motor analítico
+        if not en_rejilla(lote, bajada_max, self.ejes["inicio"], self.ejes["paso"]):
+            return None
+        return CampoTabla(self.datos[indice], self.ejes["inicio"], self.ejes["paso"], n_rivales,
+                          repr((lote, distribucion, float(bajada_max), self.ejes["paso"])))
+
+
+class CampoTabla:
+    """Equivalente tabulado de ``CampoAnalitico`` para ``n_rivales`` rivales idénticos
+    (a menos de ``TOLERANCIA_TABLAS``, ver ``en_rejilla``)."""
+
+    def __init__(self, tabla, inicio, paso, n_rivales, clave):
+        self.tabla = tabla
+        self.inicio = inicio
+        self.paso = paso
+        self.n_rivales = n_rivales
+        self.clave = clave
+
+    @property
+    def huella(self):
+        return repr((self.clave, self.n_rivales))
+
+    def distribucion_rival(self, totales):
+        """(F, q) con la forma ``totales.shape + (1,)``, como ``motor.analitico.distribucion_rival``."""
+        F, q = self.tabla
+        posicion = np.clip((np.asarray(totales, dtype=float) - self.inicio) / self.paso, 0, F.size - 1)
+        nodo = np.rint(posicion).astype(np.int64)
+        en_nodo = np.abs(posicion - nodo) < TOLERANCIA_NODO
+        i = np.minimum(posicion.astype(np.int64), F.size - 2)
+        fraccion = posicion - i
+        # Entre nodos: del límite por la derecha del nodo izquierdo (F + q) al valor del derecho
+        entre = (F[i] + q[i]) * (1 - fraccion) + F[i + 1] * fraccion
+        F = np.where(en_nodo, F[nodo], entre)
+        q = np.where(en_nodo, q[nodo], 0.0)
+        return F[..., None], q[..., None]
+
+    def prob_victoria(self, totales_emco):
+        return credito_victoria(*self.distribucion_rival(totales_emco), self.n_rivales)
+
+    def resultado(self, total_emco):
+        """Mismo resumen que ``resultado_analitico``."""
+        F, q = self.distribucion_rival(total_emco)
+        puestos = distribucion_puestos(F, q, self.n_rivales)
+        return {
+            "total_emco": float(total_emco),
+            "prob_victoria": float(credito_victoria(F, q, self.n_rivales)),
+            "puesto_medio": float(np.dot(np.arange(1, self.n_rivales + 2), puestos)),
+            "distribucion_puestos": puestos,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m motor.tablas",
+                                     description="Precalcula las tablas de victoria compartidas.")
+    parser.add_argument("--lotes", nargs="+", default=list(LOTES), choices=list(LOTES))
+    parser.add_argument("--distribuciones", nargs="+", default=DISTRIBUCIONES_TABLA,
+                        choices=DISTRIBUCIONES_TABLA)
+    parser.add_argument("--bajadas", default="1:50:1", help="Bajada máxima (%%), inicio:fin:paso")
+    parser.add_argument("--paso", type=float, default=PASO_TOTAL, help="Paso de la rejilla de totales")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("-o", "--salida", default=str(RUTA_TABLAS), help="Fichero .npy de las tablas")
+    args = parser.parse_args(argv)
+
+    lotes = {n: LOTES[n] for n in args.lotes}
+    ruta = construir_tablas(args.salida, lotes, args.distribuciones, _rango(args.bajadas), args.paso,
+                            args.procesos)
+    print(f"Tablas -> {ruta} ({ruta.stat().st_size / 2 ** 20:.1f} MiB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Cálculos pesados en segundo plano, con progreso y cancelación cooperativa.
+
+Un ``EjecutorTareas`` reparte los cálculos entre hilos (NumPy libera el GIL en
+lo pesado) y guarda los resultados terminados en una LRU por clave de
+entradas, compartida por todos los usuarios. Las funciones del motor aceptan
+un ``avance(fraccion)`` que llaman entre bloques: el de una tarea actualiza su
+progreso y lanza ``Cancelada`` en cuanto se cancela, así que un cálculo cuyas
+entradas han cambiado deja de gastar CPU en el siguiente bloque.
+
+Dos sesiones que piden la misma clave comparten la tarea; solo se cancela de
+verdad cuando ya no le interesa a ninguna.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from motor import perfil
+
+
+class Cancelada(Exception):
+    """La tarea se canceló porque sus entradas cambiaron."""
+
+
+class Tarea:
+    def __init__(self, clave, perfilar=False):
+        self.clave = clave
+        self.perfilar = perfilar
+        self.progreso = 0.0
+        self.interesados = 1
+        self.registros = []
+        self.futuro = None
+        self._evento = threading.Event()
+
+    def avance(self, fraccion):
+        if self._evento.is_set():
+            raise Cancelada(self.clave)
+        self.progreso = min(max(float(fraccion), 0.0), 1.0)
+
+    @property
+    def cancelada(self):
+        return self._evento.is_set()
+
+    @property
+    def terminada(self):
+        return self.futuro.done()
+
+    def error(self):
+        # Excepción del cálculo (no la cancelación), o None
+        if not self.futuro.done() or self.futuro.cancelled():
+            return None
+        error = self.futuro.exception()
+        return None if isinstance(error, Cancelada) else error
+
+
+class EjecutorTareas:
+    """Hilos de cálculo y resultados recientes compartidos (``max_resultados`` por LRU)."""
+
+    def __init__(self, hilos=None, max_resultados=64):
+        self.pool = ThreadPoolExecutor(max_workers=hilos or os.cpu_count() or 1, thread_name_prefix="tarea")
+        self.max_resultados = max_resultados
+        self._resultados = OrderedDict()
+        self._en_curso = {}
+        self._cerrojo = threading.Lock()
+
+    def resultado(self, clave, defecto=None):
+        with self._cerrojo:
+            if clave not in self._resultados:
+                return defecto
+            self._resultados.move_to_end(clave)
+            return self._resultados[clave]
+
+    def lanzar(self, clave, calcular):
+        """Tarea que calcula ``calcular(avance)``; si ya hay una con la misma clave, se comparte."""
+        with self._cerrojo:
+            tarea = self._en_curso.get(clave)
+            if tarea is not None and not tarea.cancelada:
+                tarea.interesados += 1
+                return tarea
+            tarea = self._en_curso[clave] = Tarea(clave, perfil.activo())
+            tarea.futuro = self.pool.submit(self._ejecutar, tarea, calcular)
+            return tarea
+
+    def _ejecutar(self, tarea, calcular):
+        # Los registros de perfil del hilo viajan con la tarea hasta la sesión que la recoge
+        perfil.iniciar_ejecucion(tarea.perfilar)
+        try:
+            resultado = calcular(tarea.avance)
+        finally:
+            tarea.registros = perfil.tomar_registros()
+            with self._cerrojo:
+                if self._en_curso.get(tarea.clave) is tarea:
+                    del self._en_curso[tarea.clave]
+        with self._cerrojo:
+            self._resultados[tarea.clave] = resultado
+            while len(self._resultados) > self.max_resultados:
+                self._resultados.popitem(last=False)
+        return resultado
+
+    def cancelar(self, tarea):
+        """Retira el interés de una sesión; la última en retirarlo detiene el cálculo."""
+        with self._cerrojo:
+            tarea.interesados -= 1
+            if tarea.interesados > 0:
+                return
+            tarea._evento.set()
+            if self._en_curso.get(tarea.clave) is tarea:
+                del self._en_curso[tarea.clave]
+        tarea.futuro.cancel()
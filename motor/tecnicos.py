@@ -0,0 +1,87 @@
+"""Puntos técnicos de los competidores criterio a criterio.
+
+Cada rival tiene una calidad latente normal estándar y cada criterio le añade
+un ruido propio; la fracción del máximo del criterio se recorta a [0, 1] y se
+redondea a puntos enteros, como los deslizadores de la interfaz. Con
+``correlacion`` la calidad se acopla al percentil del precio del rival
+mediante una cópula gaussiana (más caro, mejor técnica si es positiva).
+
+Los sorteos de un bloque forman un tensor rivales × ensayos × criterios que se
+reduce de una vez a los puntos técnicos de cada rival.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from motor.distribuciones import _cdf_normal, _ppf_normal, cdf_precios
+
+NODOS_CALIDAD = 64
+# Percentiles extremos del precio (p. ej. átomos de la Normal recortada) para la cópula
+LIMITE_PERCENTIL = 1e-6
+
+
+@dataclass(frozen=True)
+class ModeloTecnico:
+    """Puntos máximos de cada criterio y reparto de la fracción obtenida por los rivales.
+
+    ``media`` es la fracción media del máximo, ``dispersion`` la desviación de
+    la calidad entre empresas y ``ruido`` (> 0) la variación de cada criterio
+    alrededor de la calidad de la empresa.
+    """
+
+    maximos: tuple
+    media: float = 0.7
+    dispersion: float = 0.12
+    ruido: float = 0.15
+    correlacion: float = 0.0
+
+    @classmethod
+    def desde_criterios(cls, criterios, **opciones):
+        # A partir de un dict {criterio: puntos máximos} como los de ``CRITERIOS``
+        return cls(tuple(int(m) for m in criterios.values()), **opciones)
+
+    @property
+    def maximo(self):
+        return sum(self.maximos)
+
+    def latentes(self, rng, n):
+        # Una fila por ensayo (calidad y un ruido por criterio): los n primeros no dependen de n
+        normales = rng.standard_normal((n, 1 + len(self.maximos)))
+        return normales[:, 0], normales[:, 1:]
+
+    def puntos(self, calidad, ruido, percentil_precio=None):
+        """Puntos técnicos totales; la última dimensión de ``ruido`` recorre los criterios."""
+        if self.correlacion and percentil_precio is not None:
+            z = _ppf_normal(np.clip(percentil_precio, LIMITE_PERCENTIL, 1 - LIMITE_PERCENTIL))
+            calidad = self.correlacion * z + np.sqrt(1 - self.correlacion ** 2) * calidad
+        # Operaciones en el sitio: el tensor es lo único grande que se materializa
+        fraccion = self.ruido * np.asarray(ruido, dtype=float)
+        fraccion += (self.media + self.dispersion * calidad)[..., None]
+        np.clip(fraccion, 0.0, 1.0, out=fraccion)
+        fraccion *= np.asarray(self.maximos, dtype=float)
+        np.rint(fraccion, out=fraccion)
+        return fraccion.sum(axis=-1).astype(np.int64)
+
+    def pmf(self, nodos=NODOS_CALIDAD):
+        """(valores, probabilidades) del total técnico de un rival, sin muestreo.
+
+        Dada la calidad, los criterios son independientes: se convolucionan sus
+        pmf y se integra la calidad con Gauss-Hermite. Es la distribución
+        marginal, así que ignora ``correlacion``.
+        """
+        z, w = np.polynomial.hermite_e.hermegauss(nodos)
+        w = w / w.sum()
+        total = np.ones((nodos, 1))
+        for maximo in self.maximos:
+            # P(puntos <= v | z) = P(fracción · máximo < v + 1/2); el último valor acumula el resto
+            cortes = (np.arange(maximo) + 0.5) / maximo
+            acumulada = _cdf_normal((cortes[None, :] - self.media - self.dispersion * z[:, None]) / self.ruido)
+            pmf = np.diff(acumulada, prepend=0.0, append=1.0, axis=1)
+            total = np.stack([np.convolve(t, p) for t, p in zip(total, pmf)])
+        return np.arange(total.shape[1], dtype=float), w @ total
+
+
+def percentil_precio(precios, lote, distribucion="Uniforme", bajada_max=20):
+    # Percentil de cada precio en la distribución con la que se sorteó (para la cópula)
+    return cdf_precios(precios, lote.precio_minimo(bajada_max), lote.presupuesto_base, distribucion)
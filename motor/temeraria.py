@@ -0,0 +1,75 @@
+"""Ofertas anormalmente bajas (bajas temerarias) según el art. 85 del RGLCAP.
+
+El umbral depende de todas las ofertas presentadas, así que cambia de un
+escenario simulado a otro. Las funciones trabajan sobre arrays de precios de
+cualquier forma cuyo último eje son los licitadores (por ejemplo ensayos ×
+lotes × licitadores) y resuelven todos los escenarios en una sola pasada. Un
+``nan`` es un licitador ausente, de modo que cada escenario puede tener un
+número distinto de ofertas.
+
+Las unidades porcentuales se miden sobre el presupuesto base de licitación:
+una oferta está «10 unidades por debajo de la media» si su baja supera en
+10 puntos a la baja media.
+
+- 1 oferta: temeraria si su baja supera 25 unidades.
+- 2 ofertas: si es inferior en más de 20 unidades a la otra.
+- 3 ofertas: si es inferior en más de 10 unidades a la media; la oferta más
+  alta no cuenta en la media si la supera en más de 10 unidades. Las bajas
+  de más de 25 unidades son temerarias en cualquier caso.
+- 4 o más: si es inferior en más de 10 unidades a la media; si hay ofertas
+  que la superan en más de 10 unidades, la media se recalcula sin ellas (y
+  con las tres más bajas si quedan menos de tres).
+"""
+
+import numpy as np
+
+# Unidades porcentuales del art. 85, como fracción del presupuesto base
+UNA_OFERTA = 0.25
+DOS_OFERTAS = 0.20
+SOBRE_MEDIA = 0.10
+
+
+def umbral_temeraria(precios, presupuesto):
+    """Precio por debajo del cual una oferta es temeraria, uno por escenario.
+
+    ``precios`` tiene a los licitadores en el último eje (``nan`` si no
+    licitan) y ``presupuesto`` es un escalar o un array con la forma de los
+    escenarios (los demás ejes). Sin ofertas el umbral es ``nan``.
+    """
+    precios = np.asarray(precios, dtype=float)
+    presupuesto = np.broadcast_to(np.asarray(presupuesto, dtype=float), precios.shape[:-1])
+    presentes = ~np.isnan(precios)
+    n = presentes.sum(axis=-1)
+    suma = np.sum(precios, axis=-1, where=presentes)
+    mas_alta = np.max(precios, axis=-1, where=presentes, initial=-np.inf)
+    margen = SOBRE_MEDIA * presupuesto
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = suma / n
+
+        # Tres ofertas: fuera de la media la más alta si se despega
+        media_tres = np.where(mas_alta > media + margen, (suma - mas_alta) / 2, media)
+        umbral_tres = np.maximum(media_tres - margen, (1 - UNA_OFERTA) * presupuesto)
+
+        # Cuatro o más: fuera de la media todas las que se despegan, pero nunca menos de tres
+        altas = precios > (media + margen)[..., None]
+        restantes = n - altas.sum(axis=-1)
+        media_cuatro = np.asarray((suma - np.sum(precios, axis=-1, where=altas)) / restantes)
+    pocas = (n >= 4) & (restantes < 3)
+    if pocas.any():
+        # Media de las tres más bajas (los ausentes, nan, quedan al final), solo donde hace falta
+        media_cuatro[pocas] = np.partition(precios[pocas], 2, axis=-1)[:, :3].mean(axis=-1)
+    umbral_cuatro = media_cuatro - margen
+
+    return np.select(
+        [n == 1, n == 2, n == 3, n >= 4],
+        [(1 - UNA_OFERTA) * presupuesto, mas_alta - DOS_OFERTAS * presupuesto, umbral_tres, umbral_cuatro],
+        np.nan
+    )
+
+
+def mascara_temeraria(precios, presupuesto):
+    """Array booleano con la forma de ``precios``: ofertas temerarias de cada escenario."""
+    precios = np.asarray(precios, dtype=float)
+    umbral = umbral_temeraria(precios, presupuesto)
+    with np.errstate(invalid="ignore"):
+        return precios < umbral[..., None]
@@ -0,0 +1 @@
+"""Páginas de la aplicación Streamlit (``streamlit run app.py``)."""
@@ -0,0 +1,583 @@
+"""Cachés, tareas y controles compartidos por todas las páginas de la aplicación.
+
+Las funciones cacheadas viven en este módulo, que se importa una sola vez por
+proceso: una simulación hecha desde la página de un lote se reutiliza al
+instante en el simulador integrado y viceversa.
+"""
+
+import functools
+import hashlib
+from concurrent.futures import wait
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from motor import perfil
+from motor.aleatorio import SEMILLA
+from motor.analitico import CampoAnalitico, resultado_analitico
+from motor.distribuciones import DISTRIBUCIONES, Beta, Triangular
+from motor.lotes import CRITERIOS
+from motor.montecarlo import CampoRivales, simular_montecarlo, simular_progresivo
+from motor.muestreo import MUESTREOS
+from motor.optimizacion import OBJETIVOS, optimizar_precio
+from motor.sensibilidad import rejilla_sensibilidad, superficie_sensibilidad
+from motor.simulacion import simular_escenario
+from motor.tareas import EjecutorTareas
+from motor.tablas import TOLERANCIA_TABLAS, CampoTabla, TablasVictoria
+from motor.tecnicos import ModeloTecnico
+from paginas import graficos
+
+# Segundos que se espera a una tarea recién lanzada antes de pasarla a segundo plano
+ESPERA_TAREA = 0.25
+
+# Claves de sesión que no forman parte del escenario guardado: internas,
+# ligadas a ficheros subidos o que se guardan aparte como resultados
+EXCLUIDAS_ESCENARIO = {
+    "ejecucion_completa", "historico", "fichero_escenario", "modelo_descuentos",
+    "modelo_descuentos_por", "resultados", "resultados_cargados", "version_escenario",
+    "mc_progresivo", "error_escenario", "perfil", "estado_perfil", "tareas", "tareas_dibujadas",
+}
+
+# ============================================================
+# FUNCIONES DE UTILIDAD
+# ============================================================
+@st.cache_data(max_entries=64, show_spinner=False)
+@perfil.fallo_cache("simular_tabla_lote")
+def simular_tabla_lote(lote, distribucion, bajada_max, competidores, oferta, garantia, puntos_tecnicos,
+                       semilla, tecnico, temeraria=False):
+    # Escenario de competidores + ranking del lote, cacheado por el hash de sus entradas.
+    # Cada empresa sortea de su propio flujo (por nombre) derivado de la semilla del escenario.
+    esc = simular_escenario(lote, len(competidores), oferta, garantia, puntos_tecnicos,
+                            distribucion, bajada_max, semilla, competidores, tecnico, temeraria)
+    tabla = pd.DataFrame({
+        "Empresa": list(competidores) + ["EMCO"],
+        "Precio (€)": np.round(esc["precios"], 2),
+        "Garantía (años)": np.round(esc["garantias"], 2),
+        "Económico": np.round(esc["p_precios"], 2),
+        "Garantía": np.round(esc["p_garantias"], 2),
+        "Técnicos": np.round(esc["tecnicos"], 2),
+        "Total": np.round(esc["totales"], 2)
+    })
+    if temeraria:
+        tabla.insert(len(tabla.columns) - 1, "Temeraria", esc["temerarias"])
+
+    df = tabla.sort_values("Total", ascending=False).reset_index(drop=True)
+    df.index += 1
+    # El Monte Carlo recibe el total de EMCO sin excluir: aplica la regla ensayo a ensayo
+    return df, esc["p_precios"][-1] + esc["p_garantias"][-1] + esc["tecnicos"][-1]
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+@perfil.fallo_cache("resultado_analitico_lote")
+def resultado_analitico_lote(lote, total_emco, n_rivales, distribucion, bajada_max, tecnico):
+    # Sin muestreo: el campo analítico sirve igual al optimizador de precio. Con el
+    # modelo por criterios se usa su pmf exacta (independiente del precio)
+    opciones = {} if tecnico is None else {"pmf_tecnicos": tecnico.pmf()}
+    mc = resultado_analitico(lote, total_emco, n_rivales, distribucion, bajada_max, **opciones)
+    mc["campo"] = CampoAnalitico(lote, n_rivales, distribucion, bajada_max, **opciones)
+    return mc
+
+
+@st.cache_data(max_entries=16, show_spinner="Calculando la superficie de sensibilidad...",
+               hash_funcs={CampoRivales: lambda c: c.huella, CampoAnalitico: lambda c: c.huella,
+                           CampoTabla: lambda c: c.huella})
+@perfil.fallo_cache("superficie_lote")
+def superficie_lote(lote, campo, puntos_tecnicos, rivales, n_precios, n_garantias, bajada_max):
+    # Toda la rejilla en una sola operación; el campo analítico se interpola sobre los totales
+    precios, garantias = rejilla_sensibilidad(lote, n_precios, n_garantias, bajada_max)
+    resolucion = 0.05 if isinstance(campo, CampoAnalitico) else None
+    return superficie_sensibilidad(lote, campo, precios, garantias, puntos_tecnicos, rivales, resolucion)
+
+
+@st.cache_resource(show_spinner=False)
+def ejecutor_tareas():
+    # Hilos de cálculo y resultados recientes (Monte Carlo, estrategia, ranking)
+    # compartidos por todas las sesiones; sustituye a st.cache_data en lo pesado
+    return EjecutorTareas(max_resultados=32)
+
+
+@st.cache_resource(show_spinner=False)
+@perfil.fallo_cache("tablas_victoria")
+def tablas_victoria():
+    # Una sola apertura (mapeada, solo lectura) por proceso, compartida por todas las sesiones
+    try:
+        return TablasVictoria()
+    except FileNotFoundError:
+        return None
+
+
+def clave_resultado(*partes):
+    # Huella estable entre procesos de los datos de entrada de un resultado
+    partes = tuple(p.item() if isinstance(p, np.generic) else getattr(p, "huella", p) for p in partes)
+    return hashlib.sha1(repr(partes).encode()).hexdigest()[:16]
+
+
+def recuperar(nombre, clave, calcular):
+    # Resultado de un escenario cargado si sus entradas coinciden; si no, se calcula
+    # (normalmente desde la caché). Se anota en la sesión para poder guardarlo.
+    # ``None`` es un cálculo aún en curso: se conserva el último resultado anotado
+    cargado = st.session_state.get("resultados_cargados", {}).get(nombre)
+    valor = cargado["valor"] if cargado is not None and cargado["clave"] == clave else calcular()
+    if valor is not None:
+        st.session_state.setdefault("resultados", {})[nombre] = {"clave": clave, "valor": valor}
+    return valor
+
+
+def ultimo_resultado(nombre):
+    return st.session_state.get("resultados", {}).get(nombre, {}).get("valor")
+
+
+@st.fragment(run_every=0.5)
+def progreso_tarea(tarea, etiqueta):
+    # Se refresca solo; al terminar la tarea vuelve a ejecutar la app para mostrar el resultado
+    if tarea.terminada:
+        st.rerun(scope="app")
+    st.progress(tarea.progreso, text=etiqueta)
+
+
+def en_segundo_plano(nombre, clave, calcular, etiqueta="Calculando..."):
+    # Resultado de ``calcular(avance)`` si ya está hecho; si no, lo lanza en un hilo y
+    # devuelve None mientras muestra su progreso. Si las entradas de ``nombre`` cambian,
+    # la tarea anterior se cancela en su siguiente bloque.
+    ejecutor = ejecutor_tareas()
+    tareas = st.session_state.setdefault("tareas", {})
+    st.session_state.setdefault("tareas_dibujadas", set()).add(nombre)
+    tarea = tareas.get(nombre)
+    if tarea is not None and tarea.clave != clave:
+        ejecutor.cancelar(tareas.pop(nombre))
+        tarea = None
+
+    resultado = ejecutor.resultado(clave)
+    if tarea is not None and tarea.terminada:
+        del tareas[nombre]
+        perfil.incorporar_registros(tarea.registros)
+        if tarea.error() is not None:
+            raise tarea.error()
+        if resultado is None:
+            resultado = tarea.futuro.result()
+    if resultado is not None:
+        return resultado
+
+    if tarea is None:
+        tarea = tareas[nombre] = ejecutor.lanzar(clave, calcular)
+        # Los cálculos rápidos se recogen en esta misma ejecución
+        wait([tarea.futuro], timeout=ESPERA_TAREA)
+        if tarea.terminada:
+            return en_segundo_plano(nombre, clave, calcular, etiqueta)
+    progreso_tarea(tarea, etiqueta)
+    return None
+
+
+def cancelar_tareas_sin_dibujar(nombres=None):
+    # Al terminar una ejecución, cancela las tareas (de ``nombres``, o todas) cuyo control
+    # no se ha dibujado en ella: Monte Carlo desactivado, otro modo, otra página...
+    tareas = st.session_state.get("tareas", {})
+    dibujadas = st.session_state.setdefault("tareas_dibujadas", set())
+    nombres = list(tareas) if nombres is None else nombres
+    for nombre in nombres:
+        if nombre in tareas and nombre not in dibujadas:
+            ejecutor_tareas().cancelar(tareas.pop(nombre))
+    dibujadas.difference_update(nombres)
+
+
+def tareas_del_fragmento(nombres):
+    # Decorador para fragmentos: cuando se re-ejecuta solo el fragmento, al terminar
+    # cancela sus tareas (``nombres(*args)``) sin dibujar; en las ejecuciones
+    # completas lo hace app.py para todas
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            resultado = funcion(*args, **kwargs)
+            if not st.session_state.get("ejecucion_completa"):
+                cancelar_tareas_sin_dibujar(nombres(*args, **kwargs))
+            return resultado
+        return envoltura
+    return decorador
+
+
+def estado_escenario():
+    # Valores simples de la sesión (controles y listas derivadas); los editores
+    # de tablas y los botones no pueden fijarse desde session_state
+    return {
+        clave: valor for clave, valor in st.session_state.items()
+        if clave not in EXCLUIDAS_ESCENARIO and not clave.startswith(("editor_", "FormSubmitter"))
+        and isinstance(valor, (bool, int, float, str, list))
+    }
+
+
+def conservar_controles():
+    # Streamlit borra el estado de los controles que no se dibujan en una ejecución:
+    # al reasignarlos pasan a ser estado de la sesión y sobreviven al cambio de
+    # página, con lo que las mismas entradas dan las mismas claves de caché
+    for clave, valor in estado_escenario().items():
+        st.session_state[clave] = valor
+
+
+def por_defecto(clave, valor):
+    # Clave de un control con su valor inicial en session_state en vez de en el propio
+    # control: conservar_controles reasigna el estado en cada ejecución y, si el control
+    # recibiera además un valor, Streamlit avisaría de que tiene dos orígenes
+    st.session_state.setdefault(clave, valor)
+    return clave
+
+
+def estado_perfil():
+    # Indicador y registros del perfil de la sesión (ver motor.perfil.usar_estado): cada
+    # re-ejecución, también la de un fragmento, corre en otro hilo. Los hilos de fondo
+    # no tienen sesión y usan el suyo
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.setdefault("estado_perfil", {})
+
+
+def simular_progresivo_lote(lote, total_emco, n_rivales, distribucion, bajada_max, tolerancia, max_ensayos,
+                            semilla, tecnico, muestreo, oferta_emco):
+    # Pinta los resultados parciales bloque a bloque y guarda el final en la sesión
+    clave = clave_resultado(lote, float(total_emco), n_rivales, distribucion, bajada_max, tolerancia,
+                            max_ensayos, semilla, tecnico, muestreo, oferta_emco)
+    guardados = st.session_state.setdefault("mc_progresivo", {})
+    if clave in guardados:
+        mostrar_montecarlo(guardados[clave], n_rivales, muestreo)
+        return guardados[clave]
+
+    hueco = st.empty()
+    for mc in simular_progresivo(lote, total_emco, n_rivales, distribucion, bajada_max,
+                                 tolerancia, max_ensayos=max_ensayos, semilla=semilla, tecnico=tecnico,
+                                 muestreo=muestreo, oferta_emco=oferta_emco):
+        with hueco.container():
+            mostrar_montecarlo(mc, n_rivales, muestreo)
+
+    guardados[clave] = mc
+    while len(guardados) > 16:
+        guardados.pop(next(iter(guardados)))
+    return mc
+
+
+def mostrar_montecarlo(mc, n_rivales, muestreo="Aleatorio"):
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Probabilidad de ganar", f"{mc['prob_victoria']:.1%}")
+    m2.metric("Puesto esperado", f"{mc['puesto_medio']:.2f}")
+    if "percentiles_margen" not in mc:
+        # Resultado analítico: exacto, sin sorteos ni percentiles
+        st.bar_chart(pd.Series(mc["distribucion_puestos"],
+                               index=range(1, n_rivales + 2), name="Probabilidad"))
+        return
+    m3.metric("Margen mediano sobre el mejor rival", f"{mc['percentiles_margen'][50]:+.2f} pts")
+    if "intervalo" in mc:
+        inferior, superior = mc["intervalo"]
+        estado = "✅ precisión alcanzada" if mc["convergido"] else (
+            "⏳ simulando..." if not mc["terminado"] else "⚠️ máximo de ensayos alcanzado")
+        st.caption(f"IC 95 %: [{inferior:.2%}, {superior:.2%}] con {mc['ensayos']:,} ensayos · {estado}")
+    if mc.get("prob_temeraria"):
+        st.caption(f"⚠️ Tu oferta es baja temeraria (y queda excluida) en el {mc['prob_temeraria']:.1%} "
+                   f"de los escenarios.")
+    if muestreo != "Aleatorio" and mc.get("reduccion_varianza"):
+        # Medida entre bloques de 10.000 ensayos (al menos MIN_REPLICAS de ellos)
+        st.caption(f"🎯 Muestreo {muestreo}: error estándar ±{mc['error_estandar']:.3%}, varianza "
+                   f"{mc['reduccion_varianza']:.1f}× menor que con sorteos aleatorios "
+                   f"(los mismos ensayos valen por {mc['reduccion_varianza']:.1f}×).")
+
+    st.markdown("Percentiles de la puntuación del mejor rival y de tu margen:")
+    st.dataframe(pd.DataFrame({
+        "Mejor rival": mc["percentiles_mejor_rival"],
+        "Tu margen": mc["percentiles_margen"]
+    }).rename(index=lambda q: f"P{q}").round(2).T, width="stretch")
+
+    st.markdown("Distribución de tu puesto:")
+    st.bar_chart(pd.Series(mc["distribucion_puestos"],
+                           index=range(1, n_rivales + 2), name="Probabilidad"))
+
+
+METRICAS_SUPERFICIE = {
+    "prob_victoria": "Probabilidad de ganar",
+    "total": "Puntuación total",
+    "puesto": "Puesto en el escenario simulado",
+}
+
+
+def mostrar_superficie(sup, metrica, lote, oferta, garantia):
+    # Solo se marca la oferta si cae dentro de la rejilla
+    dentro = sup["precios"][0] <= oferta <= sup["precios"][-1] and garantia <= sup["garantias"][-1]
+    st.image(graficos.superficie(
+        sup[metrica], sup["garantias"], sup["precios"], METRICAS_SUPERFICIE[metrica], metrica == "puesto",
+        {"U1": (lote.u1_precio, "red"), "U2": (lote.u2_precio, "green")},
+        *((oferta, garantia) if dentro else ())
+    ))
+
+
+def configurar_empresas():
+    st.header("🏢 Configuración de empresas participantes")
+
+    num_empresas = st.number_input(
+        "Número total de empresas competidoras",
+        min_value=2, max_value=20, step=1, key=por_defecto("num_empresas", 3)
+    )
+
+    empresas = []
+    for i in range(num_empresas):
+        nombre_default = f"Empresa {chr(65 + i)}"  # Empresa A, B, C, ...
+        nombre = st.text_input(f"Nombre de la empresa {i+1}", key=por_defecto(f"nombre_emp_{i}", nombre_default))
+        empresas.append(nombre)
+
+    # Añadir usuario (EMCO) si no está
+    if "EMCO" not in empresas:
+        empresas.append("EMCO")
+
+    # Guardar lista global en sesión (para usarla dentro de funciones)
+    st.session_state["empresas"] = empresas
+    return empresas
+
+
+@st.fragment
+@tareas_del_fragmento(lambda nombre_lote, *args, **kwargs: [f"montecarlo_{nombre_lote}"])
+@perfil.cronometrado("simulador_lote")
+def simulador_lote(nombre_lote, lote, expandido=False):
+    with st.expander(f"📦 {nombre_lote} - Simulación de tu puntuación (con competidores)", expanded=expandido):
+        st.subheader(f"Simulador de puntuación - {nombre_lote}")
+
+        # --- Entradas usuario ---
+        st.header("✍️ Introduce tu oferta")
+        c1, c2 = st.columns(2)
+        with c1:
+            oferta = st.number_input(
+                f"💰 Tu precio ofertado (€) - {nombre_lote}",
+                min_value=0.0, step=100.0, format="%.2f", key=f"precio_{nombre_lote}"
+            )
+        with c2:
+            garantia = st.number_input(
+                "📆 Años de garantía extendida",
+                min_value=0.0, step=0.5, key=f"garantia_{nombre_lote}"
+            )
+
+        # --- Criterios técnicos ---
+        st.header("📋 Evaluación técnica subjetiva")
+
+        criterios = CRITERIOS.get(nombre_lote, {})
+
+        puntos_tecnicos = 0
+        for crit, max_pts in criterios.items():
+            puntos_tecnicos += st.slider(
+                f"{crit} (0 - {max_pts})", 0, max_pts, key=por_defecto(f"{nombre_lote}_{crit}", max_pts)
+            )
+
+        # --- Simulación de competidores ---
+        st.header("🏁 Simulación de empresas competidoras")
+
+        empresas_globales = st.session_state.get("empresas", [])
+        if not empresas_globales:
+            st.warning("No hay empresas configuradas. Configúralas arriba.")
+            return
+
+        semilla = st.session_state.get("semilla", SEMILLA)
+        modelo = st.session_state.get("modelo_descuentos")
+        distribucion = st.selectbox(
+            "Distribución de precios simulados",
+            DISTRIBUCIONES + (["Empírica"] if modelo else []),
+            key=f"dist_{nombre_lote}"
+        )
+        if distribucion == "Beta":
+            b1, b2 = st.columns(2)
+            alpha = b1.slider("Forma α (agresividad)", 1.0, 5.0, key=por_defecto(f"beta_alpha_{nombre_lote}", 2.0))
+            beta = b2.slider("Forma β (conservadurismo)", 1.0, 5.0, key=por_defecto(f"beta_beta_{nombre_lote}", 2.0))
+            distribucion = Beta(alpha, beta)
+        elif distribucion == "Triangular":
+            # Posición del pico entre el PL (0 %) y el precio con la bajada máxima (100 %)
+            bajada_probable = st.slider("Valor más probable (% de la bajada máxima)", 0, 100, step=5,
+                                        key=por_defecto(f"triangular_moda_{nombre_lote}", 50))
+            distribucion = Triangular(1 - bajada_probable / 100)
+
+        bajada_max = st.slider(
+            "Bajada máxima esperada respecto al PL (%)",
+            1, 50,
+            key=por_defecto(f"bajada_{nombre_lote}", 20),
+            disabled=distribucion == "Empírica"
+        )
+
+        # Puntos técnicos de los rivales: uniformes o criterio a criterio
+        tecnico = None
+        if st.checkbox("Simular los puntos técnicos de los rivales criterio a criterio",
+                       key=f"tecnico_{nombre_lote}"):
+            t1, t2 = st.columns(2)
+            media = t1.slider("Calidad media de los rivales (% del máximo de cada criterio)",
+                              30, 95, step=5, key=por_defecto(f"tecnico_media_{nombre_lote}", 70))
+            correlacion = t2.slider("Correlación precio-calidad de los rivales", -0.9, 0.9, step=0.1,
+                                    key=por_defecto(f"tecnico_correlacion_{nombre_lote}", 0.0))
+            tecnico = ModeloTecnico.desde_criterios(criterios, media=media / 100, correlacion=correlacion)
+
+        temeraria = st.checkbox(
+            "Excluir las bajas temerarias (art. 85 RGLCAP)", key=f"temeraria_{nombre_lote}",
+            help="Las ofertas demasiado por debajo de la media de las presentadas (la tuya "
+                 "incluida) quedan fuera del ranking, como si no se justificaran."
+        )
+        oferta_emco = oferta if temeraria else None
+
+        # Excluimos "EMCO" para generar precios simulados solo de competidores
+        competidores = [e for e in empresas_globales if e != "EMCO"]
+        num_comp = len(competidores)
+
+        # Con el histórico cargado, los descuentos salen del modelo empírico
+        if distribucion == "Empírica":
+            agrupacion = st.session_state.get("modelo_descuentos_por")
+            if agrupacion == "empresa":
+                distribucion = modelo.seleccionar(competidores)
+            elif agrupacion == "sector":
+                sector = st.selectbox("Sector del histórico", modelo.etiquetas, key=f"sector_{nombre_lote}")
+                distribucion = modelo.seleccionar([sector])
+            else:
+                distribucion = modelo
+
+        entradas = (lote, distribucion, bajada_max, tuple(competidores), oferta, garantia, puntos_tecnicos, semilla,
+                    tecnico, temeraria)
+        with perfil.medir("simular_tabla_lote", elementos=num_comp):
+            df, total_emco = recuperar(f"tabla_{nombre_lote}", clave_resultado(*entradas),
+                                       lambda: simular_tabla_lote(*entradas))
+        st.dataframe(df, width="stretch")
+
+        # Guardar resultados por lote (para comparador)
+        cambiado = st.session_state.get(f"puntos_{nombre_lote}") != df["Total"].tolist()
+        st.session_state[f"empresas_{nombre_lote}"] = df["Empresa"].tolist()
+        st.session_state[f"puntos_{nombre_lote}"] = df["Total"].tolist()
+
+        # Si solo se ha re-ejecutado este fragmento, el comparador necesita los nuevos puntos
+        if cambiado and not st.session_state.get("ejecucion_completa"):
+            st.rerun()
+
+        # Tu total en el lote
+        if "EMCO" in df["Empresa"].values:
+            total_usuario = df.loc[df["Empresa"] == "EMCO", "Total"].values[0]
+            if temeraria and df.loc[df["Empresa"] == "EMCO", "Temeraria"].values[0]:
+                st.error(f"⚠️ Tu oferta es una baja temeraria en {nombre_lote}: queda excluida si no se justifica.")
+            else:
+                st.success(f"🎯 Tu puntuación final en {nombre_lote}: **{total_usuario} puntos**")
+            # Para la estrategia óptima, el total sin excluir (como el que recibe el Monte Carlo)
+            st.session_state[f"total_{nombre_lote}"] = float(total_emco)
+            # Campo de rivales del lote para la estrategia óptima (tupla: no va al escenario)
+            st.session_state[f"campo_{nombre_lote}"] = (num_comp, distribucion, bajada_max, tecnico)
+        else:
+            st.warning("No se encontró 'EMCO' en el ranking de este lote.")
+
+        # --- Modo Monte Carlo ---
+        st.header("🎲 Probabilidad de adjudicación (Monte Carlo)")
+        if st.checkbox("Simular muchos escenarios de competidores", key=f"mc_{nombre_lote}"):
+            modo = st.radio(
+                "Modo", ["Ensayos fijos", "Progresivo (parada automática)", "Analítico (exacto)"],
+                horizontal=True, key=f"mc_modo_{nombre_lote}"
+            )
+            muestreo = "Aleatorio"
+            if modo != "Analítico (exacto)":
+                muestreo = st.selectbox(
+                    "Muestreo de los competidores", MUESTREOS, key=f"mc_muestreo_{nombre_lote}",
+                    help="Halton, hipercubo latino y pares antitéticos reducen la varianza: "
+                         "la misma precisión con menos ensayos."
+                )
+            if modo == "Ensayos fijos":
+                n_ensayos = st.select_slider(
+                    "Número de ensayos",
+                    [10_000, 50_000, 100_000, 500_000, 1_000_000],
+                    key=por_defecto(f"mc_ensayos_{nombre_lote}", 100_000)
+                )
+                entradas_mc = (lote, total_emco, num_comp, n_ensayos, distribucion, bajada_max, semilla)
+                nombre_mc = f"montecarlo_{nombre_lote}"
+                clave_mc = clave_resultado(*entradas_mc, tecnico, muestreo, oferta_emco)
+                mc = recuperar(nombre_mc, clave_mc, lambda: en_segundo_plano(
+                    nombre_mc, clave_mc,
+                    lambda avance: simular_montecarlo(*entradas_mc, tecnico=tecnico, avance=avance,
+                                                      muestreo=muestreo, oferta_emco=oferta_emco),
+                    "Simulando escenarios de competidores..."))
+                if mc is None:
+                    # Mientras se calcula, el último resultado bueno (si lo hay)
+                    mc = ultimo_resultado(nombre_mc)
+                    if mc is None:
+                        return
+                    st.caption("⏳ Resultado anterior mientras se calcula el nuevo.")
+                mostrar_montecarlo(mc, num_comp, muestreo)
+            elif modo == "Analítico (exacto)":
+                if tecnico is not None and tecnico.correlacion:
+                    st.warning("El modo analítico supone precio y calidad independientes: "
+                               "ignora la correlación precio-calidad.")
+                if temeraria:
+                    st.warning("El modo analítico no aplica las bajas temerarias: usa el modo "
+                               "de ensayos fijos o el progresivo para tenerlas en cuenta.")
+                # Los casos estándar se consultan en las tablas precalculadas (python -m motor.tablas)
+                tablas = tablas_victoria() if tecnico is None else None
+                campo = tablas.campo(lote, num_comp, distribucion, bajada_max) if tablas else None
+                if campo is not None:
+                    with perfil.medir("consulta_tablas", elementos=num_comp):
+                        mc = campo.resultado(total_emco) | {"campo": campo}
+                    st.caption(f"📚 Consultado en las tablas precalculadas, interpoladas: difiere del cálculo "
+                               f"analítico en menos de {num_comp * TOLERANCIA_TABLAS:.0e}.")
+                else:
+                    with perfil.medir("resultado_analitico_lote", elementos=num_comp):
+                        mc = resultado_analitico_lote(lote, total_emco, num_comp, distribucion, bajada_max,
+                                                      tecnico)
+                mostrar_montecarlo(mc, num_comp)
+            else:
+                p1, p2 = st.columns(2)
+                tolerancia = p1.select_slider(
+                    "Precisión buscada en la probabilidad de ganar (IC 95 %)",
+                    [0.001, 0.0025, 0.005, 0.01, 0.02, 0.05],
+                    format_func=lambda t: f"± {t:.2%}", key=por_defecto(f"mc_tolerancia_{nombre_lote}", 0.005)
+                )
+                max_ensayos = p2.select_slider(
+                    "Máximo de ensayos",
+                    [100_000, 500_000, 1_000_000, 5_000_000],
+                    key=por_defecto(f"mc_max_ensayos_{nombre_lote}", 1_000_000)
+                )
+                with perfil.medir("simular_progresivo_lote", elementos=max_ensayos * num_comp):
+                    mc = simular_progresivo_lote(lote, total_emco, num_comp, distribucion, bajada_max,
+                                                 tolerancia, max_ensayos, semilla, tecnico, muestreo,
+                                                 oferta_emco)
+
+            # --- Optimizador del precio (mismos sorteos que el Monte Carlo, o el modelo analítico) ---
+            st.subheader("🧭 Precio óptimo entre U2 y U1")
+            o1, o2 = st.columns(2)
+            with o1:
+                objetivo = st.radio(
+                    "Objetivo", list(OBJETIVOS), format_func=OBJETIVOS.get,
+                    key=f"opt_objetivo_{nombre_lote}"
+                )
+            with o2:
+                coste = st.number_input(
+                    "Coste mínimo (€)", min_value=0.0, step=1000.0,
+                    format="%.2f", key=por_defecto(f"opt_coste_{nombre_lote}", float(lote.u2_precio)),
+                    disabled=objetivo != "margen"
+                )
+            try:
+                with perfil.medir("optimizar_precio"):
+                    opt = optimizar_precio(lote, mc["campo"], garantia, puntos_tecnicos, objetivo, coste)
+            except ValueError as e:
+                st.warning(str(e))
+            else:
+                st.success(
+                    f"Precio recomendado: **{opt['precio']:,.2f} €** · "
+                    f"probabilidad de ganar {opt['prob_victoria']:.1%} · "
+                    f"margen esperado {opt['margen_esperado']:,.0f} €"
+                )
+                st.line_chart(pd.DataFrame({
+                    "Probabilidad de ganar": opt["curva_prob_victoria"]
+                }, index=pd.Index(opt["curva_precios"], name="Precio (€)")))
+                if temeraria:
+                    st.caption("La curva no aplica las bajas temerarias, que dependen de cada precio: "
+                               "comprueba el precio recomendado en el Monte Carlo antes de darlo por bueno.")
+
+            # --- Superficie de sensibilidad precio × garantía ---
+            st.subheader("🗺️ Sensibilidad: precio × años de garantía")
+            s1, s2, s3 = st.columns(3)
+            metrica = s1.selectbox(
+                "Métrica", list(METRICAS_SUPERFICIE), format_func=METRICAS_SUPERFICIE.get,
+                key=f"sup_metrica_{nombre_lote}"
+            )
+            n_precios = s2.select_slider("Precios", [100, 250, 500], key=por_defecto(f"sup_precios_{nombre_lote}", 500))
+            n_garantias = s3.select_slider("Garantías", [13, 25, 49],
+                                           key=por_defecto(f"sup_garantias_{nombre_lote}", 49))
+            rivales = df.loc[df["Empresa"] != "EMCO", "Total"].to_numpy()
+            with perfil.medir("superficie_lote", elementos=n_precios * n_garantias):
+                sup = superficie_lote(lote, mc["campo"], puntos_tecnicos, rivales, n_precios, n_garantias,
+                                      bajada_max)
+            with perfil.medir("mostrar_superficie"):
+                mostrar_superficie(sup, metrica, lote, oferta, garantia)
+            if temeraria:
+                st.caption("La superficie tampoco aplica las bajas temerarias.")
+
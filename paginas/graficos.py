@@ -0,0 +1,116 @@
+"""Gráficos de la aplicación: matplotlib bajo demanda, PNG cacheados y curvas reducidas.
+
+matplotlib se importa la primera vez que se dibuja algo, no al arrancar. Las
+figuras se crean con ``Figure`` y no con pyplot, así que no quedan retenidas
+en su registro global: se liberan en cuanto se guardan como PNG. Los PNG se
+cachean por sus datos de entrada, de modo que repintar un gráfico ya visto es
+servir unos bytes. Las curvas densas se reducen a la resolución de la
+pantalla sin perder sus quiebros (U1, U2...).
+"""
+
+import io
+
+import numpy as np
+import streamlit as st
+
+from motor import perfil
+
+# Puntos de una curva a partir de los cuales ya no se distinguen en pantalla
+PUNTOS_PANTALLA = 1000
+# Resolución de los PNG (puntos por pulgada)
+PPP = 150
+
+
+def reducir_curva(x, y, max_puntos=PUNTOS_PANTALLA, quiebros=()):
+    """La curva (``x`` creciente) con unos ``max_puntos`` puntos como mucho.
+
+    Si es lineal a trozos basta con sus vértices y el dibujo no cambia. Si no,
+    se queda con el mínimo y el máximo de cada tramo de pantalla, así que no
+    se pierden picos. Los valores de ``quiebros`` conservan sus dos vecinos.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = x.size
+    if n <= max_puntos:
+        return x, y
+    pendiente = np.diff(y) / np.diff(x)
+    vertices = np.flatnonzero(~np.isclose(pendiente[1:], pendiente[:-1], rtol=1e-9, atol=1e-12)) + 1
+    if vertices.size + 2 <= max_puntos:
+        indices = vertices
+    else:
+        tramo = np.arange(n) * (max_puntos // 2) // n
+        orden = np.lexsort((y, tramo))
+        inicio = np.flatnonzero(np.diff(tramo[orden], prepend=-1))
+        fin = np.append(inicio[1:], n) - 1
+        indices = np.concatenate([orden[inicio], orden[fin]])
+    posiciones = np.searchsorted(x, np.asarray(quiebros, dtype=float))
+    indices = np.concatenate([[0, n - 1], indices, posiciones - 1, posiciones])
+    indices = np.unique(np.clip(indices, 0, n - 1))
+    return x[indices], y[indices]
+
+
+def _figura():
+    # Import diferido: solo lo paga la primera ejecución que dibuja
+    from matplotlib.figure import Figure
+    figura = Figure()
+    return figura, figura.subplots()
+
+
+def _png(figura):
+    buffer = io.BytesIO()
+    figura.savefig(buffer, format="png", dpi=PPP, bbox_inches="tight")
+    figura.clear()
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+@perfil.fallo_cache("graficos.curva")
+def curva(x, y, verticales, titulo, etiqueta_x, etiqueta_y, quiebros=()):
+    """PNG de una curva reducida; ``verticales`` es ``{etiqueta: (x, color)}``."""
+    x, y = reducir_curva(x, y, quiebros=quiebros)
+    fig, ax = _figura()
+    ax.plot(x, y, color="blue")
+    for etiqueta, (posicion, color) in verticales.items():
+        ax.axvline(x=posicion, color=color, linestyle="--", label=etiqueta)
+    ax.set_xlabel(etiqueta_x)
+    ax.set_ylabel(etiqueta_y)
+    ax.set_title(titulo)
+    ax.grid(True)
+    ax.legend()
+    return _png(fig)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+@perfil.fallo_cache("graficos.dispersion")
+def dispersion(x, y, verticales, titulo, etiqueta_x, etiqueta_y, etiqueta="Competidores"):
+    """PNG de una nube de puntos con líneas verticales como en ``curva``."""
+    fig, ax = _figura()
+    ax.scatter(x, y, color="blue", label=etiqueta)
+    for nombre, (posicion, color) in verticales.items():
+        ax.axvline(posicion, color=color, linestyle="--", label=nombre)
+    ax.set_title(titulo)
+    ax.set_xlabel(etiqueta_x)
+    ax.set_ylabel(etiqueta_y)
+    ax.grid(True)
+    ax.legend()
+    return _png(fig)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+@perfil.fallo_cache("graficos.superficie")
+def superficie(valores, garantias, precios, etiqueta, invertida, horizontales, oferta=None, garantia=None):
+    """PNG del mapa precio × garantía; ``horizontales`` es ``{etiqueta: (precio, color)}``."""
+    fig, ax = _figura()
+    imagen = ax.imshow(
+        valores, origin="lower", aspect="auto", interpolation="nearest",
+        cmap="viridis_r" if invertida else "viridis",
+        extent=[garantias[0], garantias[-1], precios[0], precios[-1]]
+    )
+    fig.colorbar(imagen, ax=ax, label=etiqueta)
+    for nombre, (posicion, color) in horizontales.items():
+        ax.axhline(posicion, color=color, linestyle="--", label=nombre)
+    if oferta is not None:
+        ax.plot(garantia, oferta, marker="o", color="white", markeredgecolor="black", label="Tu oferta")
+    ax.set_xlabel("Años de garantía extendida")
+    ax.set_ylabel("Precio ofertado (€)")
+    ax.legend(loc="upper right")
+    return _png(fig)
@@ -0,0 +1,287 @@
+"""Simulador integrado: todos los lotes del pliego, el comparador final y las ofertas integradoras."""
+
+from functools import partial
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from motor import perfil
+from motor.aleatorio import SEMILLA
+from motor.combinaciones import INTEGRABLES, NOMBRES_CORTOS, numero_combinaciones, ranking_combinaciones
+from motor.empirico import METODOS, ajustar_modelo, leer_descuentos
+from motor.escenarios import cargar_escenario, guardar_escenario
+from motor.estrategia import estrategia_optima
+from motor.lotes import LOTES, PESOS, PLIEGO
+from paginas.comun import (
+    clave_resultado,
+    configurar_empresas,
+    en_segundo_plano,
+    estado_escenario,
+    recuperar,
+    por_defecto,
+    simulador_lote,
+    tareas_del_fragmento,
+)
+
+st.title(f"Simulador completo de valoración - Modelo {PLIEGO.nombre}")
+
+
+@st.cache_resource(max_entries=8, show_spinner="Ajustando el modelo de descuentos...")
+@perfil.fallo_cache("ajustar_historico")
+def ajustar_historico(id_fichero, _fichero, por, metodo):
+    # Compartido entre sesiones: se ajusta una vez por fichero subido y configuración
+    _fichero.seek(0)
+    return ajustar_modelo(leer_descuentos(_fichero, por), metodo)
+
+
+def cargar_escenario_subido():
+    # Callback del cargador: se ejecuta antes que el script, cuando aún se pueden fijar los controles
+    fichero = st.session_state.get("fichero_escenario")
+    if fichero is None:
+        return
+    try:
+        estado, resultados, _ = cargar_escenario(fichero)
+    except (ValueError, KeyError, OSError) as e:
+        st.session_state["error_escenario"] = f"No se pudo cargar el escenario: {e}"
+        return
+    st.session_state.pop("error_escenario", None)
+    for clave, valor in estado.items():
+        # La distribución empírica solo existe si se ha subido de nuevo el histórico
+        if valor == "Empírica" and "modelo_descuentos" not in st.session_state:
+            continue
+        st.session_state[clave] = valor
+    st.session_state["mc_progresivo"] = resultados.pop("mc_progresivo", {})
+    st.session_state["resultados_cargados"] = resultados
+    st.session_state["version_escenario"] = st.session_state.get("version_escenario", 0) + 1
+
+
+# =========================
+# ESCENARIOS GUARDADOS
+# =========================
+# Antes que cualquier otro control: cargar un escenario fija sus valores
+panel_escenario = st.sidebar.container()
+with panel_escenario:
+    st.header("💾 Escenario")
+    st.file_uploader(
+        "Cargar escenario (.npz)", type=["npz"], key="fichero_escenario", on_change=cargar_escenario_subido
+    )
+    if "error_escenario" in st.session_state:
+        st.error(st.session_state["error_escenario"])
+
+# =========================
+# DEFINICIÓN DE EMPRESAS (GLOBAL)
+# =========================
+configurar_empresas()
+
+# =========================
+# SEMILLA DEL ESCENARIO
+# =========================
+with st.sidebar:
+    st.header("🎲 Escenario")
+    st.number_input(
+        "Semilla del escenario", min_value=0, step=1, key=por_defecto("semilla", SEMILLA),
+        help="Misma semilla, mismos competidores y mismos ensayos en cada lote y empresa."
+    )
+
+# =========================
+# HISTÓRICO DE LICITACIONES (OPCIONAL)
+# =========================
+with st.sidebar:
+    st.header("📚 Histórico de licitaciones")
+    fichero_historico = st.file_uploader(
+        "Pujas de concursos anteriores (CSV o Parquet)", type=["csv", "parquet"], key="historico"
+    )
+    if fichero_historico is None:
+        st.session_state.pop("modelo_descuentos", None)
+    else:
+        agrupar = st.selectbox("Agrupar descuentos por", ["Sin agrupar", "sector", "empresa"], key="historico_por")
+        metodo = st.selectbox("Ajuste", METODOS, format_func=str.upper, key="historico_metodo")
+        por = None if agrupar == "Sin agrupar" else agrupar
+        try:
+            with perfil.medir("ajustar_historico", elementos=fichero_historico.size):
+                modelo_descuentos = ajustar_historico(fichero_historico.file_id, fichero_historico, por, metodo)
+        except (ValueError, KeyError, ImportError) as e:
+            st.error(f"No se pudo ajustar el histórico: {e}")
+            st.session_state.pop("modelo_descuentos", None)
+        else:
+            st.session_state["modelo_descuentos"] = modelo_descuentos
+            st.session_state["modelo_descuentos_por"] = por
+            st.caption(
+                f"{int(modelo_descuentos.observaciones[0]):,} ofertas válidas · "
+                f"{len(modelo_descuentos.etiquetas) - 1} grupos con datos suficientes. "
+                "Elige la distribución «Empírica» en cada lote."
+            )
+
+# ============================================================
+# SIMULADORES DE LOS LOTES DEL PLIEGO
+# ============================================================
+for nombre_lote, lote in LOTES.items():
+    simulador_lote(nombre_lote, lote)
+
+# Filas con algún lote relleno -> ofertas integradoras {"empresa", "incluye", <lote>: puntos}
+def integradoras_desde_tabla(tabla):
+    ofertas = []
+    for fila in tabla.to_dict("records"):
+        incluye = [l for l in NOMBRES_CORTOS if pd.notna(fila[l])]
+        if incluye:
+            ofertas.append({"empresa": fila["Empresa"], "incluye": incluye}
+                           | {l: float(fila[l]) if l in incluye else None for l in NOMBRES_CORTOS})
+    return ofertas
+
+# ============================================================
+# COMPARADOR FINAL
+# ============================================================
+@st.fragment
+@tareas_del_fragmento(lambda: ["ranking", "estrategia"])
+@perfil.cronometrado("comparador_final")
+def comparador_final():
+    st.header("📊 Comparador final por empresa")
+
+    empresas_globales = st.session_state.get("empresas", ["EMCO", "Empresa A", "Empresa B"])
+    num_empresas_cmp = len(empresas_globales)
+
+    # Puntos de cada lote por nombre de empresa (la tabla del lote está ordenada por total)
+    base = pd.DataFrame({"Empresa": empresas_globales})
+    for nombre_lote in LOTES:
+        puntos = dict(zip(st.session_state.get(f"empresas_{nombre_lote}", []),
+                          st.session_state.get(f"puntos_{nombre_lote}", [])))
+        base[nombre_lote] = [float(puntos.get(emp, 0.0)) for emp in empresas_globales]
+
+    columnas_puntos = {
+        nombre_lote: st.column_config.NumberColumn(nombre_lote, min_value=0.0, max_value=100.0,
+                                                   step=1.0, format="%.2f")
+        for nombre_lote in LOTES
+    }
+
+    # Un único formulario: las ediciones de ambas tablas se envían juntas al pulsar el botón
+    with st.form("form_comparador", border=False):
+        # Las ediciones se conservan mientras no cambien las puntuaciones simuladas
+        # (o hasta cargar otro escenario, que trae sus propias ediciones)
+        version = st.session_state.get("version_escenario", 0)
+        firma = clave_resultado(base.to_numpy().tolist())
+        df_comparador = st.data_editor(
+            recuperar("comparador", firma, lambda: base), key=f"editor_comparador_{firma}_{version}",
+            hide_index=True, width="stretch", disabled=["Empresa"], column_config=columnas_puntos
+        )
+        st.session_state["resultados"]["comparador"]["valor"] = df_comparador
+
+        # --- Ofertas integradoras ---
+        st.header(f"🔗 Ofertas integradoras (modelo {PLIEGO.nombre})")
+        grupos = ", ".join("+".join(sorted(g, key=NOMBRES_CORTOS.index)) for g in INTEGRABLES)
+        st.caption(
+            "Define qué empresas presentan ofertas integradoras y qué lotes incluyen: "
+            "rellena la puntuación de cada lote incluido y deja vacíos los demás. "
+            f"Se clasificarán todas las combinaciones posibles. Integrables según el pliego: {grupos or 'ninguna'}."
+        )
+        vacia = pd.DataFrame({"Empresa": empresas_globales}
+                             | {l: np.full(num_empresas_cmp, np.nan) for l in NOMBRES_CORTOS})
+        firma_integradoras = clave_resultado(empresas_globales)
+        tabla_integradoras = st.data_editor(
+            recuperar("integradoras", firma_integradoras, lambda: vacia),
+            key=f"editor_integradoras_{firma_integradoras}_{version}", hide_index=True, width="stretch",
+            disabled=["Empresa"], column_config={
+                l: st.column_config.NumberColumn(l, min_value=0.0, max_value=100.0, step=1.0, format="%.2f")
+                for l in NOMBRES_CORTOS
+            }
+        )
+        st.session_state["resultados"]["integradoras"]["valor"] = tabla_integradoras
+        st.form_submit_button("Aplicar cambios")
+
+    ofertas_integradoras = integradoras_desde_tabla(tabla_integradoras)
+
+    if ofertas_integradoras:
+        st.markdown("### 🧩 Combinaciones posibles de ofertas (individuales + integradoras)")
+        puntuaciones_ind = df_comparador[list(LOTES)].to_numpy(dtype=float)
+
+        total_combinaciones = numero_combinaciones(len(empresas_globales), ofertas_integradoras)
+        top_k = st.number_input(
+            "Número de combinaciones a mostrar",
+            min_value=1, max_value=total_combinaciones, step=10,
+            key=por_defecto("top_k_combinaciones", min(100, total_combinaciones))
+        )
+        st.caption(f"Mostrando las {top_k} mejores de {total_combinaciones:,} combinaciones posibles.")
+
+        # Ranking exacto de las k mejores sin enumerar el producto completo
+        resultados = en_segundo_plano(
+            "ranking", clave_resultado(empresas_globales, puntuaciones_ind.tolist(), ofertas_integradoras, top_k),
+            lambda avance: ranking_combinaciones(empresas_globales, puntuaciones_ind, PESOS, ofertas_integradoras,
+                                                 top_k, avance=avance),
+            "Clasificando combinaciones..."
+        )
+        if resultados is not None:
+            df_combos = pd.DataFrame(resultados)
+            df_combos.index += 1
+            st.dataframe(df_combos, width="stretch")
+    else:
+        st.info("⚠️ No se han definido ofertas integradoras todavía.")
+
+    # --- Estrategia óptima de EMCO ---
+    st.markdown("### 🧠 Estrategia óptima de EMCO")
+    campos = {corto: st.session_state.get(f"campo_{nombre_lote}")
+              for corto, nombre_lote in zip(NOMBRES_CORTOS, LOTES)}
+    if not all(campos.values()):
+        st.info("Simula todos los lotes (con EMCO entre las empresas) para buscar la mejor estrategia.")
+        return
+    if st.checkbox("Buscar la mejor combinación de ofertas individuales e integradoras", key="estrategia"):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            n_ensayos = st.select_slider("Ensayos por lote", [10_000, 50_000, 100_000],
+                                         key=por_defecto("estrategia_ensayos", 50_000))
+        with c2:
+            mejora = st.number_input("Mejora de la integradora (puntos por lote)", min_value=0.0,
+                                     max_value=20.0, step=0.5, key=por_defecto("estrategia_mejora", 0.0))
+        with c3:
+            exclusiva = st.checkbox("Sin oferta individual en los lotes integrados",
+                                    key=por_defecto("estrategia_exclusiva", True))
+
+        con_temerarias = [corto for corto, nombre_lote in zip(NOMBRES_CORTOS, LOTES)
+                          if st.session_state.get(f"temeraria_{nombre_lote}")]
+        if con_temerarias:
+            st.warning(f"La estrategia no aplica las bajas temerarias, activadas en {', '.join(con_temerarias)}: "
+                       f"sus probabilidades pueden no coincidir con el Monte Carlo de esos lotes.")
+
+        totales = {corto: float(st.session_state[f"total_{nombre_lote}"])
+                   for corto, nombre_lote in zip(NOMBRES_CORTOS, LOTES)}
+        semilla = st.session_state.get("semilla", SEMILLA)
+        # Un campo simulado por lote (misma semilla que el Monte Carlo) y búsqueda con poda
+        clave = clave_resultado([(c, n, getattr(d, "huella", d), b, t) for c, (n, d, b, t) in campos.items()],
+                                totales, n_ensayos, semilla, mejora, exclusiva)
+        estrategia = en_segundo_plano(
+            "estrategia", clave,
+            lambda avance: estrategia_optima(campos, totales, n_ensayos, semilla, mejora, exclusiva, avance=avance),
+            "Buscando la estrategia óptima de EMCO..."
+        )
+        if estrategia is None:
+            return
+
+        piezas = [" + ".join(p) + " (integradora)" for p in estrategia["integradoras"]]
+        piezas += [f"{l} (individual)" for l in estrategia["individuales"]]
+        st.success("🏆 Mejor estrategia: " + ", ".join(piezas))
+        m1, m2 = st.columns(2)
+        m1.metric("Probabilidad ponderada de adjudicación", f"{estrategia['valor']:.2%}",
+                  f"{estrategia['valor'] - estrategia['valor_individual']:+.2%} frente a solo individuales")
+        m2.metric("Solo ofertas individuales", f"{estrategia['valor_individual']:.2%}")
+
+        opciones = pd.DataFrame([
+            {"Oferta": " + ".join(sorted(p, key=NOMBRES_CORTOS.index)),
+             "Tipo": "Integradora" if len(p) > 1 else "Individual",
+             "Valor ponderado": round(valor, 4)}
+            | {l: round(probs[l], 4) if l in probs else None for l in NOMBRES_CORTOS}
+            for p, (valor, probs) in estrategia["opciones"].items()
+        ])
+        st.dataframe(opciones, hide_index=True, width="stretch")
+        st.caption(f"Probabilidad de adjudicación por lote en cada oferta. Ramificación y poda: "
+                   f"{estrategia['nodos']} nodos explorados, {estrategia['podados']} podados.")
+
+
+comparador_final()
+
+# El fichero se genera solo al pulsar el botón, con el estado de esta ejecución
+with panel_escenario:
+    resultados = dict(st.session_state.get("resultados", {}))
+    resultados["mc_progresivo"] = dict(st.session_state.get("mc_progresivo", {}))
+    st.download_button(
+        "Guardar escenario", data=partial(guardar_escenario, None, estado_escenario(), resultados),
+        file_name="escenario.npz", mime="application/octet-stream", on_click="ignore"
+    )
@@ -0,0 +1,70 @@
+"""Página de detalle de un lote: simulador, sensibilidad del precio y comparativa.
+
+Hay una por cada lote del pliego (``motor.lotes.PLIEGO``), con las mismas
+cachés y controles que el simulador integrado.
+"""
+
+import re
+
+import streamlit as st
+import numpy as np
+
+from motor import perfil
+from motor.lotes import LOTES, PLIEGO
+from motor.puntuacion import calcular_puntuacion_precio
+from paginas import graficos
+from paginas.comun import configurar_empresas, por_defecto, simulador_lote, ultimo_resultado
+
+
+def ruta_lote(nombre_lote):
+    # Dirección de la página: «Lote 1» -> lote1
+    return re.sub(r"\W+", "", nombre_lote.lower())
+
+
+def pagina_lote(nombre_lote):
+    lote = LOTES[nombre_lote]
+
+    # --- Título ---
+    st.title(f"Simulador de puntuación - {nombre_lote} ({PLIEGO.titulo})" if PLIEGO.titulo
+             else f"Simulador de puntuación - {nombre_lote}")
+
+    with st.expander("🏢 Empresas participantes", expanded=False):
+        configurar_empresas()
+
+    # --- Oferta, criterios técnicos y competidores (compartidos con el simulador integrado) ---
+    simulador_lote(nombre_lote, lote, expandido=True)
+    oferta = st.session_state.get(f"precio_{nombre_lote}", 0.0)
+
+    # --- Análisis de sensibilidad ---
+    st.header("📉 Análisis de sensibilidad del precio")
+    c1, c2 = st.columns(2)
+    rango_analisis = c1.number_input("Rango de variación (€)", min_value=500.0, step=500.0,
+                                     key=por_defecto(f"sens_rango_{nombre_lote}", 5000.0))
+    paso = c2.number_input("Paso (€)", min_value=10.0, step=10.0, key=por_defecto(f"sens_paso_{nombre_lote}", 100.0))
+
+    precios = np.arange(lote.u2_precio - rango_analisis, lote.u1_precio + paso, paso)
+    puntos = calcular_puntuacion_precio(precios, lote.u1_precio, lote.u2_precio, lote.pmax_precio)
+
+    # La curva se reduce a la resolución de la pantalla sin perder los quiebros en U1 y U2
+    with perfil.medir("lote.grafico_sensibilidad", elementos=precios.size):
+        st.image(graficos.curva(
+            precios, puntos, {"Tu oferta": (oferta, "red")}, "Análisis de sensibilidad del precio",
+            "Precio ofertado (€)", "Puntos (precio)", quiebros=(lote.u2_precio, lote.u1_precio)
+        ))
+
+    # --- Puntuación total frente a precio en el escenario simulado ---
+    st.subheader("📈 Comparativa de puntuación total")
+    tabla = ultimo_resultado(f"tabla_{nombre_lote}")
+    if tabla is None:
+        st.info("Configura las empresas para simular el escenario de competidores.")
+    else:
+        df_resultados = tabla[0]
+        with perfil.medir("lote.grafico_comparativa", elementos=len(df_resultados)):
+            st.image(graficos.dispersion(
+                df_resultados["Precio (€)"].to_numpy(), df_resultados["Total"].to_numpy(),
+                {"Tu oferta": (oferta, "red")}, "Puntuación total vs Precio ofertado",
+                "Precio ofertado (€)", "Puntuación total"
+            ))
+
+    # Info al pie
+    st.caption(f"Simulación basada en criterios del Pliego - {nombre_lote}.")
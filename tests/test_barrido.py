@@ -0,0 +1,28 @@
+import numpy as np
+
+from motor.barrido import METRICAS, PARAMETROS, _rango, construir_rejilla, ejecutar_barrido
+from motor.lotes import LOTES
+
+LOTES_BARRIDO = [LOTES["Lote 1"], LOTES["Lote 2"]]
+DISTRIBUCIONES = ["Uniforme", "Normal"]
+
+
+def test_rango():
+    assert _rango("5:20:5") == [5.0, 10.0, 15.0, 20.0]
+    assert _rango("2,4,7", int) == [2, 4, 7]
+
+
+def test_barrido_no_depende_del_reparto(tmp_path):
+    rejilla = construir_rejilla(LOTES_BARRIDO, DISTRIBUCIONES, [10, 25], [3], [0.85, 0.95], [5], [40])
+    assert rejilla.shape == (16, len(PARAMETROS))
+    secuencial = ejecutar_barrido(rejilla, LOTES_BARRIDO, DISTRIBUCIONES, 2_000, semilla=7, procesos=1)
+    avances = []
+    repartido = ejecutar_barrido(rejilla, LOTES_BARRIDO, DISTRIBUCIONES, 2_000, semilla=7, procesos=2,
+                                 ruta_npy=tmp_path / "barrido.npy", trabajos_por_fragmento=3,
+                                 avance=avances.append)
+    assert secuencial.shape == (16, len(METRICAS))
+    np.testing.assert_array_equal(secuencial, repartido)
+    np.testing.assert_array_equal(np.load(tmp_path / "barrido.npy"), repartido)
+    assert avances == sorted(avances) and avances[-1] == 1.0
+    prob = secuencial[:, METRICAS.index("prob_victoria")]
+    assert np.all((prob >= 0) & (prob <= 1))
@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from motor.combinaciones import mejores_sumas, numero_combinaciones, ranking_combinaciones
+
+
+def fuerza_bruta(columnas):
+    # Todas las elecciones de un elemento por columna, de mayor a menor suma
+    return sorted((sum(c[i] for c, i in zip(columnas, elegidos)), elegidos)
+                  for elegidos in itertools.product(*(range(c.size) for c in columnas)))[::-1]
+
+
+@pytest.mark.parametrize("n_columnas, n_filas, k", [(1, 6, 3), (3, 7, 10), (4, 5, 50), (3, 4, 100)])
+def test_mejores_sumas_como_la_fuerza_bruta(n_columnas, n_filas, k):
+    rng = np.random.default_rng(n_columnas * 100 + k)
+    columnas = [rng.uniform(0, 100, n_filas) for _ in range(n_columnas)]
+    totales, indices = mejores_sumas(columnas, k)
+    esperado = fuerza_bruta(columnas)[:k]
+    np.testing.assert_allclose(totales, [t for t, _ in esperado])
+    assert indices.shape == (len(esperado), n_columnas)
+    # Los índices devueltos reproducen su total
+    np.testing.assert_allclose([sum(c[i] for c, i in zip(columnas, fila)) for fila in indices], totales)
+    assert len({tuple(fila) for fila in indices}) == len(esperado)
+
+
+def test_ranking_con_integradoras():
+    rng = np.random.default_rng(0)
+    empresas = ["A", "B", "C"]
+    lotes, integrables, pesos = ["L1", "L2", "L3"], [{"L1", "L2"}], [0.5, 0.3, 0.2]
+    puntuaciones = rng.uniform(50, 90, (3, 3))
+    integradoras = [{"empresa": "A", "incluye": ["L1", "L2"], "L1": 95.0, "L2": 92.0},
+                    {"empresa": "B", "incluye": ["L2", "L3"], "L2": 99.0, "L3": 99.0}]
+    filas = ranking_combinaciones(empresas, puntuaciones, pesos, integradoras, k=1000,
+                                  lotes=lotes, integrables=integrables)
+    # La integradora de B no es admisible: 27 individuales + 3 con la de A
+    assert len(filas) == numero_combinaciones(3, integradoras, lotes, integrables) == 30
+    totales = [sum(p * puntuaciones[i, j] for j, (i, p) in enumerate(zip(elegidas, pesos)))
+               for elegidas in itertools.product(range(3), repeat=3)]
+    totales += [0.5 * 95 + 0.3 * 92 + 0.2 * puntuaciones[i, 2] for i in range(3)]
+    np.testing.assert_allclose([f["Total ponderado"] for f in filas], np.round(sorted(totales)[::-1], 2))
+    assert filas[0]["Combinación"].startswith("A integradora L1+L2")
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from motor.distribuciones import DISTRIBUCIONES, Beta, Triangular, cdf_precios, muestrear_precios, ppf_precios
+
+PRECIO_MIN, PRECIO_MAX = 80.0, 100.0
+
+
+@pytest.mark.parametrize("distribucion", DISTRIBUCIONES + [Beta(4.0, 2.0), Triangular(0.0), Triangular(0.8),
+                                                           Triangular(1.0)])
+def test_cdf_ppf_y_muestreo_coinciden(distribucion):
+    u = np.linspace(0.01, 0.99, 25)
+    precios = ppf_precios(u, PRECIO_MIN, PRECIO_MAX, distribucion)
+    assert np.all(np.diff(precios) >= 0)
+    if distribucion != "Normal":
+        # La Normal recortada acumula sus colas en los extremos
+        np.testing.assert_allclose(cdf_precios(precios, PRECIO_MIN, PRECIO_MAX, distribucion), u, atol=1e-3)
+    muestra = muestrear_precios(np.random.default_rng(0), PRECIO_MIN, PRECIO_MAX, distribucion, 200_000)
+    assert muestra.min() >= PRECIO_MIN and muestra.max() <= PRECIO_MAX
+    rejilla = np.linspace(PRECIO_MIN, PRECIO_MAX, 11)
+    empirica = (muestra[:, None] <= rejilla).mean(axis=0)
+    np.testing.assert_allclose(empirica, cdf_precios(rejilla, PRECIO_MIN, PRECIO_MAX, distribucion), atol=5e-3)
+
+
+def test_triangular_simetrica_es_la_de_siempre():
+    u = np.linspace(0, 1, 101)
+    for funcion in (cdf_precios, ppf_precios):
+        x = PRECIO_MIN + u * (PRECIO_MAX - PRECIO_MIN) if funcion is cdf_precios else u
+        np.testing.assert_allclose(funcion(x, PRECIO_MIN, PRECIO_MAX, Triangular()),
+                                   funcion(x, PRECIO_MIN, PRECIO_MAX, "Triangular"), rtol=0, atol=1e-12)
+
+
+def test_triangular_moda():
+    # El pico está en la moda: la densidad, y por tanto la pendiente de la cdf, es máxima ahí
+    rejilla = np.linspace(PRECIO_MIN, PRECIO_MAX, 201)
+    densidad = np.diff(cdf_precios(rejilla, PRECIO_MIN, PRECIO_MAX, Triangular(0.3)))
+    assert rejilla[np.argmax(densidad)] == pytest.approx(86.0, abs=0.1)
+    with pytest.raises(ValueError):
+        Triangular(1.5)
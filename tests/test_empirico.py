@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from motor.empirico import (TODOS, ajustar_desde_fichero, ajustar_modelo, cargar_modelo, guardar_modelo,
+                            leer_descuentos)
+
+PRESUPUESTO = 100_000.0
+
+
+@pytest.fixture(scope="module")
+def historico(tmp_path_factory):
+    # Sector A con descuentos ~ U(0.10, 0.30), sector B ~ U(0.20, 0.40) y un sector C con pocas ofertas
+    rng = np.random.default_rng(0)
+    descuentos = np.concatenate([rng.uniform(0.10, 0.30, 4_000), rng.uniform(0.20, 0.40, 4_000),
+                                 rng.uniform(0.0, 0.5, 10), [-0.1, 1.2]])
+    sectores = ["A"] * 4_000 + ["B"] * 4_000 + ["C"] * 12
+    ruta = tmp_path_factory.mktemp("historico") / "historico.csv"
+    pd.DataFrame({"precio_ofertado": PRESUPUESTO * (1 - descuentos), "presupuesto_base": PRESUPUESTO,
+                  "sector": sectores}).to_csv(ruta, index=False)
+    return ruta
+
+
+def test_lectura_por_trozos_y_grupos(historico):
+    grupos = leer_descuentos(historico, por="sector", tamano_trozo=1_000)
+    # Las ofertas fuera de [0, 1) se descartan
+    assert grupos[TODOS].size == 8_010
+    assert (grupos["A"].size, grupos["B"].size, grupos["C"].size) == (4_000, 4_000, 10)
+    np.testing.assert_allclose(np.sort(grupos[TODOS]),
+                               np.sort(leer_descuentos(historico, tamano_trozo=10 ** 6)[TODOS]))
+
+
+@pytest.mark.parametrize("metodo", ["ecdf", "kde"])
+def test_ajuste_y_muestreo(historico, metodo):
+    modelo = ajustar_modelo(leer_descuentos(historico, por="sector"), metodo)
+    # C no llega al mínimo de observaciones y usa la fila global
+    assert modelo.etiquetas == (TODOS, "A", "B")
+    rivales = modelo.seleccionar(["A", "B", "C"])
+    np.testing.assert_allclose(rivales.ppf(np.full(3, 0.5)), [0.20, 0.30, np.median(modelo.cuantiles[0])],
+                               atol=0.01)
+    precios = rivales.muestrear(np.random.default_rng(1), PRESUPUESTO, (50_000, 3))
+    assert np.all((precios > 0) & (precios <= PRESUPUESTO))
+    # La CDF del modelo coincide con la frecuencia de los precios muestreados
+    umbral = PRESUPUESTO * 0.75
+    np.testing.assert_allclose(rivales.cdf(umbral, PRESUPUESTO), (precios <= umbral).mean(axis=0), atol=0.01)
+    np.testing.assert_allclose(rivales.cdf(umbral, PRESUPUESTO)[:2], [0.25, 0.75], atol=0.02)
+
+
+def test_guardar_cargar_y_cache(historico, tmp_path):
+    modelo = ajustar_modelo(leer_descuentos(historico, por="sector"))
+    guardar_modelo(modelo, tmp_path / "modelo.npz")
+    cargado = cargar_modelo(tmp_path / "modelo.npz")
+    assert cargado.etiquetas == modelo.etiquetas and cargado.metodo == modelo.metodo
+    assert cargado.huella == modelo.huella
+
+    primero = ajustar_desde_fichero(historico, por="sector", directorio_cache=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+    assert ajustar_desde_fichero(historico, por="sector", directorio_cache=tmp_path / "cache").huella \
+        == primero.huella == modelo.huella
+
+
+def test_historico_sin_ofertas_validas(tmp_path):
+    ruta = tmp_path / "vacio.csv"
+    pd.DataFrame({"descuento": [-0.2, 1.5]}).to_csv(ruta, index=False)
+    with pytest.raises(ValueError):
+        ajustar_modelo(leer_descuentos(ruta))
+    with pytest.raises(ValueError):
+        ajustar_modelo({TODOS: np.array([0.1])}, metodo="histograma")
@@ -0,0 +1,45 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from motor.escenarios import cargar_escenario, comparar_escenarios, guardar_escenario
+from motor.lotes import LOTES
+from motor.montecarlo import simular_montecarlo, simular_progresivo
+from motor.simulacion import simular_escenario
+
+LOTE = LOTES["Lote 1"]
+
+
+def escenario_vivo():
+    # Estado y resultados tal y como los tiene la sesión, con tipos de NumPy y tuplas
+    esc = simular_escenario(LOTE, 3, 380_000.0, 4.5, 33, "Normal", 20, 7)
+    tabla = pd.DataFrame({"Empresa": ["A", "B", "C", "EMCO"], "Total": np.round(esc["totales"], 2),
+                          "Temeraria": np.array([False, True, False, False])})
+    *_, progresivo = simular_progresivo(LOTE, 80.0, 3, max_ensayos=20_000, semilla=7)
+    estado = {"precio_Lote 1": 380_000.0, "bajada_Lote 1": 20, "mc_Lote 1": True, "empresas": ["A", "B", "C"],
+              "semilla": np.int64(7)}
+    resultados = {
+        "tabla_Lote 1": {"clave": "a1", "valor": (tabla, np.float64(esc["totales"][-1]))},
+        "montecarlo_Lote 1": {"clave": "b2", "valor": simular_montecarlo(LOTE, 80.0, 3, 20_000, semilla=7)},
+        "mc_progresivo": {"Lote 1": progresivo},
+        "mascara": np.array([True, False]),
+    }
+    return estado, resultados, None
+
+
+def test_guardar_cargar_sin_diferencias():
+    vivo = escenario_vivo()
+    fichero = io.BytesIO(guardar_escenario(None, vivo[0], vivo[1]))
+    cargado = cargar_escenario(fichero)
+    assert comparar_escenarios(vivo, cargado) == []
+    assert comparar_escenarios(cargado, vivo) == []
+    campo = cargado[1]["montecarlo_Lote 1"]["valor"]["campo"]
+    np.testing.assert_array_equal(campo.mejor_rival, vivo[1]["montecarlo_Lote 1"]["valor"]["campo"].mejor_rival)
+
+
+def test_diferencias_reales():
+    a = ({"m": np.array([True, False]), "n": np.array([1, 2], dtype=np.uint8), "x": 1.0}, {}, None)
+    b = ({"m": np.array([True, True]), "n": np.array([2, 2], dtype=np.uint8), "x": 1.5}, {}, None)
+    assert [ruta for ruta, *_ in comparar_escenarios(a, b)] == ["estado/m", "estado/n", "estado/x"]
+    assert comparar_escenarios(a, a) == []
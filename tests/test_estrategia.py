@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from motor.estrategia import credito_individual, optimizar_estrategia, valores_opciones
+from motor.lotes import Pliego
+
+
+def pliego_prueba(n_lotes, integrables):
+    cortos = [f"L{i + 1}" for i in range(n_lotes)]
+    return Pliego.desde_dict({
+        "lotes": [{"nombre": f"Lote {i + 1}", "corto": c, "peso": 1 / n_lotes, "presupuesto_base": 1e5,
+                   "pmax_precio": 45, "pmax_garantia": 10, "criterios": {"Memoria técnica": 45}}
+                  for i, c in enumerate(cortos)],
+        "integrables": integrables,
+    })
+
+
+def test_empates_de_la_integradora_como_los_individuales():
+    pliego = pliego_prueba(2, [["L1", "L2"]])
+    totales = {"L1": 80.0, "L2": 70.0}
+    # Ensayo 0: EMCO empata con 2 rivales en L1 y con 1 en L2 -> 2 combinaciones rivales iguales.
+    # Ensayo 1: empate en el total ponderado con un solo mejor rival por lote
+    mejor = np.array([[80.0, 70.0], [85.0, 65.0]])
+    empates = np.array([[2, 1], [1, 1]])
+    opciones = valores_opciones(totales, mejor, empates, pliego=pliego)
+    valor, probs = opciones[frozenset(["L1", "L2"])]
+    assert probs["L1"] == pytest.approx((1 / 3 + 1 / 2) / 2)
+    assert valor == pytest.approx(probs["L1"])
+    # Las individuales siguen con 1 / (1 + empates)
+    np.testing.assert_allclose(credito_individual(np.array([80.0, 70.0]), mejor, empates),
+                               [[1 / 3, 1 / 2], [0.0, 1.0]])
+    assert opciones[frozenset(["L1"])][1]["L1"] == pytest.approx(1 / 6)
+
+
+def particiones(lotes, piezas):
+    # Todas las estrategias: cada lote en una sola pieza, individual o integradora
+    if not lotes:
+        yield []
+        return
+    primero = lotes[0]
+    for pieza in piezas:
+        if primero in pieza and pieza <= set(lotes):
+            for resto in particiones([l for l in lotes if l not in pieza], piezas):
+                yield [pieza] + resto
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_ramificacion_y_poda_como_la_busqueda_exhaustiva(semilla):
+    pliego = pliego_prueba(5, [["L1", "L2"], ["L2", "L3"], ["L1", "L2", "L3"], ["L3", "L4", "L5"],
+                               ["L4", "L5"], ["L1", "L2", "L3", "L4", "L5"]])
+    rng = np.random.default_rng(semilla)
+    # Valores al azar con las integradoras cerca de la suma de sus individuales
+    opciones = {frozenset([l]): (rng.uniform(0, 0.2), {l: 0.5}) for l in pliego.cortos}
+    for integrable in pliego.integrables:
+        pieza = frozenset(integrable)
+        suma = sum(opciones[frozenset([l])][0] for l in pieza)
+        opciones[pieza] = (suma * rng.uniform(0.8, 1.2), dict.fromkeys(pieza, 0.6))
+
+    resultado = optimizar_estrategia(opciones, pliego)
+    valores = [sum(opciones[p][0] for p in estrategia)
+               for estrategia in particiones(pliego.cortos, list(opciones))]
+    assert resultado["valor"] == pytest.approx(max(valores))
+    elegidas = ([frozenset(p) for p in resultado["integradoras"]]
+                + [frozenset([l]) for l in resultado["individuales"]])
+    assert sorted(l for p in elegidas for l in p) == sorted(pliego.cortos)
+    assert sum(opciones[p][0] for p in elegidas) == pytest.approx(resultado["valor"])
@@ -0,0 +1,25 @@
+import numpy as np
+
+from paginas.graficos import reducir_curva
+
+
+def test_curva_lineal_a_trozos_conserva_el_dibujo():
+    # Puntuación económica: plana hasta U2, lineal hasta U1 y plana después
+    x = np.linspace(0, 100, 20_001)
+    y = np.interp(x, [0, 30, 80, 100], [45, 45, 0, 0])
+    rx, ry = reducir_curva(x, y, 100, quiebros=[30, 80])
+    assert rx.size <= 10
+    np.testing.assert_allclose(np.interp(x, rx, ry), y, atol=1e-9)
+
+
+def test_curva_ruidosa_conserva_los_picos():
+    rng = np.random.default_rng(0)
+    x = np.arange(50_000, dtype=float)
+    y = rng.normal(size=x.size)
+    y[12_345] = 50.0
+    rx, ry = reducir_curva(x, y, 1000, quiebros=[20_000.5])
+    assert rx.size <= 1000 + 4 and np.all(np.diff(rx) > 0)
+    assert ry.max() == 50.0 and ry.min() == y.min()
+    assert {0.0, 49_999.0, 20_000.0, 20_001.0} <= set(rx.tolist())
+    # Curvas cortas no se tocan
+    assert reducir_curva(x[:10], y[:10])[0].size == 10
@@ -0,0 +1,69 @@
+import copy
+import json
+
+import numpy as np
+import pytest
+
+from motor.lotes import PLIEGO, RUTA_PLIEGO, Pliego, cargar_pliego
+
+with open(RUTA_PLIEGO, encoding="utf-8") as f:
+    DATOS = json.load(f)
+
+
+def _igual(a, b):
+    assert a.nombre == b.nombre and a.titulo == b.titulo
+    assert a.lotes == b.lotes and a.cortos == b.cortos
+    assert [l.nombre for l in a.lotes.values()] == [l.nombre for l in b.lotes.values()]
+    assert a.criterios == b.criterios and a.integrables == b.integrables
+    for campo in ["pesos", "presupuesto_base", "u1_precio", "u2_precio", "pmax_precio", "u1_garantia",
+                  "u2_garantia", "pmax_garantia", "p_tecnico_min", "p_tecnico_max", "incidencia"]:
+        np.testing.assert_array_equal(getattr(a, campo), getattr(b, campo))
+
+
+def test_ida_y_vuelta_json(tmp_path):
+    ruta = tmp_path / "pliego.json"
+    ruta.write_text(json.dumps(DATOS, ensure_ascii=False), encoding="utf-8")
+    _igual(cargar_pliego(ruta), Pliego.desde_dict(DATOS))
+    _igual(cargar_pliego(ruta), PLIEGO)
+
+
+def test_coeficientes_e_incidencia():
+    assert PLIEGO.cortos == [l["corto"] for l in DATOS["lotes"]]
+    np.testing.assert_array_equal(PLIEGO.presupuesto_base, [l["presupuesto_base"] for l in DATOS["lotes"]])
+    np.testing.assert_allclose(PLIEGO.u2_precio, PLIEGO.presupuesto_base * PLIEGO.factor_u2_precio)
+    esperada = [[c in grupo for c in PLIEGO.cortos] for grupo in DATOS["integrables"]]
+    np.testing.assert_array_equal(PLIEGO.incidencia, esperada)
+
+
+def _con(cambio):
+    datos = copy.deepcopy(DATOS)
+    cambio(datos)
+    return datos
+
+
+@pytest.mark.parametrize("cambio, mensaje", [
+    (lambda d: d["lotes"][0].pop("criterios"), "no tiene criterios técnicos"),
+    (lambda d: d["lotes"][0]["criterios"].update(Conectividad=0), "enteros positivos"),
+    (lambda d: d["lotes"][0].update(pmax_precio=50), "suman 105, no 100"),
+    (lambda d: d["lotes"][0].update(p_tecnico_min=38), "p_tecnico_min"),
+    (lambda d: d["lotes"][0].update(p_tecnico_max=60), "p_tecnico_max"),
+    (lambda d: d["lotes"][0].update(presupuesto_base=0), "presupuesto_base"),
+    (lambda d: d["lotes"][0].update(factor_u2_precio=1.2), "factor_u2_precio"),
+    (lambda d: d["lotes"][0].update(u1_garantia=5), "u1_garantia"),
+    (lambda d: d["lotes"][0].update(peso=0), "peso"),
+    (lambda d: d["lotes"][0].pop("presupuesto_base"), "Faltan campos"),
+    (lambda d: d["lotes"][1].update(nombre="Lote 1"), "Lote repetido"),
+    (lambda d: d["lotes"][1].update(corto="L1"), "Nombres cortos repetidos"),
+    (lambda d: d["integrables"].append(["L1", "L9"]), "lotes desconocidos"),
+    (lambda d: d["integrables"].append(["L1"]), "al menos dos lotes"),
+    (lambda d: d.update(lotes=[]), "ningún lote"),
+])
+def test_pliego_no_valido(cambio, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        Pliego.desde_dict(_con(cambio))
+
+
+def test_puntuacion_maxima_del_pliego():
+    datos = _con(lambda d: d.update(puntuacion_maxima=105) or d["lotes"][0].update(pmax_precio=50))
+    with pytest.raises(ValueError, match="Lote 2"):
+        Pliego.desde_dict(datos)
@@ -0,0 +1,110 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from motor.aleatorio import BLOQUE_FLUJO, Flujos
+from motor.analitico import resultado_analitico
+from motor.distribuciones import Beta, Triangular
+from motor.lotes import CRITERIOS, LOTES, PLIEGO
+from motor.montecarlo import (CampoRivales, mejor_rival_por_lote, simular_montecarlo, simular_progresivo,
+                              sortear_rivales)
+from motor.muestreo import MUESTREOS
+from motor.tecnicos import ModeloTecnico
+
+LOTE = LOTES["Lote 2"]
+TECNICO = ModeloTecnico.desde_criterios(CRITERIOS["Lote 2"])
+CORRELADO = ModeloTecnico.desde_criterios(CRITERIOS["Lote 2"], correlacion=0.5)
+
+
+@pytest.mark.parametrize("distribucion, n_rivales, total", [
+    ("Uniforme", 3, 80.0),
+    ("Normal", 5, 85.0),
+    ("Triangular", 4, 82.0),
+    (Beta(3.0, 2.0), 4, 80.0),
+    (Triangular(0.8), 4, 82.0),
+])
+def test_analitico_coincide_con_monte_carlo(distribucion, n_rivales, total):
+    mc = simular_montecarlo(LOTE, total, n_rivales, 100_000, distribucion, 25, semilla=1)
+    exacto = resultado_analitico(LOTE, total, n_rivales, distribucion, 25)
+    assert mc["prob_victoria"] == pytest.approx(exacto["prob_victoria"], abs=0.01)
+    assert mc["puesto_medio"] == pytest.approx(exacto["puesto_medio"], abs=0.02)
+    np.testing.assert_allclose(mc["distribucion_puestos"], exacto["distribucion_puestos"], atol=0.01)
+
+
+def test_analitico_con_modelo_tecnico():
+    mc = simular_montecarlo(LOTE, 82.0, 4, 100_000, "Normal", 20, semilla=2, tecnico=TECNICO)
+    exacto = resultado_analitico(LOTE, 82.0, 4, "Normal", 20, pmf_tecnicos=TECNICO.pmf())
+    assert mc["prob_victoria"] == pytest.approx(exacto["prob_victoria"], abs=0.01)
+
+
+@pytest.mark.parametrize("muestreo", MUESTREOS)
+@pytest.mark.parametrize("tecnico", [None, CORRELADO])
+def test_no_depende_del_tamano_de_bloque(muestreo, tecnico):
+    argumentos = (LOTE, 80.0, 4, 2 * BLOQUE_FLUJO + 500, "Normal", 20, 7)
+    entero = simular_montecarlo(*argumentos, tecnico=tecnico, muestreo=muestreo)
+    troceado = simular_montecarlo(*argumentos, tamano_bloque=3_000, tecnico=tecnico, muestreo=muestreo)
+    assert entero["prob_victoria"] == troceado["prob_victoria"]
+    np.testing.assert_array_equal(entero["campo"].mejor_rival, troceado["campo"].mejor_rival)
+
+
+@pytest.mark.parametrize("muestreo", MUESTREOS)
+@pytest.mark.parametrize("tecnico", [None, CORRELADO])
+def test_sorteos_por_rival_y_prefijo(muestreo, tecnico):
+    flujos = Flujos(3, LOTE)
+    pocos = sortear_rivales(flujos, LOTE, 0, 4_000, 3, "Triangular", 30, tecnico, muestreo)
+    muchos = sortear_rivales(flujos, LOTE, 0, BLOQUE_FLUJO, 6, "Triangular", 30, tecnico, muestreo)
+    # Añadir rivales o pedir más ensayos no cambia los sorteos ya hechos
+    for a, b in zip(pocos, muchos):
+        np.testing.assert_array_equal(a, b[:4_000, :3])
+    # Un trozo intermedio es el mismo sorteado aparte
+    trozo = sortear_rivales(flujos, LOTE, 2_500, 5_000, 3, "Triangular", 30, tecnico, muestreo)
+    for a, b in zip(trozo, muchos):
+        np.testing.assert_array_equal(a, b[2_500:7_500, :3])
+
+
+def test_flujos_por_nombre_de_lote():
+    # Los sorteos de un lote no dependen de sus umbrales, sino de su nombre
+    otro = dataclasses.replace(LOTE, u2_garantia=6)
+    a = sortear_rivales(Flujos(1, LOTE), LOTE, 0, 100, 2)[0]
+    np.testing.assert_array_equal(a, sortear_rivales(Flujos(1, otro), otro, 0, 100, 2)[0])
+    assert not np.array_equal(a, sortear_rivales(Flujos(1, LOTES["Lote 1"]), LOTE, 0, 100, 2)[0])
+
+
+def test_mejor_rival_por_lote_coincide_con_cada_lote():
+    campos = {c: (n, d, 20, t) for c, n, d, t in
+              zip(PLIEGO.cortos, [5, 2, 3], ["Normal", Beta(2.0, 3.0), "Uniforme"], [None, TECNICO, None])}
+    mejor, empates = mejor_rival_por_lote(PLIEGO, campos, 15_000, semilla=4, tamano_bloque=4_000)
+    assert mejor.shape == empates.shape == (15_000, len(PLIEGO.cortos))
+    for k, (corto, lote) in enumerate(zip(PLIEGO.cortos, PLIEGO.lotes.values())):
+        n, distribucion, bajada_max, tecnico = campos[corto]
+        campo = simular_montecarlo(lote, 80.0, n, 15_000, distribucion, bajada_max, 4, tecnico=tecnico)["campo"]
+        propio = CampoRivales(mejor[:, k], empates[:, k])
+        np.testing.assert_array_equal(propio.mejor_rival, campo.mejor_rival)
+        np.testing.assert_array_equal(propio.credito_empate, campo.credito_empate)
+
+
+def test_progresivo_se_detiene_al_converger():
+    parciales = list(simular_progresivo(LOTE, 80.0, 4, "Uniforme", 20, tolerancia=0.01, max_ensayos=1_000_000,
+                                        semilla=5, tamano_bloque=2_000))
+    final = parciales[-1]
+    assert final["convergido"] and final["terminado"] and final["ensayos"] < 1_000_000
+    assert final["semiancho"] <= 0.01 and all(p["semiancho"] > 0.01 for p in parciales[:-1])
+    assert [p["ensayos"] for p in parciales] == list(range(2_000, final["ensayos"] + 1, 2_000))
+    # El campo solo se publica al terminar, con todos los ensayos
+    assert all("campo" not in p for p in parciales[:-1]) and final["campo"].ensayos == final["ensayos"]
+    inferior, superior = final["intervalo"]
+    assert inferior <= final["prob_victoria"] <= superior
+    exacto = resultado_analitico(LOTE, 80.0, 4, "Uniforme", 20)
+    assert final["prob_victoria"] == pytest.approx(exacto["prob_victoria"], abs=0.02)
+
+
+def test_progresivo_termina_en_max_ensayos():
+    parciales = list(simular_progresivo(LOTE, 80.0, 4, "Uniforme", 20, tolerancia=1e-6, max_ensayos=5_000,
+                                        semilla=5, tamano_bloque=2_000))
+    assert [p["ensayos"] for p in parciales] == [2_000, 4_000, 5_000]
+    assert parciales[-1]["terminado"] and not parciales[-1]["convergido"]
+    assert "campo" in parciales[-1]
+    # Mismos sorteos que el Monte Carlo de una vez con la misma semilla
+    mc = simular_montecarlo(LOTE, 80.0, 4, 5_000, "Uniforme", 20, semilla=5)
+    assert parciales[-1]["prob_victoria"] == pytest.approx(mc["prob_victoria"])
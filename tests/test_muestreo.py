@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from motor.lotes import LOTES
+from motor.montecarlo import simular_montecarlo
+from motor.muestreo import MUESTREOS, primos, uniformes, varianza_bloques
+
+LOTE = LOTES["Lote 2"]
+
+
+def test_primos():
+    np.testing.assert_array_equal(primos(10), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+    assert primos(1000)[-1] == 7919
+
+
+@pytest.mark.parametrize("muestreo", MUESTREOS)
+def test_uniformes(muestreo):
+    u = uniformes(np.random.default_rng(0), 4096, 3, muestreo, rival=2)
+    assert u.shape == (4096, 3) and np.all((u > 0) & (u < 1))
+    # Cada dimensión es uniforme: sus cuartiles están donde deben
+    np.testing.assert_allclose(np.quantile(u, [0.25, 0.5, 0.75], axis=0).T, [[0.25, 0.5, 0.75]] * 3, atol=0.03)
+
+
+def test_estratificacion():
+    rng = np.random.default_rng(1)
+    latino = uniformes(rng, 1000, 2, "Hipercubo latino")
+    # Exactamente un punto por estrato de cada dimensión
+    assert all(np.array_equal(np.sort((latino[:, k] * 1000).astype(int)), np.arange(1000)) for k in range(2))
+    antitetico = uniformes(rng, 1001, 2, "Antitético")
+    np.testing.assert_allclose(antitetico[0:-1:2] + antitetico[1::2], 1.0)
+    # Halton: los 2^k primeros puntos de la base 2 caen uno en cada intervalo de ancho 2^-k
+    halton = uniformes(rng, 1024, 2, "Halton")
+    assert np.array_equal(np.sort((halton[:, 0] * 1024).astype(int)), np.arange(1024))
+
+
+def test_varianza_bloques():
+    # Bloques iguales: sin dispersión; uno solo: sin estimación
+    assert varianza_bloques([5.0, 5.0, 5.0], [10, 10, 10]) == 0.0
+    assert np.isnan(varianza_bloques([5.0, 0.0], [10, 0]))
+    assert varianza_bloques([2.0, 8.0], [10, 10]) == pytest.approx(2 / 1 * (9 + 9) / 400)
+
+
+def dispersion_entre_semillas(muestreo, semillas=30):
+    # Desviación real de la probabilidad entre semillas y error estándar medido en cada una
+    resultados = [simular_montecarlo(LOTE, 80.0, 4, 100_000, "Uniforme", 20, semilla=s, muestreo=muestreo)
+                  for s in range(semillas)]
+    probs = [r["prob_victoria"] for r in resultados]
+    errores = [r["error_estandar"] for r in resultados]
+    return np.mean(probs), np.std(probs, ddof=1), np.sqrt(np.mean(np.square(errores)))
+
+
+def test_error_estandar_medido_y_reduccion_de_varianza():
+    dispersiones = {m: dispersion_entre_semillas(m) for m in MUESTREOS}
+    media = dispersiones["Aleatorio"][0]
+    for muestreo, (media_muestreo, real, medido) in dispersiones.items():
+        assert media_muestreo == pytest.approx(media, abs=0.002)
+        # El error estándar de los bloques de flujo es el de verdad
+        assert real / 1.5 < medido < real * 1.5
+    # Halton reduce claramente la varianza en este caso
+    assert dispersiones["Halton"][1] < dispersiones["Aleatorio"][1] / 2
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from motor.lotes import LOTES
+from motor.montecarlo import simular_montecarlo
+from motor.optimizacion import evaluar_precios, optimizar_precio
+
+LOTE = LOTES["Lote 2"]
+
+
+@pytest.fixture(scope="module")
+def campo():
+    return simular_montecarlo(LOTE, 80.0, 4, 20_000, "Uniforme", 20, semilla=3)["campo"]
+
+
+@pytest.mark.parametrize("objetivo, coste", [("victoria", 0.0), ("margen", 100_000.0)])
+def test_optimo_como_la_busqueda_exhaustiva(campo, objetivo, coste):
+    resultado = optimizar_precio(LOTE, campo, 5, 40, objetivo, coste)
+    # Con el mismo campo, ningún precio de una rejilla fina de la ventana mejora el óptimo
+    precios = np.linspace(max(LOTE.u2_precio, coste), LOTE.u1_precio, 20_001)
+    prob, valor = evaluar_precios(LOTE, campo, precios, 5, 40, objetivo, coste)
+    _, optimo = evaluar_precios(LOTE, campo, np.array([resultado["precio"]]), 5, 40, objetivo, coste)
+    assert optimo[0] >= valor.max() - 1e-9 * max(1.0, valor.max())
+    assert LOTE.u2_precio <= resultado["precio"] <= LOTE.u1_precio
+    assert resultado["prob_victoria"] == pytest.approx(prob[np.argmax(valor)], abs=1e-3)
+    assert resultado["margen_esperado"] == pytest.approx((resultado["precio"] - coste) * resultado["prob_victoria"])
+    assert np.all(np.diff(resultado["curva_precios"]) >= 0)
+
+
+def test_empates_prefieren_el_precio_mas_alto(campo):
+    # Muy por encima del campo todos los precios ganan seguro: el óptimo es U1
+    resultado = optimizar_precio(LOTE, campo, 5, 200, "victoria")
+    assert resultado["prob_victoria"] == 1.0
+    assert resultado["precio"] == pytest.approx(LOTE.u1_precio)
+
+
+def test_coste_sin_margen(campo):
+    with pytest.raises(ValueError):
+        optimizar_precio(LOTE, campo, 5, 40, "margen", coste=LOTE.u1_precio)
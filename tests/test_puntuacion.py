@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from motor.lotes import LOTES, PLIEGO
+from motor.puntuacion import calcular_puntuacion_garantia, calcular_puntuacion_precio, calcular_puntuacion_total
+
+LOTE = LOTES["Lote 1"]
+
+
+def test_precio_lineal_entre_umbrales():
+    u1, u2, pmax = LOTE.u1_precio, LOTE.u2_precio, LOTE.pmax_precio
+    assert calcular_puntuacion_precio(u1, u1, u2, pmax) == 0.0
+    assert calcular_puntuacion_precio(u2, u1, u2, pmax) == pmax
+    assert calcular_puntuacion_precio((u1 + u2) / 2, u1, u2, pmax) == pytest.approx(pmax / 2)
+    # Por encima de U1 no puntúa y por debajo de U2 no puntúa más
+    assert calcular_puntuacion_precio(u1 * 1.1, u1, u2, pmax) == 0.0
+    assert calcular_puntuacion_precio(u2 * 0.5, u1, u2, pmax) == pmax
+
+
+def test_garantia_lineal_entre_umbrales():
+    u1, u2, pmax = LOTE.u1_garantia, LOTE.u2_garantia, LOTE.pmax_garantia
+    assert calcular_puntuacion_garantia(u1 - 1, u1, u2, pmax) == 0.0
+    assert calcular_puntuacion_garantia(u1, u1, u2, pmax) == 0.0
+    assert calcular_puntuacion_garantia(4, u1, u2, pmax) == pytest.approx(pmax / 2)
+    assert calcular_puntuacion_garantia(u2 + 3, u1, u2, pmax) == pmax
+
+
+def test_total_escalar_y_vectorizado():
+    argumentos = (LOTE.u1_precio, LOTE.u2_precio, LOTE.pmax_precio,
+                  LOTE.u1_garantia, LOTE.u2_garantia, LOTE.pmax_garantia)
+    total = calcular_puntuacion_total(LOTE.u2_precio, LOTE.u2_garantia, 30, *argumentos)
+    assert isinstance(total, float)
+    assert total == LOTE.pmax_precio + LOTE.pmax_garantia + 30
+
+    ofertas = np.linspace(LOTE.u2_precio, LOTE.u1_precio, 7)
+    totales = calcular_puntuacion_total(ofertas[:, None], np.array([3.0, 4.0, 5.0]), 25, *argumentos)
+    assert totales.shape == (7, 3)
+    esperado = [[calcular_puntuacion_total(o, g, 25, *argumentos) for g in (3.0, 4.0, 5.0)] for o in ofertas]
+    np.testing.assert_array_equal(totales, esperado)
+
+
+def test_pliego_puntua_todos_los_lotes_como_cada_lote():
+    rng = np.random.default_rng(0)
+    forma = (50, 4, len(PLIEGO.lotes))
+    ofertas = PLIEGO.presupuesto_base * rng.uniform(0.7, 1.05, forma)
+    garantias = rng.uniform(2, 6, forma)
+    tecnicos = rng.integers(20, 38, forma)
+    totales = PLIEGO.puntuar(ofertas, garantias, tecnicos)
+    for k, lote in enumerate(PLIEGO.lotes.values()):
+        esperado = calcular_puntuacion_total(
+            ofertas[..., k], garantias[..., k], tecnicos[..., k], lote.u1_precio, lote.u2_precio,
+            lote.pmax_precio, lote.u1_garantia, lote.u2_garantia, lote.pmax_garantia
+        )
+        np.testing.assert_array_equal(totales[..., k], esperado)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from motor.analitico import CampoAnalitico
+from motor.lotes import LOTES
+from motor.puntuacion import calcular_puntuacion_total
+from motor.sensibilidad import rejilla_sensibilidad, superficie_sensibilidad
+
+LOTE = LOTES["Lote 1"]
+
+
+def test_superficie_como_cada_punto_por_separado():
+    precios, garantias = rejilla_sensibilidad(LOTE, 30, 7, bajada_max=30)
+    assert precios[0] == min(LOTE.u2_precio, LOTE.precio_minimo(30)) and precios[-1] == LOTE.u1_precio
+    campo = CampoAnalitico(LOTE, 4, "Normal", 30)
+    rivales = np.array([70.0, 80.0, 85.0, 90.0])
+    superficie = superficie_sensibilidad(LOTE, campo, precios, garantias, 40, rivales)
+    assert superficie["total"].shape == superficie["prob_victoria"].shape == (30, 7)
+    for i, j in [(0, 0), (12, 3), (29, 6)]:
+        total = calcular_puntuacion_total(precios[i], garantias[j], 40, LOTE.u1_precio, LOTE.u2_precio,
+                                          LOTE.pmax_precio, LOTE.u1_garantia, LOTE.u2_garantia,
+                                          LOTE.pmax_garantia)
+        assert superficie["total"][i, j] == total
+        assert superficie["puesto"][i, j] == 1 + np.count_nonzero(rivales > total)
+        assert superficie["prob_victoria"][i, j] == campo.prob_victoria(np.array([total]))[0]
+    # Más barato o más garantía nunca puntúa menos
+    assert np.all(np.diff(superficie["total"], axis=0) <= 0) and np.all(np.diff(superficie["total"], axis=1) >= 0)
+
+
+def test_superficie_interpolada():
+    precios, garantias = rejilla_sensibilidad(LOTE, 40, 13)
+    campo = CampoAnalitico(LOTE, 4, "Uniforme", 20)
+    exacta = superficie_sensibilidad(LOTE, campo, precios, garantias, 40, [80.0])
+    interpolada = superficie_sensibilidad(LOTE, campo, precios, garantias, 40, [80.0], resolucion=0.05)
+    np.testing.assert_allclose(interpolada["prob_victoria"], exacta["prob_victoria"], atol=0.01)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from motor.analitico import CampoAnalitico, resultado_analitico
+from motor.distribuciones import Triangular
+from motor.lotes import LOTES
+from motor.tablas import DISTRIBUCIONES_TABLA, TOLERANCIA_TABLAS, TablasVictoria, construir_tablas, en_rejilla
+
+LOTE = LOTES["Lote 3"]
+BAJADAS = [3, 12, 25]
+
+
+@pytest.fixture(scope="module")
+def tablas(tmp_path_factory):
+    ruta = tmp_path_factory.mktemp("tablas") / "tablas_victoria.npy"
+    construir_tablas(ruta, {"Lote 3": LOTE}, bajadas=BAJADAS, procesos=2)
+    return TablasVictoria(ruta)
+
+
+def test_bajadas_con_quiebros_fuera_de_la_rejilla(tablas):
+    # Con la bajada del 3 % los puntos económicos acaban en 6.75, entre dos nodos
+    assert not en_rejilla(LOTE, 3) and en_rejilla(LOTE, 12) and en_rejilla(LOTE, 25)
+    assert tablas.campo(LOTE, 4, "Normal", 3) is None
+    assert tablas.campo(LOTE, 4, "Beta", 12) is None
+    assert tablas.campo(LOTE, 4, Triangular(0.3), 12) is None
+    assert tablas.campo(LOTE, 4, "Normal", 13) is None
+
+
+@pytest.mark.parametrize("distribucion", DISTRIBUCIONES_TABLA)
+@pytest.mark.parametrize("bajada_max", [12, 25])
+@pytest.mark.parametrize("n_rivales", [1, 4, 20])
+def test_tablas_coinciden_con_el_motor_analitico(tablas, distribucion, bajada_max, n_rivales):
+    # Totales al azar, en nodos y en los átomos (empates) de la distribución de un rival
+    rng = np.random.default_rng(0)
+    atomos = LOTE.pmax_garantia + np.arange(LOTE.p_tecnico_min, LOTE.p_tecnico_max + 1)
+    totales = np.concatenate([rng.uniform(20, 100, 2000), np.arange(20, 100, 0.02), atomos,
+                              atomos + LOTE.pmax_precio])
+    campo = tablas.campo(LOTE, n_rivales, distribucion, bajada_max)
+    exacto = CampoAnalitico(LOTE, n_rivales, distribucion, bajada_max)
+    diferencia = np.abs(campo.prob_victoria(totales) - exacto.prob_victoria(totales))
+    assert diferencia.max() < n_rivales * TOLERANCIA_TABLAS
+
+    resumen = campo.resultado(75.0)
+    referencia = resultado_analitico(LOTE, 75.0, n_rivales, distribucion, bajada_max)
+    assert resumen["prob_victoria"] == pytest.approx(referencia["prob_victoria"], abs=n_rivales * TOLERANCIA_TABLAS)
+    np.testing.assert_allclose(resumen["distribucion_puestos"], referencia["distribucion_puestos"],
+                               atol=n_rivales * TOLERANCIA_TABLAS)
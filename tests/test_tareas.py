@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from motor.tareas import Cancelada, EjecutorTareas
+
+
+def calculo_bloqueado(liberar, empezado=None, bloques=5):
+    # Cálculo por bloques que espera a ``liberar`` antes de cada uno
+    def calcular(avance):
+        if empezado is not None:
+            empezado.set()
+        for i in range(bloques):
+            assert liberar.wait(5)
+            avance((i + 1) / bloques)
+        return "hecho"
+    return calcular
+
+
+def test_tareas_compartidas_y_resultado_en_cache():
+    ejecutor = EjecutorTareas(hilos=2, max_resultados=2)
+    liberar = threading.Event()
+    tarea = ejecutor.lanzar("a", calculo_bloqueado(liberar))
+    assert ejecutor.lanzar("a", calculo_bloqueado(liberar)) is tarea and tarea.interesados == 2
+    # Con un interesado aún pendiente la tarea sigue
+    ejecutor.cancelar(tarea)
+    liberar.set()
+    assert tarea.futuro.result(5) == "hecho" and tarea.progreso == 1.0 and tarea.error() is None
+    assert ejecutor.resultado("a") == "hecho"
+
+    # LRU: al entrar la tercera clave sale la menos usada
+    for clave in ["b", "c"]:
+        ejecutor.lanzar(clave, lambda avance, clave=clave: clave).futuro.result(5)
+    assert ejecutor.resultado("a") is None and ejecutor.resultado("c") == "c"
+
+
+def test_cancelacion_detiene_el_calculo():
+    ejecutor = EjecutorTareas(hilos=1)
+    liberar, empezado = threading.Event(), threading.Event()
+    tarea = ejecutor.lanzar("a", calculo_bloqueado(liberar, empezado))
+    # Ya en marcha: la cancelación llega por ``avance`` en el siguiente bloque
+    assert empezado.wait(5)
+    ejecutor.cancelar(tarea)
+    liberar.set()
+    assert tarea.cancelada
+    with pytest.raises(Cancelada):
+        tarea.futuro.result(5)
+    assert tarea.error() is None and ejecutor.resultado("a") is None
+    # Una tarea nueva con la misma clave no hereda la cancelación
+    assert ejecutor.lanzar("a", lambda avance: 1).futuro.result(5) == 1
+
+
+def test_errores_del_calculo():
+    ejecutor = EjecutorTareas(hilos=1)
+    tarea = ejecutor.lanzar("a", lambda avance: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        tarea.futuro.result(5)
+    assert isinstance(tarea.error(), ZeroDivisionError) and tarea.terminada
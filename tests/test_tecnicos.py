@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from motor.lotes import CRITERIOS, LOTES
+from motor.tecnicos import ModeloTecnico, percentil_precio
+
+LOTE = LOTES["Lote 2"]
+MODELO = ModeloTecnico.desde_criterios(CRITERIOS["Lote 2"])
+
+
+def test_pmf_como_el_muestreo():
+    rng = np.random.default_rng(0)
+    calidad, ruido = MODELO.latentes(rng, 200_000)
+    puntos = MODELO.puntos(calidad, ruido)
+    assert puntos.min() >= 0 and puntos.max() <= MODELO.maximo
+    valores, probabilidades = MODELO.pmf()
+    assert valores.size == MODELO.maximo + 1 and probabilidades.sum() == pytest.approx(1.0)
+    frecuencias = np.bincount(puntos, minlength=valores.size) / puntos.size
+    np.testing.assert_allclose(frecuencias, probabilidades, atol=0.003)
+
+
+def test_tensor_de_rivales_como_cada_rival():
+    rng = np.random.default_rng(1)
+    calidad, ruido = MODELO.latentes(rng, 12)
+    # Rivales × ensayos × criterios, reducido de una vez
+    tensor = MODELO.puntos(calidad.reshape(3, 4), ruido.reshape(3, 4, -1))
+    np.testing.assert_array_equal(tensor.ravel(), MODELO.puntos(calidad, ruido))
+    # Los primeros sorteos no dependen de cuántos se pidan
+    primeros = MODELO.latentes(np.random.default_rng(1), 5)
+    np.testing.assert_array_equal(primeros[1], ruido[:5])
+
+
+@pytest.mark.parametrize("correlacion", [0.6, -0.6])
+def test_correlacion_con_el_precio(correlacion):
+    modelo = ModeloTecnico.desde_criterios(CRITERIOS["Lote 2"], correlacion=correlacion)
+    rng = np.random.default_rng(2)
+    precios = rng.uniform(LOTE.precio_minimo(20), LOTE.presupuesto_base, 50_000)
+    calidad, ruido = modelo.latentes(rng, precios.size)
+    puntos = modelo.puntos(calidad, ruido, percentil_precio(precios, LOTE, "Uniforme", 20))
+    assert np.sign(np.corrcoef(precios, puntos)[0, 1]) == np.sign(correlacion)
+    assert abs(np.corrcoef(precios, puntos)[0, 1]) > 0.4
+    # Sin percentil del precio, la cópula no se aplica
+    np.testing.assert_array_equal(modelo.puntos(calidad, ruido), MODELO.puntos(calidad, ruido))
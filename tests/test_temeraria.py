@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from motor.lotes import LOTES
+from motor.montecarlo import simular_montecarlo, simular_progresivo
+from motor.temeraria import mascara_temeraria, umbral_temeraria
+
+PRESUPUESTO = 100.0
+
+
+@pytest.mark.parametrize("precios, umbral, temerarias", [
+    # 85.1: una oferta, más de 25 unidades de baja
+    ([74.0], 75.0, [True]),
+    ([76.0], 75.0, [False]),
+    # 85.2: dos ofertas, más de 20 unidades por debajo de la otra
+    ([100.0, 79.0], 80.0, [False, True]),
+    ([100.0, 81.0], 80.0, [False, False]),
+    # 85.3: tres ofertas, 10 unidades por debajo de la media...
+    ([90.0, 85.0, 70.0], 75.0, [False, False, True]),
+    # ...sin la más alta si se despega más de 10 unidades, y nunca por encima de 25 de baja
+    ([100.0, 88.0, 76.0], 75.0, [False, False, False]),
+    ([90.0, 89.0, 88.0], 79.0, [False, False, False]),
+    # 85.4: cuatro o más, la media sin las que se despegan...
+    ([100.0, 95.0, 90.0, 70.0, 72.0], 71.75, [False, False, False, True, False]),
+    # ...y con las tres más bajas si quedan menos de tres
+    ([100.0, 99.0, 60.0, 61.0], 220 / 3 - 10, [False, False, True, True]),
+])
+def test_umbral_por_numero_de_ofertas(precios, umbral, temerarias):
+    assert umbral_temeraria(precios, PRESUPUESTO) == pytest.approx(umbral)
+    np.testing.assert_array_equal(mascara_temeraria(precios, PRESUPUESTO), temerarias)
+
+
+def test_ausentes_y_escenarios_a_la_vez():
+    # Cada fila es un escenario con distinto número de ofertas (nan = no licita)
+    nan = np.nan
+    precios = np.array([
+        [74.0, nan, nan, nan],
+        [100.0, 79.0, nan, nan],
+        [nan, 90.0, 85.0, 70.0],
+        [100.0, 99.0, 60.0, 61.0],
+        [nan, nan, nan, nan],
+    ])
+    umbral = umbral_temeraria(precios, PRESUPUESTO)
+    for fila, esperado in zip(precios[:-1], umbral[:-1]):
+        assert esperado == pytest.approx(umbral_temeraria(fila[~np.isnan(fila)], PRESUPUESTO))
+    assert np.isnan(umbral[-1])
+    mascara = mascara_temeraria(precios, PRESUPUESTO)
+    assert not mascara[np.isnan(precios)].any()
+    np.testing.assert_array_equal(mascara.sum(axis=1), [1, 1, 1, 2, 0])
+
+
+def test_presupuesto_por_escenario():
+    precios = np.array([[74.0], [148.0]])
+    np.testing.assert_allclose(umbral_temeraria(precios, np.array([100.0, 200.0])), [75.0, 150.0])
+
+
+def test_campo_reutilizable_sin_excluir():
+    # La exclusión vale para el precio de EMCO simulado: el campo que se reutiliza con
+    # otros precios (optimizador, superficie) es el de los rivales sin excluir
+    lote = LOTES["Lote 2"]
+    argumentos = (lote, 80.0, 6, 30_000, "Uniforme", 40, 5)
+    normal = simular_montecarlo(*argumentos)
+    excluyendo = simular_montecarlo(*argumentos, oferta_emco=lote.precio_minimo(35))
+    assert excluyendo["prob_temeraria"] > 0
+    assert excluyendo["prob_victoria"] != normal["prob_victoria"]
+    np.testing.assert_array_equal(excluyendo["campo"].mejor_rival, normal["campo"].mejor_rival)
+    np.testing.assert_array_equal(excluyendo["campo"].credito_empate, normal["campo"].credito_empate)
+
+    *_, final = simular_progresivo(lote, 80.0, 6, "Uniforme", 40, tolerancia=0.0, max_ensayos=30_000, semilla=5,
+                                   oferta_emco=lote.precio_minimo(35))
+    np.testing.assert_array_equal(final["campo"].mejor_rival, normal["campo"].mejor_rival)